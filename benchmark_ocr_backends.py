@@ -0,0 +1,82 @@
+"""
+Benchmark des backends Tesseract (sous-processus pytesseract vs API persistante tesserocr)
+
+Usage: poetry run python benchmark_ocr_backends.py [dossier_images] [--repeat N]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+from PIL import Image
+
+# Ajout du chemin du projet
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.infrastructure.ocr.tesseract_backends import create_tesseract_backend
+
+# Configurations de la cascade OCR (DEFAULT_OCR_CASCADE)
+CONFIGS = ['--oem 3 --psm 6', '--oem 3 --psm 7']
+
+
+def run_backend(name, images, lang, repeat, tessdata_dir):
+    """Mesure le temps par appel image_to_data d'un backend."""
+    try:
+        backend = create_tesseract_backend(name, tessdata_dir)
+        backend.version()
+    except Exception as e:
+        print(f"⚠️  Backend {name} indisponible: {e}")
+        return None
+    
+    # Premier appel séparé : chargement des modèles pour le backend persistant
+    start = time.perf_counter()
+    backend.image_to_data(images[0], lang=lang, config=CONFIGS[0])
+    first_call = time.perf_counter() - start
+    
+    calls = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for image in images:
+            for config in CONFIGS:
+                backend.image_to_data(image, lang=lang, config=config)
+                calls += 1
+    elapsed = time.perf_counter() - start
+    
+    return first_call, elapsed / calls, calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('images', nargs='?', default='debug_ocr_highlights',
+                        help="Dossier de surlignements PNG (défaut: debug_ocr_highlights)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--lang', default='fra+eng')
+    parser.add_argument('--tessdata-dir', default=None)
+    args = parser.parse_args()
+    
+    paths = sorted(glob.glob(os.path.join(args.images, '*.png')))
+    if not paths:
+        print(f"❌ Aucune image PNG dans '{args.images}'")
+        return 1
+    
+    images = [Image.open(path).convert('RGB') for path in paths]
+    print(f"📷 {len(images)} image(s), {len(CONFIGS)} config(s), {args.repeat} répétition(s)\n")
+    
+    results = {}
+    for name in ('subprocess', 'persistent'):
+        result = run_backend(name, images, args.lang, args.repeat, args.tessdata_dir)
+        if result is None:
+            continue
+        first_call, per_call, calls = result
+        results[name] = per_call
+        print(f"🔧 {name:<11} premier appel {first_call * 1000:8.1f} ms | "
+              f"{per_call * 1000:7.1f} ms/appel sur {calls} appels")
+    
+    if len(results) == 2:
+        print(f"\n🚀 Accélération: x{results['subprocess'] / results['persistent']:.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+Benchmark du prétraitement des crops OCR (variantes PIL par étape vs CropVariants partagées)
+
+Usage: poetry run python benchmark_ocr_preprocessing.py [dossier_images] [--repeat N] [--no-ocr]
+
+Toutes les étapes de la cascade sont jouées (sans sortie anticipée), sauf les
+étapes d'une ligne pour les crops de plusieurs lignes, comme dans l'adaptateur.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image, ImageEnhance
+
+# Ajout du chemin du projet
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.infrastructure.ocr.crop_preprocessing import CropVariants
+from src.infrastructure.ocr.tesseract_adapter import DEFAULT_OCR_CASCADE
+from src.infrastructure.ocr.tesseract_backends import create_tesseract_backend
+
+# Cascade d'origine : chaque étape repartait de l'image PIL
+LEGACY_CASCADE = (
+    ('--oem 3 --psm 6', "original", False),
+    ('--oem 3 --psm 7', "original", True),
+    ('--oem 3 --psm 6', "enlarged", False),
+    ('--oem 3 --psm 6', "enhanced", False),
+)
+
+
+def children_cpu_time():
+    """Temps CPU des processus enfants (tesseract du backend subprocess ; 0 sous Windows)."""
+    times = os.times()
+    return times.children_user + times.children_system
+
+
+def legacy_stage_image(pixels, preprocess):
+    """Prétraitement d'origine d'une étape (avant CropVariants)."""
+    if preprocess == "original":
+        return pixels
+    image = Image.fromarray(pixels)
+    if preprocess == "enlarged":
+        if image.width * image.height >= 10000:
+            return None
+        return image.resize((image.width * 2, image.height * 2), Image.LANCZOS)
+    return ImageEnhance.Contrast(image).enhance(1.5)
+
+
+def legacy_images(pixels, line_count):
+    return [
+        (config, legacy_stage_image(pixels, preprocess))
+        for config, preprocess, single_line in LEGACY_CASCADE
+        if not (single_line and line_count > 1)
+    ]
+
+
+def shared_images(pixels, line_count):
+    variants = CropVariants(pixels)
+    return [
+        (stage.config, variants.get(stage.preprocess))
+        for stage in DEFAULT_OCR_CASCADE
+        if not (stage.single_line and line_count > 1)
+    ]
+
+
+def run(prepare, crops, backend, lang, repeat):
+    """
+    Cascade complète (sans sortie anticipée) sur tous les crops
+    
+    Returns:
+        Tuple (ms CPU de prétraitement par crop, ms CPU total par crop)
+    """
+    preprocessing = total = 0.0
+    for _ in range(repeat):
+        for pixels, line_count in crops:
+            start, children_start = time.process_time(), children_cpu_time()
+            images = prepare(pixels, line_count)
+            preprocessing += time.process_time() - start
+            
+            if backend is not None:
+                for config, image in images:
+                    if image is not None:
+                        backend.image_to_data(image, lang=lang, config=config)
+            total += time.process_time() - start + children_cpu_time() - children_start
+    
+    count = repeat * len(crops)
+    return preprocessing * 1000 / count, total * 1000 / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('images', nargs='?', default='debug_ocr_highlights',
+                        help="Dossier de surlignements PNG (défaut: debug_ocr_highlights)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--lang', default='fra+eng')
+    parser.add_argument('--backend', default='auto')
+    parser.add_argument('--tessdata-dir', default=None)
+    parser.add_argument('--line-height', type=int, default=40,
+                        help="Hauteur d'une ligne Kindle en pixels, pour estimer les lignes d'un crop")
+    parser.add_argument('--no-ocr', action='store_true', help="Mesurer le prétraitement seul")
+    args = parser.parse_args()
+    
+    paths = sorted(glob.glob(os.path.join(args.images, '*.png')))
+    if not paths:
+        print(f"❌ Aucune image PNG dans '{args.images}'")
+        return 1
+    
+    crops = []
+    for path in paths:
+        pixels = np.asarray(Image.open(path).convert('RGB'))
+        crops.append((pixels, max(1, round(pixels.shape[0] / args.line_height))))
+    
+    backend = None
+    if not args.no_ocr:
+        backend = create_tesseract_backend(args.backend, args.tessdata_dir)
+        # Chargement des modèles hors mesure
+        for config, _, _ in LEGACY_CASCADE:
+            backend.image_to_data(crops[0][0], lang=args.lang, config=config)
+    print(f"📷 {len(crops)} crop(s), {args.repeat} répétition(s), backend {backend.name if backend else 'aucun'}\n")
+    
+    results = {}
+    # Passe de chauffe : imports et allocations hors mesure
+    run(shared_images, crops, None, args.lang, 1)
+    for name, prepare in (('avant', legacy_images), ('après', shared_images)):
+        preprocessing, total = run(prepare, crops, backend, args.lang, args.repeat)
+        results[name] = (preprocessing, total)
+        line = f"🔧 {name:<6} prétraitement {preprocessing:7.2f} ms/crop"
+        if backend is not None:
+            line += f" | CPU total {total:8.1f} ms/crop"
+        print(line)
+    
+    before, after = results['avant'], results['après']
+    print(f"\n🚀 Prétraitement: x{before[0] / max(after[0], 1e-6):.1f}")
+    if backend is not None:
+        print(f"🚀 CPU total par crop: x{before[1] / max(after[1], 1e-6):.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
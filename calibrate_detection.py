@@ -1,17 +1,23 @@
 """
 Script de calibration pour ajuster les paramètres de détection de surlignements
+
+Usage:
+    poetry run python calibrate_detection.py --frames DOSSIER --ground-truth verite.json
+        [--search grid|random] [--samples N] [--space espace.json] [--workers N]
+    poetry run python calibrate_detection.py          (mode interactif sur test_simple.png)
 """
+import argparse
 import os
 import sys
 import json
 from datetime import datetime
 
 # Ajout du chemin du projet
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
 
 def test_with_parameters(**params):
     """Test la détection avec des paramètres personnalisés"""
-    from infrastructure.ocr.kindle_highlight_detector import KindleHighlightDetector
+    from src.infrastructure.ocr.kindle_highlight_detector import KindleHighlightDetector
     
     # Créer un détecteur avec les paramètres modifiés
     detector = KindleHighlightDetector()
@@ -63,7 +69,78 @@ def load_saved_parameters():
         return config["parameters"]
     return {}
 
+def run_sweep(args):
+    """Recherche automatique sur des frames annotées, en parallèle"""
+    from src.infrastructure.ocr.detection_calibration import (
+        DEFAULT_SEARCH_SPACE,
+        grid_search_space,
+        load_calibration_frames,
+        random_search_space,
+        run_calibration,
+        save_best_parameters
+    )
+    
+    frames = load_calibration_frames(args.frames, args.ground_truth)
+    if not frames:
+        print(f"❌ Aucune frame annotée trouvée dans '{args.frames}'")
+        return
+    
+    space = DEFAULT_SEARCH_SPACE
+    if args.space:
+        with open(args.space, "r") as f:
+            space = json.load(f)
+    
+    if args.search == "random":
+        candidates = random_search_space(space, args.samples, args.seed)
+    else:
+        candidates = grid_search_space(space)
+    
+    expected = sum(len(frame.expected) for frame in frames)
+    print(f"🔍 {len(candidates)} jeu(x) de paramètres x {len(frames)} frame(s) "
+          f"({expected} surlignement(s) attendu(s)), {args.workers or 1} processus")
+    
+    start = datetime.now()
+    results = run_calibration(frames, candidates, args.workers, args.iou)
+    print(f"⏱️  Terminé en {(datetime.now() - start).total_seconds():.1f}s\n")
+    
+    print(f"{'#':>3} {'Précision':>9} {'Rappel':>7} {'F1':>6} {'frames/s':>9}  Paramètres")
+    for rank, result in enumerate(results[:args.top], 1):
+        shown = {k: v for k, v in result.params.items() if k != "yellow_ranges"}
+        shown["yellow_ranges"] = len(result.params.get("yellow_ranges", []))
+        print(f"{rank:>3} {result.precision:>9.3f} {result.recall:>7.3f} {result.f1:>6.3f} "
+              f"{result.frames_per_second:>9.1f}  {shown}")
+    
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump([result.to_dict() for result in results], f, indent=2)
+        print(f"\n📄 Rapport complet: {args.report}")
+    
+    save_best_parameters(results[0], args.output)
+    print(f"💾 Meilleurs paramètres sauvegardés dans {args.output}")
+
 def main():
+    parser = argparse.ArgumentParser(description="Calibration de la détection de surlignements")
+    parser.add_argument("--frames", help="Dossier des frames enregistrées (PNG)")
+    parser.add_argument("--ground-truth", help="JSON des surlignements attendus par frame")
+    parser.add_argument("--search", choices=["grid", "random"], default="grid")
+    parser.add_argument("--samples", type=int, default=100, help="Jeux tirés en recherche aléatoire")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--space", help="JSON de l'espace de recherche (défaut: DEFAULT_SEARCH_SPACE)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--iou", type=float, default=0.5, help="IoU minimale d'une détection correcte")
+    parser.add_argument("--top", type=int, default=10, help="Nombre de jeux affichés")
+    parser.add_argument("--report", help="Fichier JSON du rapport complet")
+    parser.add_argument("--output", default="best_detection_params.json")
+    args = parser.parse_args()
+    
+    if args.frames:
+        if not args.ground_truth:
+            parser.error("--ground-truth est requis avec --frames")
+        run_sweep(args)
+    else:
+        interactive()
+
+def interactive():
     print("🔧 CALIBRATEUR DE DÉTECTION DE SURLIGNEMENTS")
     print("=" * 50)
     
@@ -0,0 +1,123 @@
+"""
+Comparaison des profils OCR (précision / latence) sur des surlignements enregistrés
+
+Usage: poetry run python compare_ocr_profiles.py [dossier_images] [--truth textes.json] [--profiles fast balanced accurate]
+
+Sans vérité terrain (--truth, JSON {"fichier.png": "texte attendu"}), le texte
+du profil de référence (--reference) sert d'attendu.
+"""
+import argparse
+import difflib
+import glob
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+# Ajout du chemin du projet
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.infrastructure.ocr.ocr_profiles import OCR_PROFILES
+from src.infrastructure.ocr.tesseract_adapter import TesseractOCREngine
+
+
+def similarity(text, expected):
+    """Ressemblance caractère à caractère (0-1) entre deux textes."""
+    return difflib.SequenceMatcher(None, ' '.join(text.split()), ' '.join(expected.split())).ratio()
+
+
+def run_profile(name, crops, args):
+    """
+    OCR de tous les crops avec un profil
+    
+    Returns:
+        Tuple (textes par fichier, ms par crop, confiance moyenne)
+    """
+    engine = TesseractOCREngine(
+        tesseract_cmd=args.tesseract_cmd,
+        backend=args.backend,
+        tessdata_dir=args.tessdata_dir,
+        detection_params_file=None,
+        ocr_profile=name
+    )
+    # Premier appel hors mesure : chargement des modèles du profil
+    engine._ocr_single_highlight_improved(*crops[0][1:])
+    
+    texts, confidences = {}, []
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for filename, pixels, line_count in crops:
+            text, confidence, _ = engine._ocr_single_highlight_improved(pixels, 1, line_count)
+            texts[filename] = text
+            confidences.append(confidence)
+    elapsed = time.perf_counter() - start
+    
+    return texts, elapsed * 1000 / (args.repeat * len(crops)), sum(confidences) / len(confidences)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('images', nargs='?', default='debug_ocr_highlights',
+                        help="Dossier de surlignements PNG (défaut: debug_ocr_highlights)")
+    parser.add_argument('--truth', default=None, help="Textes attendus par fichier (JSON)")
+    parser.add_argument('--profiles', nargs='+', default=list(OCR_PROFILES), choices=list(OCR_PROFILES))
+    parser.add_argument('--reference', default='accurate', choices=list(OCR_PROFILES),
+                        help="Profil servant d'attendu sans --truth")
+    parser.add_argument('--tolerance', type=float, default=0.02,
+                        help="Perte de ressemblance acceptée pour recommander un profil plus rapide")
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--line-height', type=int, default=40,
+                        help="Hauteur d'une ligne Kindle en pixels, pour estimer les lignes d'un crop")
+    parser.add_argument('--backend', default='auto')
+    parser.add_argument('--tesseract-cmd', default=None)
+    parser.add_argument('--tessdata-dir', default=None)
+    args = parser.parse_args()
+    
+    paths = sorted(glob.glob(os.path.join(args.images, '*.png')))
+    if not paths:
+        print(f"❌ Aucune image PNG dans '{args.images}'")
+        return 1
+    
+    crops = []
+    for path in paths:
+        pixels = np.asarray(Image.open(path).convert('RGB'))
+        crops.append((os.path.basename(path), pixels, max(1, round(pixels.shape[0] / args.line_height))))
+    print(f"📷 {len(crops)} surlignement(s), profils: {', '.join(args.profiles)}\n")
+    
+    profiles = list(args.profiles)
+    if args.truth is None and args.reference not in profiles:
+        profiles.append(args.reference)
+    
+    outputs = {name: run_profile(name, crops, args) for name in profiles}
+    
+    if args.truth:
+        with open(args.truth, 'r', encoding='utf-8') as f:
+            expected = json.load(f)
+        source = args.truth
+    else:
+        expected = outputs[args.reference][0]
+        source = f"profil {args.reference}"
+    
+    rows = []
+    for name in args.profiles:
+        texts, latency, confidence = outputs[name]
+        scores = [similarity(texts[filename], expected[filename]) for filename, _, _ in crops if filename in expected]
+        accuracy = sum(scores) / len(scores) if scores else 0.0
+        exact = sum(score == 1.0 for score in scores)
+        rows.append((name, accuracy, latency))
+        print(f"🔧 {name:<9} ressemblance {accuracy:6.1%} | identiques {exact}/{len(scores)} | "
+              f"{latency:7.1f} ms/surlignement | confiance {confidence:5.1f}%")
+    
+    best_accuracy = max(accuracy for _, accuracy, _ in rows)
+    eligible = [row for row in rows if row[1] >= best_accuracy - args.tolerance]
+    recommended = min(eligible, key=lambda row: row[2])
+    print(f"\n📋 Attendu: {source}")
+    print(f"✅ Profil recommandé: {recommended[0]} (le plus rapide à {args.tolerance:.0%} près de la meilleure ressemblance)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,7 +2,38 @@
 Port KindleController - Interface pour contrôler Kindle
 """
 from abc import ABC, abstractmethod
-from typing import Optional
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+
+@dataclass
+class Frame:
+    """
+    Capture d'écran non compressée.
+    
+    Attributes:
+        pixels: Pixels RGB 8 bits (ndarray ou buffer contigu de hauteur*largeur*3 octets)
+        shape: Dimensions (hauteur, largeur, canaux)
+        page_number: Page Kindle affichée lors de la capture
+        origin: Coordonnées écran (x, y) du pixel en haut à gauche
+    """
+    pixels: Any
+    shape: Tuple[int, int, int]
+    page_number: Optional[int] = None
+    origin: Tuple[int, int] = (0, 0)
+    
+    @property
+    def width(self) -> int:
+        return self.shape[1]
+    
+    @property
+    def height(self) -> int:
+        return self.shape[0]
+    
+    @property
+    def nbytes(self) -> int:
+        """Taille des pixels en octets."""
+        return memoryview(self.pixels).nbytes
 
 
 class KindleController(ABC):
@@ -18,13 +49,27 @@ class KindleController(ABC):
         """
         pass
     
+    @abstractmethod
+    async def capture_frame(self, region: Optional[Tuple[int, int, int, int]] = None, downscale: int = 1) -> Frame:
+        """
+        Capture l'écran actuel sans compression.
+        
+        Args:
+            region: Zone écran à capturer (x, y, width, height), tout l'écran si None
+            downscale: Facteur de sous-échantillonnage (1 = pleine résolution)
+            
+        Returns:
+            Frame contenant les pixels bruts de la zone capturée
+        """
+        pass
+    
     @abstractmethod
     async def capture_screen(self) -> bytes:
         """
-        Capture l'écran actuel.
+        Capture l'écran actuel (legacy / debug).
         
         Returns:
-            Image de l'écran en bytes
+            Image de l'écran en bytes (PNG)
         """
         pass
     
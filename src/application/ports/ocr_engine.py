@@ -2,19 +2,21 @@
 Port OCREngine - Interface pour l'extraction de texte
 """
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Tuple, Union
+
+from src.application.ports.kindle_controller import Frame
 
 
 class OCREngine(ABC):
     """Interface pour un moteur OCR."""
     
     @abstractmethod
-    async def extract_text(self, image: bytes, region: Tuple[int, int, int, int]) -> Tuple[str, float]:
+    async def extract_text(self, image: Union[bytes, Frame], region: Tuple[int, int, int, int]) -> Tuple[str, float]:
         """
         Extrait le texte d'une région d'image.
         
         Args:
-            image: Image en bytes
+            image: Frame brute ou image en bytes (legacy)
             region: Tuple (x, y, width, height)
             
         Returns:
@@ -113,10 +113,10 @@ class AutoPageDetector:
         while not self.should_cancel:
             # Capturer l'écran actuel
             try:
-                screen_data = await self.kindle.capture_screen()
+                frame = await self.kindle.capture_frame()
                 
-                # Calculer le hash de la page
-                current_hash = hashlib.md5(screen_data).hexdigest()
+                # Calculer le hash de la page (directement sur les pixels bruts)
+                current_hash = hashlib.md5(frame.pixels).hexdigest()
                 
                 # Comparer avec la page précédente
                 if previous_hash and current_hash == previous_hash:
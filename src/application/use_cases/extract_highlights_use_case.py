@@ -11,8 +11,12 @@ import logging
 from src.domain.entities.highlight import Highlight
 from src.domain.entities.extraction_task import ExtractionTask, TaskStatus
 from src.application.ports.ocr_engine import OCREngine
-from src.application.ports.kindle_controller import KindleController
+from src.application.ports.kindle_controller import KindleController, Frame
 from src.application.ports.event_bus import EventBus, Event
+from src.application.use_cases.page_settle_detector import PageSettleDetector
+from src.application.use_cases.frame_cache import FrameCache
+from src.application.use_cases.frame_fingerprint import FrameFingerprintCache, frame_fingerprint
+from src.application.use_cases.reading_zone import ReadingZoneTracker
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +81,35 @@ class ExtractionParams:
     navigation_delay: float = 0.3
     ocr_delay: float = 1.0
     
+    # Attente adaptative: on continue dès que la page est stable à l'écran
+    # (les délais fixes ci-dessus ne servent que si elle est désactivée)
+    adaptive_settle: bool = True
+    settle_timeout: float = 2.0
+    settle_poll_interval: float = 0.05
+    
+    # Conservation des frames de la phase 1: la phase 2 ne renavigue pas
+    cache_frames: bool = True
+    frame_cache_max_mb: int = 512
+    
+    # Pipeline: l'OCR des pages surlignées chevauche la navigation du scan
+    # (la navigation attend quand la file OCR est pleine). ocr_workers = pages
+    # OCRisées en parallèle (None = une par processus du pool OCR, au moins 2)
+    pipelined: bool = True
+    ocr_workers: Optional[int] = None
+    pipeline_queue_size: int = 4
+    
+    # Empreinte des frames: une page déjà vue (vide ou doublon) n'est pas réanalysée
+    fingerprint_cache: bool = True
+    fingerprint_max_distance: int = 4
+    
+    # Zone de lecture automatique: la colonne de texte est cherchée dans la zone
+    # de capture, puis seule elle est capturée et analysée (vérifiée toutes les N pages)
+    auto_scan_zone: bool = False
+    scan_zone_revalidate_pages: int = 20
+    
+    # Profil OCR de cette extraction ("fast", "balanced", "accurate" ; None = celui du moteur)
+    ocr_profile: Optional[str] = None
+    
     def __post_init__(self):
         if self.end_page is None:
             self.end_page = self.total_pages
@@ -84,6 +117,15 @@ class ExtractionParams:
         if self.scan_regions is None:
             # Zone par défaut Kindle (à ajuster selon vos paramètres)
             self.scan_regions = [(50, 100, 1600, 980)]
+    
+    @property
+    def capture_region(self) -> tuple[int, int, int, int]:
+        """Rectangle englobant (x, y, width, height) de toutes les zones à analyser."""
+        left = min(x for x, _, _, _ in self.scan_regions)
+        top = min(y for _, y, _, _ in self.scan_regions)
+        right = max(x + w for x, _, w, _ in self.scan_regions)
+        bottom = max(y + h for _, y, _, h in self.scan_regions)
+        return (left, top, right - left, bottom - top)
 
 
 class ExtractHighlightsUseCase:
@@ -104,6 +146,12 @@ class ExtractHighlightsUseCase:
         self.events = event_bus
         self.repository = highlight_repository  # Stocker le repository
         self._cancellation_token: Optional[asyncio.Event] = None
+        self._settle_detector: Optional[PageSettleDetector] = None
+        self._frame_cache: Optional[FrameCache] = None
+        self._fingerprints: Optional[FrameFingerprintCache] = None
+        self._reading_zone: Optional[ReadingZoneTracker] = None
+        self._pages_extracted = 0
+        self._pipeline_error: Optional[Exception] = None  # Première erreur d'un worker OCR du pipeline
     
     async def execute(self, params: ExtractionParams) -> ExtractionTask:
         """
@@ -118,6 +166,30 @@ class ExtractHighlightsUseCase:
         # Créer la tâche
         task = ExtractionTask()
         self._cancellation_token = asyncio.Event()
+        self._settle_detector = PageSettleDetector(
+            self.kindle,
+            timeout=params.settle_timeout,
+            poll_interval=params.settle_poll_interval
+        ) if params.adaptive_settle else None
+        self._frame_cache = FrameCache(
+            max_memory_bytes=params.frame_cache_max_mb * 1024 * 1024
+        ) if params.cache_frames else None
+        self._fingerprints = FrameFingerprintCache(
+            max_distance=params.fingerprint_max_distance
+        ) if params.fingerprint_cache else None
+        self._reading_zone = ReadingZoneTracker(
+            params.capture_region,
+            revalidate_every=params.scan_zone_revalidate_pages
+        ) if params.auto_scan_zone else None
+        if hasattr(self.ocr, 'cache_stats'):
+            self.ocr.cache_stats(reset=True)  # Compteurs du cache OCR propres à cette extraction
+        if hasattr(self.ocr, 'reset_language'):
+            self.ocr.reset_language()  # Nouveau livre : langue à nouveau détectée
+        if params.ocr_profile and hasattr(self.ocr, 'use_profile'):
+            self.ocr.use_profile(params.ocr_profile)
+            task.metadata["ocr_profile"] = params.ocr_profile
+        elif hasattr(self.ocr, 'reset_profile'):
+            self.ocr.reset_profile()  # Pas de profil demandé : celui du moteur, pas celui de l'extraction précédente
         
         try:
             # Vérifications préliminaires
@@ -127,20 +199,33 @@ class ExtractHighlightsUseCase:
             task.transition_to(TaskStatus.SCANNING)
             await self.events.publish(TaskStartedEvent(task=task))
             
-            # Phase 1: Scan pour identifier les pages avec contenu
-            pages_with_content = await self._scan_phase(task, params)
-            
-            if self._cancellation_token.is_set():
-                task.transition_to(TaskStatus.CANCELLED)
-                await self.events.publish(TaskCancelledEvent(task=task))
-                return task
-            
-            # Phase 2: Extraction OCR avec traitement individuel sur les pages identifiées
-            if pages_with_content:  # Seulement si on a trouvé du contenu
-                task.transition_to(TaskStatus.EXTRACTING)
-                await self._extraction_phase_individual(task, params, pages_with_content)
+            if params.pipelined:
+                # Phases 1 et 2 en pipeline: l'OCR de la page N chevauche
+                # la navigation vers la page N+1
+                await self._pipelined_phases(task, params)
             else:
-                logger.warning("Aucune page avec contenu trouvée")
+                # Phase 1: Scan pour identifier les pages avec contenu
+                pages_with_content = await self._scan_phase(task, params)
+                
+                if self._cancellation_token.is_set():
+                    task.transition_to(TaskStatus.CANCELLED)
+                    await self.events.publish(TaskCancelledEvent(task=task))
+                    return task
+                
+                # Phase 2: Extraction OCR avec traitement individuel sur les pages identifiées
+                if pages_with_content:  # Seulement si on a trouvé du contenu
+                    task.transition_to(TaskStatus.EXTRACTING)
+                    await self._extraction_phase_individual(task, params, pages_with_content)
+                else:
+                    logger.warning("Aucune page avec contenu trouvée")
+            
+            ocr_cache_stats = self.ocr.cache_stats() if hasattr(self.ocr, 'cache_stats') else None
+            if ocr_cache_stats is not None:
+                task.metadata["ocr_cache"] = ocr_cache_stats
+                logger.info(f"Cache OCR: {ocr_cache_stats['memory_hits'] + ocr_cache_stats['disk_hits']} surlignement(s) déjà lu(s), {ocr_cache_stats['misses']} OCRisé(s)")
+            ocr_language = self.ocr.language_stats() if hasattr(self.ocr, 'language_stats') else None
+            if ocr_language is not None:
+                task.metadata["ocr_language"] = ocr_language
             
             # Finalisation
             if self._cancellation_token.is_set():
@@ -168,6 +253,9 @@ class ExtractHighlightsUseCase:
             task.transition_to(TaskStatus.FAILED)
             await self.events.publish(TaskFailedEvent(task=task, error=e))
             raise
+        finally:
+            if self._frame_cache:
+                self._frame_cache.close()
         
         return task
     
@@ -184,14 +272,54 @@ class ExtractHighlightsUseCase:
         if not await self.kindle.is_kindle_running():
             raise RuntimeError("Kindle application not running")
     
+    def _scan_regions(self, params: ExtractionParams) -> List[tuple[int, int, int, int]]:
+        """Zones analysées: la zone de lecture si elle est établie, sinon celles des paramètres."""
+        if self._reading_zone is not None:
+            return self._reading_zone.regions(params.scan_regions)
+        return params.scan_regions
+    
+    def _capture_region(self, params: ExtractionParams) -> tuple[int, int, int, int]:
+        """Zone capturée: la zone de lecture si elle est établie, sinon la zone englobante."""
+        if self._reading_zone is not None and self._reading_zone.zone is not None:
+            return self._reading_zone.zone
+        return params.capture_region
+    
+    async def _go_to_page(
+        self,
+        page_num: int,
+        params: ExtractionParams,
+        fixed_delay: float
+    ) -> None:
+        """
+        Navigue vers une page et attend qu'elle soit affichée.
+        
+        Avec l'attente adaptative, rend la main dès que la zone de scan est
+        stable ; sinon attend le délai fixe.
+        """
+        previous_page = await self.kindle.get_current_page()
+        await self.kindle.navigate_to_page(page_num)
+        
+        if self._settle_detector:
+            await self._settle_detector.wait_until_settled(
+                self._capture_region(params),
+                expect_change=previous_page != page_num
+            )
+        else:
+            await asyncio.sleep(fixed_delay)
+    
     async def _scan_phase(
         self, 
         task: ExtractionTask, 
-        params: ExtractionParams
+        params: ExtractionParams,
+        ocr_queue: Optional[asyncio.Queue] = None
     ) -> List[int]:
         """
         Phase 1: Scan rapide pour identifier les pages avec surlignements.
         
+        Args:
+            ocr_queue: File du pipeline OCR ; si fournie, les frames des pages
+                surlignées y sont déposées (attente si la file est pleine)
+        
         Returns:
             Liste des numéros de pages contenant des highlights
         """
@@ -200,25 +328,54 @@ class ExtractHighlightsUseCase:
         logger.info(f"=== PHASE 1: SCAN DES PAGES {params.start_page} à {params.end_page} ===")
         
         for page_num in range(params.start_page, params.end_page + 1):
-            # Vérifier l'annulation
-            if self._cancellation_token.is_set():
+            # Vérifier l'annulation (ou l'échec d'un worker OCR du pipeline)
+            if self._cancellation_token.is_set() or self._pipeline_error is not None:
                 break
             
             logger.info(f"--- Scan page {page_num} ---")
             
             # Navigation
-            await self.kindle.navigate_to_page(page_num)
-            await asyncio.sleep(params.navigation_delay)
+            await self._go_to_page(page_num, params, params.navigation_delay)
             
-            # Capture
-            screen_data = await self.kindle.capture_screen()
+            # Capture limitée à la zone englobant les régions à analyser (toute
+            # la zone de recherche quand la zone de lecture est à vérifier)
+            if self._reading_zone is not None:
+                validating = self._reading_zone.due
+                screen_data = await self.kindle.capture_frame(self._reading_zone.next_capture_region())
+                if not validating and self._reading_zone.touches_edge(screen_data):
+                    # Texte coupé au bord de la zone : page recapturée en entier
+                    screen_data = await self.kindle.capture_frame(self._reading_zone.search_region)
+                    validating = True
+                if validating:
+                    self._reading_zone.validate(screen_data)
+            else:
+                screen_data = await self.kindle.capture_frame(params.capture_region)
             
-            # Analyse rapide pour détecter des surlignements
-            has_highlights = await self._quick_highlight_check(screen_data, params)
+            # Page déjà vue ? (empreinte de la zone de scan)
+            fingerprint = frame_fingerprint(screen_data) if self._fingerprints is not None else None
+            known = self._fingerprints.lookup(fingerprint) if fingerprint is not None else None
+            
+            if known is not None:
+                known_page, known_has_highlights = known
+                # Doublon d'une page surlignée : déjà extraite, on ne la reprend pas
+                has_highlights = False
+                if known_has_highlights:
+                    logger.info(f"↺ Page {page_num} identique à la page {known_page}: ignorée")
+                else:
+                    logger.info(f"↺ Page {page_num} identique à la page vide {known_page}")
+            else:
+                # Analyse rapide pour détecter des surlignements
+                has_highlights = await self._quick_highlight_check(screen_data, params)
+                if self._fingerprints is not None:
+                    self._fingerprints.add(fingerprint, page_num, has_highlights)
             
             if has_highlights:
                 pages_with_content.append(page_num)
                 task.pages_with_content += 1
+                if ocr_queue is not None:
+                    await ocr_queue.put((page_num, screen_data))
+                elif self._frame_cache is not None:
+                    self._frame_cache.put(page_num, screen_data)
                 logger.info(f"✓ Page {page_num} contient des surlignements")
             else:
                 logger.info(f"✗ Page {page_num} est vide")
@@ -233,9 +390,121 @@ class ExtractHighlightsUseCase:
                 message=f"Scan page {page_num}/{params.end_page}"
             ))
         
+        if self._reading_zone is not None:
+            task.metadata["reading_zone"] = self._reading_zone.zone
+        
+        if self._fingerprints is not None:
+            task.metadata["fingerprint_cache"] = self._fingerprints.stats()
+            logger.info(f"Empreintes: {self._fingerprints.hits} page(s) reconnue(s) sans analyse")
+        
         logger.info(f"=== FIN PHASE 1: {len(pages_with_content)} pages avec contenu ===")
         return pages_with_content
     
+    async def _pipelined_phases(
+        self,
+        task: ExtractionTask,
+        params: ExtractionParams
+    ) -> None:
+        """
+        Phases 1 et 2 en pipeline.
+        
+        Le scan (producteur) navigue et capture ; les frames des pages
+        surlignées passent par une file bornée consommée par des workers OCR
+        qui publient les HighlightFoundEvent au fil de l'eau. L'ordre des
+        pages est rétabli à la fin.
+        
+        L'échec de l'OCR d'une page arrête le scan ; les workers vident la
+        file (le producteur n'y reste pas bloqué) puis l'erreur est relevée.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, params.pipeline_queue_size))
+        self._pages_extracted = 0
+        self._pipeline_error = None
+        workers = [
+            asyncio.create_task(self._ocr_worker(task, params, queue))
+            for _ in range(self._pipeline_workers(params))
+        ]
+        
+        try:
+            await self._scan_phase(task, params, ocr_queue=queue)
+            
+            if task.pages_with_content and not self._cancellation_token.is_set() and self._pipeline_error is None:
+                task.transition_to(TaskStatus.EXTRACTING)
+                logger.info(f"=== PHASE 2: FIN DE L'EXTRACTION sur {task.pages_with_content} pages ===")
+                await self._publish_pipeline_progress(task, "Extraction en cours")
+            elif not task.pages_with_content:
+                logger.warning("Aucune page avec contenu trouvée")
+            
+            # Signal de fin pour chaque worker, puis attente de la vidange de la file
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                if not worker.done():
+                    worker.cancel()
+        
+        if self._pipeline_error is not None:
+            raise self._pipeline_error
+        
+        # Les workers terminent dans le désordre : tri stable par page
+        task.highlights_extracted.sort(key=lambda highlight: highlight.page_number)
+        
+        logger.info(f"=== FIN PHASE 2: {len(task.highlights_extracted)} highlights individuels extraits ===")
+    
+    def _pipeline_workers(self, params: ExtractionParams) -> int:
+        """Nombre de workers OCR du pipeline: un par processus du pool OCR par défaut."""
+        if params.ocr_workers is not None:
+            return max(1, params.ocr_workers)
+        # En mode lot, chaque page part entière vers un seul processus
+        return max(2, getattr(self.ocr, 'workers', 0))
+    
+    async def _ocr_worker(
+        self,
+        task: ExtractionTask,
+        params: ExtractionParams,
+        queue: asyncio.Queue
+    ) -> None:
+        """Worker OCR du pipeline: extrait les pages déposées dans la file."""
+        while True:
+            item = await queue.get()
+            try:
+                if item is None:
+                    return
+                
+                # Après annulation ou échec, la file est seulement vidée
+                if self._cancellation_token.is_set() or self._pipeline_error is not None:
+                    continue
+                
+                page_num, screen_data = item
+                logger.info(f"--- Extraction page {page_num} (pipeline) ---")
+                
+                try:
+                    page_highlights_count = await self._extract_page(task, params, page_num, screen_data)
+                except Exception as e:
+                    logger.error(f"Échec de l'extraction de la page {page_num}: {e}")
+                    self._pipeline_error = e
+                    continue
+                self._pages_extracted += 1
+                
+                if task.status == TaskStatus.EXTRACTING:
+                    await self._publish_pipeline_progress(
+                        task,
+                        f"Extraction page {page_num}: {page_highlights_count} surlignement(s)"
+                    )
+            finally:
+                queue.task_done()
+    
+    async def _publish_pipeline_progress(self, task: ExtractionTask, message: str) -> None:
+        """Publie la progression de la phase 2 du pipeline (50-100%)."""
+        total_pages = max(1, task.pages_with_content)
+        phase2_progress = min(self._pages_extracted, total_pages) / total_pages * 50
+        
+        await self.events.publish(TaskProgressEvent(
+            task_id=task.id,
+            progress=50 + phase2_progress,
+            message=f"{message} ({self._pages_extracted}/{task.pages_with_content})"
+        ))
+    
     async def _extraction_phase_individual(
         self,
         task: ExtractionTask,
@@ -255,95 +524,124 @@ class ExtractHighlightsUseCase:
             
             logger.info(f"--- Extraction page {page_num} ({idx+1}/{total_pages}) ---")
             
-            # Navigation
-            await self.kindle.navigate_to_page(page_num)
-            await asyncio.sleep(params.ocr_delay)
+            # Frame conservée en phase 1, sinon navigation et nouvelle capture
+            screen_data = self._frame_cache.pop(page_num) if self._frame_cache else None
+            if screen_data is None:
+                await self._go_to_page(page_num, params, params.ocr_delay)
+                screen_data = await self.kindle.capture_frame(self._capture_region(params))
+            
+            page_highlights_count = await self._extract_page(task, params, page_num, screen_data)
             
-            # Capture
-            screen_data = await self.kindle.capture_screen()
+            # Mise à jour progression
+            phase2_progress = (idx + 1) / total_pages * 50  # Phase 2 = 50% du total
+            total_progress = 50 + phase2_progress
+            
+            await self.events.publish(TaskProgressEvent(
+                task_id=task.id,
+                progress=total_progress,
+                message=f"Extraction page {page_num}: {page_highlights_count} surlignement(s) ({idx+1}/{total_pages})"
+            ))
+        
+        logger.info(f"=== FIN PHASE 2: {len(task.highlights_extracted)} highlights individuels extraits ===")
+    
+    async def _extract_page(
+        self,
+        task: ExtractionTask,
+        params: ExtractionParams,
+        page_num: int,
+        screen_data: Frame
+    ) -> int:
+        """
+        Extrait les surlignements individuels d'une page capturée.
+        
+        Returns:
+            Nombre de surlignements valides ajoutés à la tâche
+        """
+        # Extraction des surlignements individuels sur toutes les régions
+        page_highlights_count = 0
+        for region_idx, region in enumerate(self._scan_regions(params)):
             
-            # Extraction des surlignements individuels sur toutes les régions
-            page_highlights_count = 0
-            for region_idx, region in enumerate(params.scan_regions):
+            # NOUVELLE MÉTHODE: Extraction individuelle des surlignements
+            if hasattr(self.ocr, 'extract_highlights'):
+                # Utiliser la nouvelle méthode qui retourne une liste de surlignements
+                highlight_results = await self.ocr.extract_highlights(screen_data, region)
                 
-                # NOUVELLE MÉTHODE: Extraction individuelle des surlignements
-                if hasattr(self.ocr, 'extract_highlights'):
-                    # Utiliser la nouvelle méthode qui retourne une liste de surlignements
-                    highlight_results = await self.ocr.extract_highlights(screen_data, region)
-                    
-                    logger.info(f"  Région {region_idx + 1}: {len(highlight_results)} surlignement(s) détecté(s)")
-                    
-                    # Traiter chaque surlignement individuellement
-                    for highlight_result in highlight_results:
-                        if self._is_valid_highlight_result(highlight_result, params):
-                            # Créer un objet Highlight pour chaque surlignement individuel
-                            highlight = Highlight.create(
-                                book_id=task.book_id,
-                                page_number=page_num,
-                                text=highlight_result.text,
-                                confidence=highlight_result.confidence,
-                                position=(
-                                    highlight_result.position[0],  # x
-                                    highlight_result.position[1],  # y
-                                    highlight_result.size[0],      # width
-                                    highlight_result.size[1]       # height
-                                ),
-                                highlight_number=highlight_result.highlight_number  # Nouveau champ
-                            )
-                            
-                            task.add_highlight(highlight)
-                            page_highlights_count += 1
-                            await self.events.publish(HighlightFoundEvent(task_id=task.id, highlight=highlight))
-                            
-                            logger.info(f"  ✓ Surlignement #{highlight_result.highlight_number} extrait: '{highlight_result.text[:50]}{'...' if len(highlight_result.text) > 50 else ''}' (confiance: {highlight_result.confidence:.0f}%)")
+                logger.info(f"  Région {region_idx + 1}: {len(highlight_results)} surlignement(s) détecté(s)")
                 
-                else:
-                    # COMPATIBILITÉ: Méthode classique (fallback)
-                    logger.warning("Méthode extract_highlights non disponible, utilisation de extract_text")
-                    text, confidence = await self.ocr.extract_text(screen_data, region)
-                    
-                    if self._is_valid_highlight_text(text, confidence, params):
+                # Traiter chaque surlignement individuellement
+                for highlight_result in highlight_results:
+                    if self._is_valid_highlight_result(highlight_result, params):
+                        # Créer un objet Highlight pour chaque surlignement individuel
                         highlight = Highlight.create(
                             book_id=task.book_id,
                             page_number=page_num,
-                            text=text,
-                            confidence=confidence,
-                            position=region
+                            text=highlight_result.text,
+                            confidence=highlight_result.confidence,
+                            position=(
+                                highlight_result.position[0],  # x
+                                highlight_result.position[1],  # y
+                                highlight_result.size[0],      # width
+                                highlight_result.size[1]       # height
+                            ),
+                            highlight_number=highlight_result.highlight_number,  # Nouveau champ
+                            color=getattr(highlight_result, 'color', "yellow")
                         )
                         
                         task.add_highlight(highlight)
                         page_highlights_count += 1
                         await self.events.publish(HighlightFoundEvent(task_id=task.id, highlight=highlight))
-                        logger.info(f"✓ Highlight classique extrait: '{text[:50]}...' (confiance: {confidence:.0f}%)")
+                        
+                        logger.info(f"  ✓ Surlignement #{highlight_result.highlight_number} extrait: '{highlight_result.text[:50]}{'...' if len(highlight_result.text) > 50 else ''}' (confiance: {highlight_result.confidence:.0f}%)")
             
-            if page_highlights_count == 0:
-                logger.warning(f"Aucun highlight valide trouvé sur la page {page_num}")
             else:
-                logger.info(f"✓ Page {page_num}: {page_highlights_count} surlignement(s) extrait(s)")
-            
-            # Mise à jour progression
-            phase2_progress = (idx + 1) / total_pages * 50  # Phase 2 = 50% du total
-            total_progress = 50 + phase2_progress
-            
-            await self.events.publish(TaskProgressEvent(
-                task_id=task.id,
-                progress=total_progress,
-                message=f"Extraction page {page_num}: {page_highlights_count} surlignement(s) ({idx+1}/{total_pages})"
-            ))
+                # COMPATIBILITÉ: Méthode classique (fallback)
+                logger.warning("Méthode extract_highlights non disponible, utilisation de extract_text")
+                text, confidence = await self.ocr.extract_text(screen_data, region)
+                
+                if self._is_valid_highlight_text(text, confidence, params):
+                    highlight = Highlight.create(
+                        book_id=task.book_id,
+                        page_number=page_num,
+                        text=text,
+                        confidence=confidence,
+                        position=region
+                    )
+                    
+                    task.add_highlight(highlight)
+                    page_highlights_count += 1
+                    await self.events.publish(HighlightFoundEvent(task_id=task.id, highlight=highlight))
+                    logger.info(f"✓ Highlight classique extrait: '{text[:50]}...' (confiance: {confidence:.0f}%)")
         
-        logger.info(f"=== FIN PHASE 2: {len(task.highlights_extracted)} highlights individuels extraits ===")
+        if page_highlights_count == 0:
+            logger.warning(f"Aucun highlight valide trouvé sur la page {page_num}")
+        else:
+            logger.info(f"✓ Page {page_num}: {page_highlights_count} surlignement(s) extrait(s)")
+        
+        return page_highlights_count
     
     async def _quick_highlight_check(
         self,
-        screen_data: bytes,
+        screen_data: Frame,
         params: ExtractionParams
     ) -> bool:
         """
         Vérification rapide si la page contient des surlignements.
         """
+        # Détection seule (sans OCR) si le moteur la propose : assez légère
+        # pour vérifier toutes les régions
+        scan_regions = self._scan_regions(params)
+        if hasattr(self.ocr, 'has_highlights'):
+            for region in scan_regions:
+                if await self.ocr.has_highlights(screen_data, region):
+                    logger.debug(f"Quick check found highlights in region {region}")
+                    return True
+            
+            logger.debug("Quick check found no highlights")
+            return False
+        
         # Utiliser la première région définie ou une zone par défaut
-        if params.scan_regions and len(params.scan_regions) > 0:
-            test_region = params.scan_regions[0]
+        if scan_regions and len(scan_regions) > 0:
+            test_region = scan_regions[0]
             logger.debug(f"Quick check using custom region: {test_region}")
         else:
             # Zone de test par défaut
@@ -0,0 +1,88 @@
+"""
+Cache des frames capturées en phase 1 pour l'OCR de la phase 2
+"""
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+from typing import Dict, Optional
+
+from src.application.ports.kindle_controller import Frame
+
+logger = logging.getLogger(__name__)
+
+
+class FrameCache:
+    """
+    Conserve les frames des pages à traiter pour éviter une seconde navigation.
+    
+    Les frames restent en mémoire tant que le budget n'est pas dépassé ; au-delà,
+    elles sont déversées sur disque dans un dossier temporaire supprimé par close().
+    """
+    
+    def __init__(self, max_memory_bytes: int = 512 * 1024 * 1024):
+        """
+        Args:
+            max_memory_bytes: Budget mémoire avant déversement sur disque
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self._memory: Dict[int, Frame] = {}
+        self._spilled: Dict[int, str] = {}
+        self._memory_bytes = 0
+        self._spill_dir: Optional[str] = None
+    
+    def put(self, page: int, frame: Frame) -> None:
+        """Ajoute la frame d'une page."""
+        self.discard(page)
+        size = frame.nbytes
+        
+        if self._memory_bytes + size <= self.max_memory_bytes:
+            self._memory[page] = frame
+            self._memory_bytes += size
+            return
+        
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="allambik_frames_")
+            logger.info(f"Budget mémoire des frames atteint, déversement dans {self._spill_dir}")
+        
+        path = os.path.join(self._spill_dir, f"page_{page:05d}.pkl")
+        with open(path, 'wb') as f:
+            pickle.dump(frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._spilled[page] = path
+    
+    def pop(self, page: int) -> Optional[Frame]:
+        """Retire et retourne la frame d'une page (None si absente)."""
+        frame = self._memory.pop(page, None)
+        if frame is not None:
+            self._memory_bytes -= frame.nbytes
+            return frame
+        
+        path = self._spilled.pop(page, None)
+        if path is None:
+            return None
+        
+        with open(path, 'rb') as f:
+            frame = pickle.load(f)
+        os.remove(path)
+        return frame
+    
+    def discard(self, page: int) -> None:
+        """Oublie la frame d'une page si elle est présente."""
+        self.pop(page)
+    
+    def __contains__(self, page: int) -> bool:
+        return page in self._memory or page in self._spilled
+    
+    def __len__(self) -> int:
+        return len(self._memory) + len(self._spilled)
+    
+    def close(self) -> None:
+        """Libère la mémoire et supprime les frames déversées sur disque."""
+        self._memory.clear()
+        self._spilled.clear()
+        self._memory_bytes = 0
+        
+        if self._spill_dir:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
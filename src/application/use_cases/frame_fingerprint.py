@@ -0,0 +1,107 @@
+"""
+Empreinte perceptuelle des frames - reconnaît une page déjà vue pendant le scan
+"""
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.application.ports.kindle_controller import Frame
+
+logger = logging.getLogger(__name__)
+
+# Écart de gris minimal (0-255) entre deux cellules voisines pour compter un bit
+GRAY_TOLERANCE = 2.0
+
+
+def frame_fingerprint(frame: Frame, size: int = 32) -> Optional[int]:
+    """
+    Calcule l'empreinte (dHash) d'une frame.
+    
+    La frame est réduite à size x (size + 1) cellules en niveaux de gris ;
+    chaque bit indique si une cellule est nettement plus claire que sa voisine
+    de gauche (marge de GRAY_TOLERANCE, pour que les zones unies restent stables).
+    
+    Args:
+        frame: Frame capturée (zone de scan)
+        size: Côté de la grille (size * size bits)
+    
+    Returns:
+        Empreinte entière, ou None si la frame est trop petite pour la grille
+    """
+    if frame.height < size or frame.width < size + 1:
+        return None
+    
+    if isinstance(frame.pixels, np.ndarray):
+        pixels = frame.pixels.reshape(frame.shape)
+    else:
+        pixels = np.frombuffer(frame.pixels, dtype=np.uint8).reshape(frame.shape)
+    
+    # Sous-échantillonnage par pas (au moins 4 pixels par cellule), puis moyenne par cellule
+    step = max(1, min(frame.height // (size * 4), frame.width // ((size + 1) * 4)))
+    sample = pixels[::step, ::step]
+    
+    rows = np.linspace(0, sample.shape[0], size, endpoint=False).astype(np.intp)
+    cols = np.linspace(0, sample.shape[1], size + 1, endpoint=False).astype(np.intp)
+    sums = np.add.reduceat(np.add.reduceat(sample, rows, axis=0, dtype=np.uint32), cols, axis=1)
+    
+    row_counts = np.diff(np.append(rows, sample.shape[0]))
+    col_counts = np.diff(np.append(cols, sample.shape[1]))
+    gray = sums.sum(axis=2) / np.outer(row_counts, col_counts) / pixels.shape[2]
+    
+    bits = gray[:, 1:] > gray[:, :-1] + GRAY_TOLERANCE
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+class FrameFingerprintCache:
+    """
+    Verdicts du scan indexés par empreinte de frame.
+    
+    Une page presque identique (distance de Hamming <= max_distance) à une
+    page vide déjà analysée est vide. Une page surlignée n'est reconnue que
+    sur une empreinte identique : c'est un doublon (dernière page répétée en
+    fin de livre), à ne pas extraire une seconde fois.
+    """
+    
+    def __init__(self, max_distance: int = 4):
+        """
+        Args:
+            max_distance: Nombre de bits différents tolérés pour une page vide
+        """
+        self.max_distance = max_distance
+        self._entries: List[Tuple[int, int, bool]] = []
+        self.hits = 0
+        self.misses = 0
+    
+    def lookup(self, fingerprint: Optional[int]) -> Optional[Tuple[int, bool]]:
+        """
+        Cherche une page déjà analysée correspondant à l'empreinte.
+        
+        Returns:
+            Tuple (numéro de la page connue, contient des surlignements) ou None
+        """
+        if fingerprint is None:
+            return None
+        
+        for known, page_number, has_highlights in self._entries:
+            distance = (known ^ fingerprint).bit_count()
+            if distance == 0 or (distance <= self.max_distance and not has_highlights):
+                self.hits += 1
+                return page_number, has_highlights
+        
+        self.misses += 1
+        return None
+    
+    def add(self, fingerprint: Optional[int], page_number: int, has_highlights: bool) -> None:
+        """Enregistre le verdict du scan d'une page."""
+        if fingerprint is not None:
+            self._entries.append((fingerprint, page_number, has_highlights))
+    
+    def stats(self) -> Dict[str, float]:
+        """Statistiques d'utilisation (pour les métadonnées de la tâche)."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
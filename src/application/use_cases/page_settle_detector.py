@@ -0,0 +1,85 @@
+"""
+Détection de stabilisation de page - remplace les délais fixes après navigation
+"""
+import asyncio
+import hashlib
+import logging
+from typing import Optional
+
+from src.application.ports.kindle_controller import KindleController
+
+logger = logging.getLogger(__name__)
+
+
+class PageSettleDetector:
+    """
+    Attend qu'une page Kindle soit entièrement affichée après un changement de page.
+    
+    Sonde des captures basse résolution de la zone de scan et rend la main dès
+    que deux captures consécutives sont identiques. Après une navigation, la
+    page doit d'abord différer de la dernière page stabilisée, pour ne pas
+    valider l'ancienne page avant que Kindle n'ait commencé à tourner la page.
+    """
+    
+    def __init__(
+        self,
+        kindle_controller: KindleController,
+        timeout: float = 2.0,
+        poll_interval: float = 0.05,
+        downscale: int = 4
+    ):
+        """
+        Args:
+            kindle_controller: Contrôleur utilisé pour les captures de sondage
+            timeout: Attente maximale en secondes avant de continuer quand même
+            poll_interval: Délai entre deux captures de sondage
+            downscale: Facteur de sous-échantillonnage des captures de sondage
+        """
+        self.kindle = kindle_controller
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.downscale = downscale
+        self._last_settled: Optional[bytes] = None
+    
+    async def wait_until_settled(
+        self,
+        region: Optional[tuple[int, int, int, int]] = None,
+        expect_change: bool = True
+    ) -> bool:
+        """
+        Attend la stabilisation de l'affichage.
+        
+        Args:
+            region: Zone écran à surveiller (x, y, width, height)
+            expect_change: Si True, la page doit différer de la précédente
+                page stabilisée avant d'être validée
+            
+        Returns:
+            True si la page s'est stabilisée, False si le délai a expiré
+        """
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + self.timeout
+        previous: Optional[bytes] = None
+        changed = not expect_change or self._last_settled is None
+        polls = 0
+        
+        while True:
+            frame = await self.kindle.capture_frame(region, downscale=self.downscale)
+            digest = hashlib.md5(frame.pixels).digest()
+            polls += 1
+            
+            if not changed and digest != self._last_settled:
+                changed = True
+            elif changed and digest == previous:
+                self._last_settled = digest
+                logger.debug(f"Page stabilisée après {polls} capture(s)")
+                return True
+            
+            previous = digest
+            
+            if loop.time() >= deadline:
+                self._last_settled = digest
+                logger.warning(f"Page non stabilisée après {self.timeout:.1f}s ({polls} captures) - poursuite")
+                return False
+            
+            await asyncio.sleep(self.poll_interval)
@@ -0,0 +1,271 @@
+"""
+Détection automatique de la zone de lecture - réduit la zone de scan à la colonne de texte
+"""
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.application.ports.kindle_controller import Frame
+
+logger = logging.getLogger(__name__)
+
+Region = Tuple[int, int, int, int]
+
+
+def _ink_runs(profile: np.ndarray, max_gap: int) -> List[Tuple[int, int, int]]:
+    """
+    Regroupe les positions non vides d'un profil en plages (début, fin, encre)
+    
+    Deux plages séparées par au plus max_gap positions vides sont fusionnées.
+    """
+    positions = np.flatnonzero(profile)
+    if positions.size == 0:
+        return []
+    
+    breaks = np.flatnonzero(np.diff(positions) > max_gap + 1)
+    starts = np.concatenate(([positions[0]], positions[breaks + 1]))
+    ends = np.concatenate((positions[breaks], [positions[-1]])) + 1
+    cumulative = np.concatenate(([0], np.cumsum(profile)))
+    return [(int(s), int(e), int(cumulative[e] - cumulative[s])) for s, e in zip(starts, ends)]
+
+
+def _densest_band(ink: np.ndarray, axis: int, max_gap: int) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Plage la plus encrée le long d'un axe (0 = lignes, 1 = colonnes)
+    
+    Les lignes ou colonnes encrées sur presque toute leur longueur (filets,
+    barres d'outils, bords de fenêtre) sont des séparateurs : une plage ne
+    les traverse pas.
+    
+    Returns:
+        Tuple (début, fin, début du cadre, fin du cadre) ; le cadre est
+        l'intervalle entre les séparateurs qui entourent la plage
+    """
+    profile = ink.sum(axis=1 - axis)
+    separators = profile >= 0.97 * ink.shape[1 - axis]
+    profile[separators] = 0
+    profile[profile < 2] = 0  # Pixels isolés (bruit, ombres)
+    
+    bands = []
+    bounds = [0, *(np.flatnonzero(separators) + 1), profile.size]
+    for frame_start, frame_end in zip(bounds[:-1], bounds[1:]):
+        for start, end, amount in _ink_runs(profile[frame_start:frame_end], max_gap):
+            bands.append((amount, frame_start + start, frame_start + end, frame_start, frame_end))
+    if not bands:
+        return None
+    
+    _, start, end, frame_start, frame_end = max(bands)
+    return int(start), int(end), int(frame_start), int(frame_end)
+
+
+def _frame_pixels(frame: Frame) -> np.ndarray:
+    """Pixels d'une Frame en ndarray (hauteur, largeur, canaux)."""
+    if isinstance(frame.pixels, np.ndarray):
+        return frame.pixels.reshape(frame.shape)
+    return np.frombuffer(frame.pixels, dtype=np.uint8).reshape(frame.shape)
+
+
+def _ink_mask(pixels: np.ndarray, color_tolerance: int) -> np.ndarray:
+    """
+    Pixels d'encre : tout ce qui s'écarte de la couleur de fond
+    
+    Le fond est la couleur dominante (quantifiée) d'un échantillon de pixels.
+    """
+    sample = pixels[::2, ::2, :3].reshape(-1, 3) >> 4
+    codes = (sample[:, 0].astype(np.int32) << 8) | (sample[:, 1].astype(np.int32) << 4) | sample[:, 2]
+    dominant = int(np.bincount(codes).argmax())
+    background = np.array([(dominant >> 8) & 15, (dominant >> 4) & 15, dominant & 15]) * 16 + 8
+    
+    return np.abs(pixels[..., :3].astype(np.int16) - background).max(axis=2) > color_tolerance
+
+
+def find_reading_zone(
+    frame: Frame,
+    padding: int = 12,
+    color_tolerance: int = 40,
+    max_gap_ratio: float = 0.035,
+    min_height_ratio: float = 0.3
+) -> Optional[Region]:
+    """
+    Trouve la colonne de texte Kindle dans une capture
+    
+    Le fond de page est la couleur dominante (blanc, sépia ou noir selon le
+    thème) ; tout le reste est de l'encre (texte, surlignements, icônes).
+    Les lignes et colonnes presque entièrement encrées (filets, barres d'outils,
+    bords de fenêtre) séparent la page de l'interface : on garde le bloc de
+    lignes le plus encré, puis le bloc de colonnes le plus encré de ces lignes,
+    et on recommence une fois à l'intérieur de ce cadre. Les marges blanches
+    restent à l'extérieur.
+    
+    Args:
+        frame: Capture de la zone de recherche
+        padding: Marge ajoutée autour du texte trouvé, en pixels
+        color_tolerance: Écart maximal (par canal) avec la couleur du fond
+        max_gap_ratio: Blanc maximal (fraction de la capture) à l'intérieur de la zone
+        min_height_ratio: Hauteur minimale de la zone ; en dessous (page presque
+            vide, page de titre) la capture ne permet pas de conclure
+    
+    Returns:
+        Zone (x, y, width, height) en coordonnées écran, ou None
+    """
+    pixels = _frame_pixels(frame)
+    height, width = pixels.shape[:2]
+    
+    # Analyse à demi-résolution : les marges et les lignes restent bien visibles
+    step = 2
+    ink = _ink_mask(pixels[::step, ::step], color_tolerance)
+    
+    # Lignes puis colonnes, deux fois : le second passage se limite au cadre
+    # de la page (entre les séparateurs trouvés au premier), sans l'interface
+    # autour (barres latérales, bureau)
+    row_gap = max(1, int(max_gap_ratio * ink.shape[0]))
+    column_gap = max(1, int(max_gap_ratio * ink.shape[1]))
+    frame_top, frame_bottom, frame_left, frame_right = 0, ink.shape[0], 0, ink.shape[1]
+    for _ in range(2):
+        rows = _densest_band(ink[frame_top:frame_bottom, frame_left:frame_right], 0, row_gap)
+        if rows is None:
+            return None
+        top, bottom = frame_top + rows[0], frame_top + rows[1]
+        frame_top, frame_bottom = frame_top + rows[2], frame_top + rows[3]
+        
+        columns = _densest_band(ink[top:bottom, frame_left:frame_right], 1, column_gap)
+        if columns is None:
+            return None
+        left, right = frame_left + columns[0], frame_left + columns[1]
+        frame_left, frame_right = frame_left + columns[2], frame_left + columns[3]
+    
+    if bottom - top < min_height_ratio * ink.shape[0]:
+        logger.debug(f"Zone de lecture non concluante ({(right - left) * step}x{(bottom - top) * step})")
+        return None
+    
+    left, top = max(0, left * step - padding), max(0, top * step - padding)
+    right, bottom = min(width, right * step + padding), min(height, bottom * step + padding)
+    
+    origin_x, origin_y = frame.origin
+    return (origin_x + left, origin_y + top, right - left, bottom - top)
+
+
+class ReadingZoneTracker:
+    """
+    Zone de lecture suivie pendant une extraction.
+    
+    Tant que la zone n'est pas confirmée, et ensuite toutes les revalidate_every
+    pages, la page est capturée sur toute la zone de recherche pour (re)trouver
+    la colonne de texte. La zone est l'union des colonnes trouvées : elle ne
+    fait que s'agrandir.
+    
+    Une page courte (fin de chapitre) ne doit pas fixer la hauteur : tant que
+    confirm_pages pages concluantes de suite n'ont pas agrandi la zone, seules
+    les marges latérales sont retirées et toute la hauteur de recherche est
+    analysée. Une fois confirmée, une page dont l'encre touche le bord de la
+    zone (texte coupé) est recapturée sur la zone de recherche et agrandit la zone.
+    """
+    
+    def __init__(
+        self,
+        search_region: Region,
+        revalidate_every: int = 20,
+        padding: int = 12,
+        confirm_pages: int = 3,
+        color_tolerance: int = 40
+    ):
+        """
+        Args:
+            search_region: Zone large dans laquelle chercher la colonne de texte
+            revalidate_every: Nombre de pages entre deux vérifications de la zone
+            padding: Marge autour du texte trouvé, en pixels
+            confirm_pages: Pages concluantes de suite, sans agrandissement, avant
+                de réduire la hauteur
+            color_tolerance: Écart au fond (par canal) compté comme encre au bord de la zone
+        """
+        self.search_region = search_region
+        self.revalidate_every = revalidate_every
+        self.padding = padding
+        self.confirm_pages = confirm_pages
+        self.color_tolerance = color_tolerance
+        self.zone: Optional[Region] = None        # Zone capturée et analysée
+        self._text_zone: Optional[Region] = None  # Union des colonnes trouvées
+        self._agreeing_pages = 0
+        self._pages_since_check = 0
+    
+    @property
+    def confirmed(self) -> bool:
+        """La hauteur de la zone est-elle établie sur assez de pages ?"""
+        return self._agreeing_pages >= self.confirm_pages
+    
+    @property
+    def due(self) -> bool:
+        """La prochaine capture doit-elle couvrir toute la zone de recherche ?"""
+        return not self.confirmed or self._pages_since_check >= self.revalidate_every
+    
+    def next_capture_region(self) -> Region:
+        """Zone à capturer pour la page suivante (zone de recherche si vérification due)."""
+        if self.due:
+            return self.search_region
+        self._pages_since_check += 1
+        return self.zone
+    
+    def validate(self, frame: Frame) -> Optional[Region]:
+        """
+        Analyse une capture de la zone de recherche et met à jour la zone.
+        
+        Returns:
+            Zone de lecture courante (None tant qu'aucune page n'est concluante)
+        """
+        proposal = find_reading_zone(frame, padding=self.padding)
+        self._pages_since_check = 0
+        
+        if proposal is None:
+            # Page non concluante : la confirmation reprend à zéro si elle est en cours
+            if not self.confirmed:
+                self._agreeing_pages = 0
+            return self.zone
+        
+        if self._text_zone is None:
+            text_zone = proposal
+        else:
+            # Union de la zone courante et de la nouvelle proposition
+            left = min(self._text_zone[0], proposal[0])
+            top = min(self._text_zone[1], proposal[1])
+            right = max(self._text_zone[0] + self._text_zone[2], proposal[0] + proposal[2])
+            bottom = max(self._text_zone[1] + self._text_zone[3], proposal[1] + proposal[3])
+            text_zone = (left, top, right - left, bottom - top)
+        
+        # Une page qui agrandit la zone relance la confirmation
+        self._agreeing_pages = self._agreeing_pages + 1 if text_zone == self._text_zone else 1
+        self._text_zone = text_zone
+        self._update_zone()
+        return self.zone
+    
+    def touches_edge(self, frame: Frame, edge: int = 2) -> bool:
+        """
+        L'encre d'une capture de la zone touche-t-elle son bord (texte coupé) ?
+        
+        Si oui, la zone repasse en confirmation : la page doit être recapturée
+        sur la zone de recherche et validée.
+        """
+        ink = _ink_mask(_frame_pixels(frame), self.color_tolerance)
+        touching = bool(ink[:edge].any() or ink[-edge:].any() or ink[:, :edge].any() or ink[:, -edge:].any())
+        if touching:
+            logger.info("Zone de lecture: contenu au bord de la zone, nouvelle vérification")
+            self._agreeing_pages = 0
+            self._update_zone()
+        return touching
+    
+    def _update_zone(self) -> None:
+        """Zone effective : toute la hauteur de recherche tant que la zone n'est pas confirmée."""
+        zone = self._text_zone
+        if not self.confirmed:
+            _, search_y, _, search_h = self.search_region
+            zone = (zone[0], search_y, zone[2], search_h)
+        
+        if zone != self.zone:
+            _, _, search_w, search_h = self.search_region
+            share = zone[2] * zone[3] / (search_w * search_h)
+            logger.info(f"Zone de lecture: {zone} ({share:.0%} de la zone de recherche)")
+            self.zone = zone
+    
+    def regions(self, default: List[Region]) -> List[Region]:
+        """Zones à analyser : la zone de lecture si établie, sinon les zones par défaut."""
+        return [self.zone] if self.zone is not None else default
@@ -22,6 +22,7 @@ class Highlight:
         position: Position dans la page (x, y, width, height)
         highlight_number: Numéro du surlignement sur la page (1, 2, 3...)
         session_id: Identifiant de la session d'extraction
+        color: Couleur du surlignement Kindle (yellow, blue, pink, orange)
     """
     id: uuid.UUID
     book_id: uuid.UUID
@@ -32,6 +33,7 @@ class Highlight:
     position: Optional[tuple[int, int, int, int]] = None
     highlight_number: int = 1  # Nouveau: numéro du surlignement sur la page
     session_id: Optional[str] = None  # Nouveau: pour grouper les extractions
+    color: str = "yellow"
     
     def __post_init__(self):
         """Validation des invariants métier."""
@@ -60,7 +62,8 @@ class Highlight:
         confidence: float,
         position: Optional[tuple[int, int, int, int]] = None,
         highlight_number: int = 1,
-        session_id: Optional[str] = None
+        session_id: Optional[str] = None,
+        color: str = "yellow"
     ) -> "Highlight":
         """Factory method pour créer un nouveau highlight individuel."""
         # Générer un session_id automatique si non fourni
@@ -76,7 +79,8 @@ class Highlight:
             extracted_at=datetime.now(),
             position=position,
             highlight_number=highlight_number,
-            session_id=session_id
+            session_id=session_id,
+            color=color
         )
     
     @property
@@ -152,6 +156,7 @@ class Highlight:
             "confidence_level": self.confidence_level,
             "extracted_at": self.extracted_at.isoformat(),
             "session_id": self.session_id,
+            "color": self.color,
             "position": {
                 "x": self.position[0],
                 "y": self.position[1],
@@ -184,7 +189,8 @@ class Highlight:
             extracted_at=datetime.fromisoformat(data["extracted_at"]),
             position=position,
             highlight_number=data.get("highlight_number", 1),
-            session_id=data.get("session_id")
+            session_id=data.get("session_id"),
+            color=data.get("color", "yellow")
         )
     
     def get_display_title(self) -> str:
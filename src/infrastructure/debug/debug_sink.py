@@ -0,0 +1,198 @@
+"""
+Puits d'images de debug partagé - écriture en arrière-plan et échantillonnage
+"""
+import itertools
+import logging
+import multiprocessing.util
+import os
+import queue
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Union
+
+import cv2
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+class DebugImageSink:
+    """
+    Reçoit les images de debug du détecteur, de l'OCR et du contrôleur.
+    
+    Les images sont placées dans une file bornée et encodées en PNG par un
+    thread d'écriture : le chemin critique ne fait qu'un put_nowait. Quand la
+    file est pleine, l'image est abandonnée (comptée dans dropped) plutôt que
+    de ralentir l'extraction.
+    
+    Échantillonnage :
+        every_n_pages: seules les pages multiples de N sont conservées
+            (les images sans numéro de page le sont toujours)
+        only_rejected: seules les images marquées comme rejet sont conservées
+    
+    Les noms de fichiers sont uniques : session (horodatage), pid, numéro de
+    séquence, page et étape.
+    """
+    
+    def __init__(
+        self,
+        root_dir: str = ".",
+        max_queue: int = 64,
+        every_n_pages: int = 1,
+        only_rejected: bool = False
+    ):
+        """
+        Args:
+            root_dir: Dossier racine des sous-dossiers de debug
+            max_queue: Nombre maximal d'images en attente d'écriture
+            every_n_pages: Période d'échantillonnage des pages
+            only_rejected: Ne garder que les régions / surlignements rejetés
+        """
+        self.root_dir = root_dir
+        self.max_queue = max_queue
+        self.every_n_pages = every_n_pages
+        self.only_rejected = only_rejected
+        
+        self._session = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self._reset()
+    
+    def _reset(self) -> None:
+        """File, thread et compteurs propres au processus courant."""
+        self._pid = os.getpid()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=self.max_queue)
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+        
+        self.written = 0
+        self.dropped = 0
+        self.skipped = 0
+    
+    def _check_process(self) -> None:
+        """Après un fork (processus du pool), le thread d'écriture du parent n'existe plus."""
+        if self._pid != os.getpid():
+            self._reset()
+    
+    def __reduce__(self):
+        # Copie vers un processus du pool : mêmes réglages, file et thread propres
+        return (DebugImageSink, (self.root_dir, self.max_queue, self.every_n_pages, self.only_rejected))
+    
+    def samples_page(self, page_number: Optional[int]) -> bool:
+        """La page fait-elle partie de l'échantillon ? (à tester avant de préparer les images)"""
+        if page_number is None or self.every_n_pages <= 1:
+            return True
+        return page_number % self.every_n_pages == 0
+    
+    def submit(
+        self,
+        directory: str,
+        stage: str,
+        image: Union[np.ndarray, Image.Image],
+        page_number: Optional[int] = None,
+        rejected: bool = False,
+        bgr: bool = False
+    ) -> Optional[str]:
+        """
+        Met une image en file d'écriture.
+        
+        L'image ne doit plus être modifiée par l'appelant après la soumission.
+        
+        Args:
+            directory: Sous-dossier de destination (ex. "debug_highlights")
+            stage: Étape du traitement, reprise dans le nom du fichier
+            image: Pixels (RGB, BGR si bgr=True, ou masque 2D) ou image PIL
+            page_number: Page d'origine, pour l'échantillonnage et le nom
+            rejected: L'image illustre un rejet (région ou surlignement)
+            bgr: Les pixels sont déjà dans l'ordre OpenCV
+            
+        Returns:
+            Chemin du fichier qui sera écrit, ou None si l'image est écartée
+        """
+        self._check_process()
+        if (self.only_rejected and not rejected) or not self.samples_page(page_number):
+            self.skipped += 1
+            return None
+        
+        page = f"_p{page_number:04d}" if page_number is not None else ""
+        filename = f"{self._session}_{self._pid}_{next(self._sequence):06d}{page}_{stage}.png"
+        path = os.path.join(self.root_dir, directory, filename)
+        
+        try:
+            self._queue.put_nowait((path, image, bgr))
+        except queue.Full:
+            self.dropped += 1
+            logger.debug(f"File de debug pleine, image abandonnée: {filename}")
+            return None
+        
+        self._ensure_writer()
+        return path
+    
+    def flush(self) -> None:
+        """Attend que toutes les images en file soient écrites."""
+        self._check_process()
+        if self._writer is not None:
+            self._queue.join()
+    
+    def close(self) -> None:
+        """Écrit les images en attente puis arrête le thread d'écriture."""
+        self._check_process()
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(None)
+            writer.join()
+    
+    def stats(self) -> Dict[str, int]:
+        """Compteurs d'images écrites, abandonnées (file pleine) et non échantillonnées."""
+        return {"written": self.written, "dropped": self.dropped, "skipped": self.skipped}
+    
+    def _ensure_writer(self) -> None:
+        """Démarre le thread d'écriture à la première image."""
+        if self._writer is not None:
+            return
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="debug-image-writer", daemon=True)
+                self._writer.start()
+                # Images en attente écrites à la sortie, y compris dans un processus
+                # du pool (qui se termine par os._exit, sans passer par atexit)
+                multiprocessing.util.Finalize(self, self.close, exitpriority=10)
+    
+    def _write_loop(self) -> None:
+        """Boucle du thread d'écriture."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                
+                path, image, bgr = item
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                
+                if isinstance(image, np.ndarray):
+                    if image.ndim == 3 and not bgr:
+                        image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+                    cv2.imwrite(path, image)
+                else:
+                    image.save(path)
+                
+                self.written += 1
+                
+            except Exception as e:
+                logger.error(f"Échec de l'écriture de l'image de debug: {e}")
+            finally:
+                self._queue.task_done()
+
+
+_shared_sink: Optional[DebugImageSink] = None
+_shared_lock = threading.Lock()
+
+
+def shared_debug_sink() -> DebugImageSink:
+    """Puits commun aux composants qui n'en reçoivent pas explicitement (créé à la demande)."""
+    global _shared_sink
+    with _shared_lock:
+        if _shared_sink is None:
+            _shared_sink = DebugImageSink()
+        return _shared_sink
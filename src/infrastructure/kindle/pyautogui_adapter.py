@@ -2,28 +2,47 @@
 Adaptateur PyAutoGUI - Implémentation concrète de KindleController
 """
 import asyncio
-from typing import Optional
+from functools import partial
+from typing import Optional, Tuple
 import pyautogui
 from PIL import ImageGrab
+import numpy as np
 import io
 import logging
-import os
-from datetime import datetime
+import threading
 
-from src.application.ports.kindle_controller import KindleController
+from src.application.ports.kindle_controller import KindleController, Frame
+from src.infrastructure.debug.debug_sink import DebugImageSink, shared_debug_sink
 
 logger = logging.getLogger(__name__)
 
+# mss (dépendance du projet) capture réellement une sous-zone de l'écran :
+# c'est le chemin par défaut. ImageGrab, utilisé seulement si mss manque,
+# capture tout le bureau virtuel puis recadre sous Windows.
+try:
+    import mss
+except ImportError:
+    mss = None
+
 
 class PyAutoGuiKindleController(KindleController):
     """Contrôleur Kindle utilisant PyAutoGUI."""
     
-    def __init__(self, debug_mode: bool = False):
+    def __init__(
+        self,
+        debug_mode: bool = False,
+        key_interval: float = 0.1,
+        debug_sink: Optional[DebugImageSink] = None
+    ):
         """
         Initialise le contrôleur.
         
         Args:
             debug_mode: Si True, sauvegarde les captures d'écran
+            key_interval: Délai entre deux appuis de touche consécutifs (aucun
+                délai après le dernier : l'attente de stabilisation de la page
+                revient à l'appelant)
+            debug_sink: Puits des captures de debug (défaut : puits partagé)
         """
         # Configuration PyAutoGUI
         pyautogui.FAILSAFE = True
@@ -32,6 +51,12 @@ class PyAutoGuiKindleController(KindleController):
         self.current_page = 0
         self._executor = None
         self.debug_mode = debug_mode
+        self.debug_sink = debug_sink or shared_debug_sink()
+        self.key_interval = key_interval
+        self._mss_local = threading.local()  # Une instance mss par thread
+        
+        if mss is None:
+            logger.warning("mss non installé : chaque capture lit tout l'écran puis recadre (poetry install)")
     
     async def navigate_to_page(self, page: int) -> None:
         """
@@ -50,30 +75,81 @@ class PyAutoGuiKindleController(KindleController):
         # Exécuter dans le thread pool
         loop = asyncio.get_event_loop()
         
-        if pages_to_move > 0:
-            # Aller vers l'avant
-            for _ in range(pages_to_move):
-                await loop.run_in_executor(
-                    self._executor,
-                    pyautogui.press,
-                    'right'
-                )
-                await asyncio.sleep(0.1)
-        else:
-            # Aller vers l'arrière
-            for _ in range(abs(pages_to_move)):
-                await loop.run_in_executor(
-                    self._executor,
-                    pyautogui.press,
-                    'left'
-                )
-                await asyncio.sleep(0.1)
+        # Aller vers l'avant ou vers l'arrière
+        key = 'right' if pages_to_move > 0 else 'left'
+        presses = abs(pages_to_move)
+        
+        for i in range(presses):
+            # Sans la pause globale PyAutoGUI : le rythme est fixé par key_interval
+            await loop.run_in_executor(
+                self._executor,
+                partial(pyautogui.press, key, _pause=False)
+            )
+            if i < presses - 1:
+                await asyncio.sleep(self.key_interval)
         
         self.current_page = page
     
+    async def capture_frame(self, region: Optional[Tuple[int, int, int, int]] = None, downscale: int = 1) -> Frame:
+        """
+        Capture l'écran actuel sans encodage PNG.
+        
+        Args:
+            region: Zone écran à capturer (x, y, width, height), tout l'écran si None
+            downscale: Facteur de sous-échantillonnage (1 = pleine résolution)
+            
+        Returns:
+            Frame RGB de la zone pour la page courante
+        """
+        loop = asyncio.get_event_loop()
+        
+        # Capture dans le thread pool
+        pixels = await loop.run_in_executor(
+            self._executor,
+            self._grab_pixels,
+            region
+        )
+        
+        if downscale > 1:
+            # Vignette basse résolution (sondage de stabilité, empreintes)
+            pixels = np.ascontiguousarray(pixels[::downscale, ::downscale])
+        elif self.debug_mode:
+            # Mode debug : sauvegarder la capture pleine résolution
+            self._save_debug_screenshot(pixels)
+        
+        origin = (region[0], region[1]) if region else (0, 0)
+        
+        logger.debug(f"Frame captured: {pixels.shape[1]}x{pixels.shape[0]} at {origin} for page {self.current_page}")
+        
+        return Frame(pixels=pixels, shape=pixels.shape, page_number=self.current_page, origin=origin)
+    
+    def _grab_pixels(self, region: Optional[Tuple[int, int, int, int]]) -> np.ndarray:
+        """Capture synchrone de la zone demandée en ndarray RGB contigu."""
+        if region is None:
+            screenshot = ImageGrab.grab()
+        else:
+            x, y, w, h = region
+            
+            if mss is not None:
+                sct = getattr(self._mss_local, 'sct', None)
+                if sct is None:
+                    sct = self._mss_local.sct = mss.mss()
+                
+                shot = sct.grab({'left': x, 'top': y, 'width': w, 'height': h})
+                bgra = np.frombuffer(shot.bgra, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+                return np.ascontiguousarray(bgra[:, :, 2::-1])
+            
+            # Coordonnées écran absolues, y compris sur les moniteurs secondaires
+            screenshot = ImageGrab.grab(bbox=(x, y, x + w, y + h), all_screens=True)
+        
+        if screenshot.mode != 'RGB':
+            screenshot = screenshot.convert('RGB')
+        
+        return np.asarray(screenshot)
+    
     async def capture_screen(self) -> bytes:
         """
-        Capture l'écran actuel.
+        Capture l'écran actuel encodée en PNG (appelants legacy et debug).
         
         Returns:
             Image de l'écran en bytes
@@ -100,53 +176,7 @@ class PyAutoGuiKindleController(KindleController):
         return buffer.read()
     
     def _save_debug_screenshot(self, screenshot):
-        """Sauvegarde la capture d'écran pour debug."""
-        try:
-            # Créer le dossier debug si nécessaire
-            debug_dir = "debug_captures"
-            os.makedirs(debug_dir, exist_ok=True)
-            
-            # Nom de fichier avec timestamp et page
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{debug_dir}/page_{self.current_page}_{timestamp}.png"
-            
-            # Sauvegarder
-            screenshot.save(filename)
-            logger.info(f"Debug: Screenshot saved to {filename}")
-            
-        except Exception as e:
-            logger.error(f"Failed to save debug screenshot: {e}")
-    
-    async def get_current_page(self) -> Optional[int]:
-        """
-        Obtient le numéro de page actuel.
-        
-        Returns:
-            Numéro de page actuel
-        """
-        return self.current_page
-    
-    async def is_kindle_running(self) -> bool:
-        """
-        Vérifie si Kindle est en cours d'exécution.
-        
-        Pour l'instant, vérifie juste si une fenêtre Kindle est visible.
-        """
-        loop = asyncio.get_event_loop()
-        
-        try:
-            # Chercher la fenêtre Kindle
-            windows = await loop.run_in_executor(
-                self._executor,
-                pyautogui.getWindowsWithTitle,
-                'Kindle'
-            )
-            
-            is_running = len(windows) > 0
-            logger.info(f"Kindle running: {is_running}")
-            
-            return is_running
-            
-        except Exception as e:
-            logger.error(f"Failed to check Kindle status: {e}")
-            return False
\ No newline at end of file
+        """Envoie la capture (pixels RGB ou image PIL) au puits de debug."""
+        path = self.debug_sink.submit("debug_captures", "screen", screenshot, self.current_page)
+        if path:
+            logger.debug(f"Debug: Screenshot queued for {path}")
@@ -0,0 +1,79 @@
+"""
+Prétraitement des crops de surlignement - variantes calculées une fois par crop
+"""
+from functools import cached_property
+from typing import Optional
+
+import cv2
+import numpy as np
+
+# Variantes disponibles pour OCRStage.preprocess
+VARIANTS = ("original", "gray", "enlarged", "enhanced", "otsu", "enlarged_otsu")
+
+
+class CropVariants:
+    """
+    Variantes d'un crop pour la cascade OCR.
+    
+    Chaque variante est un tableau numpy calculé à la première demande puis
+    réutilisé par toutes les étapes qui la sélectionnent : le niveau de gris
+    est fait une seule fois, l'agrandissement et la binarisation en partent.
+    
+    Variantes :
+        original: Pixels RGB tels que détectés
+        gray: Niveaux de gris
+        enlarged: Gris agrandi x2 (Lanczos), petites images seulement
+        enhanced: Gris avec contraste renforcé autour de la moyenne
+        otsu: Gris binarisé (seuil d'Otsu)
+        enlarged_otsu: Agrandi x2 puis binarisé
+    """
+    
+    def __init__(self, pixels: np.ndarray, contrast: float = 1.5, enlarge_max_pixels: int = 10000):
+        """
+        Args:
+            pixels: Pixels RGB du crop (fond blanc)
+            contrast: Facteur de contraste de la variante "enhanced"
+            enlarge_max_pixels: Surface au-delà de laquelle le crop n'est pas agrandi
+        """
+        self.original = pixels
+        self.contrast = contrast
+        self.enlarge_max_pixels = enlarge_max_pixels
+    
+    def get(self, name: str) -> Optional[np.ndarray]:
+        """Variante demandée (None si elle ne s'applique pas à ce crop)."""
+        if name not in VARIANTS:
+            raise ValueError(f"Prétraitement inconnu: {name}")
+        return getattr(self, name)
+    
+    @cached_property
+    def gray(self) -> np.ndarray:
+        if self.original.ndim == 2:
+            return self.original
+        return cv2.cvtColor(self.original, cv2.COLOR_RGB2GRAY)
+    
+    @cached_property
+    def enlarged(self) -> Optional[np.ndarray]:
+        height, width = self.gray.shape
+        if height * width >= self.enlarge_max_pixels:
+            return None
+        return cv2.resize(self.gray, (width * 2, height * 2), interpolation=cv2.INTER_LANCZOS4)
+    
+    @cached_property
+    def enhanced(self) -> np.ndarray:
+        # Même formule que PIL.ImageEnhance.Contrast : écart à la moyenne multiplié
+        mean = int(self.gray.mean() + 0.5)
+        lut = np.clip(mean + self.contrast * (np.arange(256) - mean), 0, 255).astype(np.uint8)
+        return cv2.LUT(self.gray, lut)
+    
+    @cached_property
+    def otsu(self) -> np.ndarray:
+        return self._binarize(self.gray)
+    
+    @cached_property
+    def enlarged_otsu(self) -> Optional[np.ndarray]:
+        return self._binarize(self.enlarged) if self.enlarged is not None else None
+    
+    @staticmethod
+    def _binarize(gray: np.ndarray) -> np.ndarray:
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        return binary
@@ -0,0 +1,288 @@
+"""
+Calibration du détecteur de surlignements sur des frames enregistrées
+
+Chaque jeu de paramètres est évalué sur toutes les frames annotées (vérité
+terrain) ; les jeux sont répartis sur un pool de processus qui reçoivent les
+frames déjà décodées une seule fois, à leur démarrage.
+"""
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.infrastructure.ocr.kindle_highlight_detector import (
+    DEFAULT_PARAMS_FILE,
+    KindleHighlightDetector
+)
+
+logger = logging.getLogger(__name__)
+
+Box = Tuple[int, int, int, int]
+
+# Espace de recherche par défaut (valeurs candidates par paramètre)
+DEFAULT_SEARCH_SPACE: Dict[str, List[Any]] = {
+    "yellow_ranges": [
+        [((20, 40, 100), (30, 255, 255)), ((15, 30, 80), (35, 200, 255)), ((18, 50, 120), (28, 255, 255))],
+        [((20, 40, 100), (30, 255, 255))],
+        [((15, 30, 80), (35, 255, 255))],
+    ],
+    "min_area": [150, 250, 400],
+    "min_yellow_ratio": [0.3, 0.4, 0.5],
+    "morphology_kernel_size": [3, 5],
+    "morphology_iterations": [1, 2],
+    "expand_x": [4, 8, 12],
+    "expand_y": [2, 4, 6],
+}
+
+
+@dataclass
+class CalibrationFrame:
+    """Frame décodée et ses surlignements attendus."""
+    name: str
+    pixels: np.ndarray                  # RGB
+    expected: List[Box]                 # Boîtes attendues, en coordonnées image
+    region: Optional[Box] = None        # Zone de lecture analysée (None = image entière)
+
+
+@dataclass
+class CalibrationResult:
+    """Score d'un jeu de paramètres sur l'ensemble des frames."""
+    params: Dict[str, Any]
+    true_positives: int
+    false_positives: int
+    false_negatives: int
+    frames: int
+    seconds: float                      # Temps cumulé de détection
+    errors: List[str] = field(default_factory=list)
+    
+    @property
+    def precision(self) -> float:
+        detected = self.true_positives + self.false_positives
+        return self.true_positives / detected if detected else 1.0
+    
+    @property
+    def recall(self) -> float:
+        expected = self.true_positives + self.false_negatives
+        return self.true_positives / expected if expected else 1.0
+    
+    @property
+    def f1(self) -> float:
+        total = self.precision + self.recall
+        return 2 * self.precision * self.recall / total if total else 0.0
+    
+    @property
+    def frames_per_second(self) -> float:
+        return self.frames / self.seconds if self.seconds > 0 else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Ligne du rapport JSON."""
+        return {
+            "parameters": self.params,
+            "precision": round(self.precision, 4),
+            "recall": round(self.recall, 4),
+            "f1": round(self.f1, 4),
+            "frames_per_second": round(self.frames_per_second, 1),
+            "true_positives": self.true_positives,
+            "false_positives": self.false_positives,
+            "false_negatives": self.false_negatives,
+            "errors": self.errors,
+        }
+
+
+def load_calibration_frames(frames_dir: str, ground_truth_path: str) -> List[CalibrationFrame]:
+    """
+    Charge et décode les frames annotées
+    
+    Format de la vérité terrain :
+        {"region": [x, y, w, h],                        (optionnel, toutes les frames)
+         "frames": {"page_001.png": [[x, y, w, h], ...],
+                    "page_002.png": {"boxes": [...], "region": [...]}}}
+    
+    Args:
+        frames_dir: Dossier des captures PNG
+        ground_truth_path: Fichier JSON des boîtes attendues par frame
+    """
+    with open(ground_truth_path, 'r', encoding='utf-8') as f:
+        ground_truth = json.load(f)
+    
+    default_region = ground_truth.get("region")
+    frames = []
+    for name, entry in sorted(ground_truth.get("frames", {}).items()):
+        if isinstance(entry, dict):
+            boxes, region = entry.get("boxes", []), entry.get("region", default_region)
+        else:
+            boxes, region = entry, default_region
+        
+        path = os.path.join(frames_dir, name)
+        if not os.path.exists(path):
+            logger.warning(f"Frame annotée introuvable, ignorée: {path}")
+            continue
+        
+        with Image.open(path) as image:
+            pixels = np.asarray(image.convert('RGB'))
+        
+        frames.append(CalibrationFrame(
+            name=name,
+            pixels=pixels,
+            expected=[tuple(box) for box in boxes],
+            region=tuple(region) if region else None
+        ))
+    
+    logger.info(f"{len(frames)} frame(s) annotée(s) chargée(s) depuis {frames_dir}")
+    return frames
+
+
+def grid_search_space(space: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Toutes les combinaisons de l'espace de recherche (le premier paramètre varie le moins vite)."""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+
+
+def random_search_space(space: Dict[str, Sequence[Any]], samples: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Combinaisons tirées au hasard, sans doublon, triées par plages de couleurs."""
+    grid = grid_search_space(space)
+    chosen = random.Random(seed).sample(range(len(grid)), min(samples, len(grid)))
+    # Indices triés : les jeux qui partagent les mêmes plages (même table de couleurs) restent groupés
+    return [grid[i] for i in sorted(chosen)]
+
+
+def box_iou(a: Box, b: Box) -> float:
+    """Intersection sur union de deux boîtes (x, y, w, h)."""
+    width = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+    height = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    intersection = width * height
+    return intersection / (a[2] * a[3] + b[2] * b[3] - intersection)
+
+
+def match_boxes(detected: Sequence[Box], expected: Sequence[Box], iou_threshold: float = 0.5) -> int:
+    """
+    Apparie détections et boîtes attendues (meilleures IoU d'abord, une seule fois chacune)
+    
+    Returns:
+        Nombre de vrais positifs
+    """
+    pairs = sorted(
+        ((box_iou(d, e), i, j) for i, d in enumerate(detected) for j, e in enumerate(expected)),
+        reverse=True
+    )
+    used_detected, used_expected = set(), set()
+    for iou, i, j in pairs:
+        if iou < iou_threshold:
+            break
+        if i not in used_detected and j not in used_expected:
+            used_detected.add(i)
+            used_expected.add(j)
+    return len(used_detected)
+
+
+def evaluate_parameters(
+    params: Dict[str, Any],
+    frames: Sequence[CalibrationFrame],
+    iou_threshold: float = 0.5
+) -> CalibrationResult:
+    """Exécute la détection avec un jeu de paramètres sur toutes les frames."""
+    detector = KindleHighlightDetector(debug_mode=False)
+    detector.apply_parameters(params)
+    # Table de couleurs compilée hors chronométrage : le débit mesuré est celui du scan
+    detector._classify_colors(np.zeros((1, 1, 3), dtype=np.uint8))
+    
+    result = CalibrationResult(params, 0, 0, 0, len(frames), 0.0)
+    for frame in frames:
+        start = time.perf_counter()
+        try:
+            detected = [d.bbox for d in detector.detect(frame.pixels, frame.region)]
+        except Exception as e:
+            # Jeu invalide (ex. noyau morphologique nul) : frame comptée comme manquée
+            result.errors.append(f"{frame.name}: {e}")
+            detected = []
+        result.seconds += time.perf_counter() - start
+        
+        matched = match_boxes(detected, frame.expected, iou_threshold)
+        result.true_positives += matched
+        result.false_positives += len(detected) - matched
+        result.false_negatives += len(frame.expected) - matched
+    
+    return result
+
+
+# Frames propres à chaque processus du pool (fournies une fois par _init_calibration_worker)
+_worker_frames: Sequence[CalibrationFrame] = ()
+_worker_iou_threshold = 0.5
+
+
+def _init_calibration_worker(frames: Sequence[CalibrationFrame], iou_threshold: float) -> None:
+    """Initialisation d'un processus de calibration : frames décodées et seuil IoU."""
+    global _worker_frames, _worker_iou_threshold
+    
+    # Un seul thread OpenCV par processus : le parallélisme vient du pool
+    import cv2
+    cv2.setNumThreads(1)
+    
+    _worker_frames = frames
+    _worker_iou_threshold = iou_threshold
+
+
+def _evaluate_in_worker(params: Dict[str, Any]) -> CalibrationResult:
+    """Point d'entrée exécuté dans un processus de calibration."""
+    return evaluate_parameters(params, _worker_frames, _worker_iou_threshold)
+
+
+def run_calibration(
+    frames: Sequence[CalibrationFrame],
+    candidates: Sequence[Dict[str, Any]],
+    workers: int = 0,
+    iou_threshold: float = 0.5
+) -> List[CalibrationResult]:
+    """
+    Évalue tous les jeux de paramètres candidats
+    
+    Args:
+        frames: Frames annotées, déjà décodées
+        candidates: Jeux de paramètres (voir grid_search_space / random_search_space)
+        workers: Nombre de processus (0 = évaluation dans le processus courant)
+        iou_threshold: IoU minimale pour qu'une détection corresponde à une boîte attendue
+    
+    Returns:
+        Résultats du meilleur au moins bon (F1, puis débit)
+    """
+    if workers > 0:
+        # Lots contigus : les jeux d'une même plage de couleurs partagent la table compilée
+        chunksize = max(1, len(candidates) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_calibration_worker,
+            initargs=(list(frames), iou_threshold)
+        ) as pool:
+            results = list(pool.map(_evaluate_in_worker, candidates, chunksize=chunksize))
+    else:
+        results = [evaluate_parameters(params, frames, iou_threshold) for params in candidates]
+    
+    return sorted(results, key=lambda r: (r.f1, r.frames_per_second), reverse=True)
+
+
+def save_best_parameters(result: CalibrationResult, path: str = DEFAULT_PARAMS_FILE) -> None:
+    """Écrit le meilleur jeu au format chargé par KindleHighlightDetector(params_file=...)."""
+    config = {
+        "timestamp": datetime.now().isoformat(),
+        "parameters": result.params,
+        "metrics": {
+            key: value for key, value in result.to_dict().items()
+            if key not in ("parameters", "errors")
+        },
+    }
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2)
+    
+    logger.info(f"Meilleurs paramètres sauvegardés dans {path}")
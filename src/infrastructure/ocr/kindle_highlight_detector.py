@@ -6,15 +6,83 @@ import cv2
 import numpy as np
 from PIL import Image
 import io
-from typing import List, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass
+import json
 import logging
 import os
-from datetime import datetime
+from functools import lru_cache
+
+from src.application.ports.kindle_controller import Frame
+from src.infrastructure.debug.debug_sink import DebugImageSink, shared_debug_sink
 
 logger = logging.getLogger(__name__)
 
+# Fichier de paramètres écrit par calibrate_detection.py
+DEFAULT_PARAMS_FILE = "best_detection_params.json"
+
+# Paramètres de détection réglables par calibration
+TUNABLE_PARAMETERS = (
+    "yellow_ranges", "min_area", "min_width", "min_height", "max_aspect_ratio",
+    "min_yellow_ratio", "min_color_ratio", "morphology_kernel_size",
+    "morphology_iterations", "expand_x", "expand_y", "passage_max_gap_ratio",
+)
+
+
+@dataclass
+class HighlightDetection:
+    """Résultat de détection d'un surlignement (une seule passe sur l'image)"""
+    bbox: Tuple[int, int, int, int]  # (x, y, width, height) en coordonnées image
+    mask: np.ndarray                 # Masque précis des pixels jaunes dans bbox
+    crop: np.ndarray                 # Pixels RGB masqués (fond blanc) prêts pour l'OCR
+    yellow_ratio: float              # Proportion de pixels surlignés dans le contour
+    line_count: int = 1              # Nombre de bandes (lignes) regroupées dans le passage
+    color: str = "yellow"            # Couleur du surlignement (majoritaire dans le contour)
+
+
+@dataclass
+class _Band:
+    """Bande jaune retenue par les filtres, avant regroupement en passages"""
+    box: Tuple[int, int, int, int]       # Contour (x, y, w, h) dans la région
+    expanded: Tuple[int, int, int, int]  # Zone élargie pour l'OCR
+    mask: np.ndarray                     # Masque précis de la zone élargie
+    yellow_pixels: int                   # Pixels surlignés dans le contour
+    color: str = "yellow"                # Couleur majoritaire
+
+
+@lru_cache(maxsize=4)
+def _compile_color_lut(color_classes: Tuple) -> np.ndarray:
+    """
+    Compile des plages HSV par couleur en table d'étiquettes des 2^24 couleurs RGB
+    
+    Args:
+        color_classes: Pour chaque couleur, ses plages ((h, s, v) min, (h, s, v) max)
+            d'OpenCV ; en cas de recouvrement, la première couleur l'emporte
+        
+    Returns:
+        Table uint8 indexée par 0xRRGGBB : 0 = aucune couleur, k = k-ième couleur
+    """
+    # Toutes les couleurs en une image 4096x4096 : octets B, G, R, 0 (little-endian)
+    codes = np.arange(1 << 24, dtype=np.uint32).view(np.uint8).reshape(4096, 4096, 4)
+    hsv = cv2.cvtColor(cv2.cvtColor(codes, cv2.COLOR_BGRA2BGR), cv2.COLOR_BGR2HSV)
+    
+    lut = np.zeros(hsv.shape[:2], dtype=np.uint8)
+    for label in range(len(color_classes), 0, -1):
+        in_class = np.zeros(hsv.shape[:2], dtype=np.uint8)
+        for lower, upper in color_classes[label - 1]:
+            in_class |= cv2.inRange(hsv, np.array(lower), np.array(upper))
+        lut[in_class > 0] = label
+    
+    return lut.reshape(-1)
+
+
 class KindleHighlightDetector:
-    def __init__(self, debug_mode=True):
+    def __init__(
+        self,
+        debug_mode=True,
+        params_file: Optional[str] = None,
+        debug_sink: Optional[DebugImageSink] = None
+    ):
         # Paramètres configurables
         
         # Plages de couleurs HSV pour détecter les surlignements jaunes
@@ -24,12 +92,25 @@ class KindleHighlightDetector:
             ((18, 50, 120), (28, 255, 255)),   # Jaune saturé
         ]
         
+        # Autres couleurs de surlignement Kindle (plages HSV) ; le jaune reste
+        # dans yellow_ranges et l'emporte en cas de recouvrement
+        self.color_ranges = {
+            "blue": [((90, 40, 150), (130, 255, 255))],
+            "pink": [((150, 30, 150), (179, 255, 255)), ((0, 30, 150), (4, 255, 255))],
+            "orange": [((5, 60, 150), (14, 255, 255))],
+        }
+        
+        # Table de classification compilée depuis les plages (à la demande)
+        self._color_lut = None
+        self._color_lut_key = None
+        
         # Filtrage des zones détectées
         self.min_area = 250              # Surface minimale en pixels 
         self.min_width = 35              # Largeur minimale en pixels
         self.min_height = 12             # Hauteur minimale en pixels
         self.max_aspect_ratio = 25       # Ratio largeur/hauteur max
         self.min_yellow_ratio = 0.4      # Pourcentage minimum de pixels jaunes
+        self.min_color_ratio = 0.35      # Idem pour la couleur dominante, avant morphologie
         
         # Morphologie pour nettoyage des masques
         self.morphology_kernel_size = 3
@@ -39,256 +120,628 @@ class KindleHighlightDetector:
         self.expand_x = 8                # Pixels à ajouter horizontalement
         self.expand_y = 4                # Pixels à ajouter verticalement
         
-        # Configuration debug
+        # Regroupement des lignes surlignées consécutives en un seul passage
+        self.merge_passages = True
+        self.passage_max_gap_ratio = 0.6  # Écart vertical max, en hauteur de ligne
+        
+        # Pyramide : bandes candidates cherchées à 1/pyramid_factor, puis
+        # masque et crops en pleine résolution dans ces zones seulement (1 = désactivé)
+        self.pyramid_factor = 4
+        
+        # Sous-échantillonnage du comptage rapide (phase 1)
+        self.quick_scan_downscale = 4
+        
+        # Configuration debug : images écrites en arrière-plan par le puits partagé,
+        # seulement pour les pages échantillonnées
         self.debug_enabled = debug_mode
         self.debug_dir = "debug_highlights"
+        self.debug_sink = debug_sink or shared_debug_sink()
         
-        if self.debug_enabled:
-            os.makedirs(self.debug_dir, exist_ok=True)
+        # Paramètres calibrés (remplacent les valeurs par défaut ci-dessus)
+        if params_file and os.path.exists(params_file):
+            self.load_parameters(params_file)
     
-    def extract_highlight_text_regions(self, image_data: bytes, region: Tuple[int, int, int, int] = None) -> List[bytes]:
+    def apply_parameters(self, params: Dict[str, Any]) -> None:
         """
-        Extrait les images des zones de surlignement avec masquage précis
+        Applique un jeu de paramètres de détection
         
         Args:
-            image_data: Données de l'image en bytes
-            region: Région à analyser (x, y, width, height)
-            
+            params: Valeurs indexées par nom d'attribut (voir TUNABLE_PARAMETERS) ;
+                les plages de couleurs peuvent venir du JSON sous forme de listes
+        """
+        for name, value in params.items():
+            if name not in TUNABLE_PARAMETERS:
+                logger.warning(f"Paramètre de détection inconnu ignoré: {name}")
+                continue
+            if name == "yellow_ranges":
+                value = [(tuple(lower), tuple(upper)) for lower, upper in value]
+            setattr(self, name, value)
+    
+    def load_parameters(self, params_file: str) -> Dict[str, Any]:
+        """
+        Charge les paramètres calibrés d'un fichier JSON ({"parameters": {...}})
+        
         Returns:
-            Liste des images des surlignements avec masquage précis en bytes
+            Paramètres appliqués
         """
-        try:
-            # Détecter les surlignements et leurs masques précis
-            highlight_regions, precise_masks = self.detect_highlights_with_masks(image_data, region)
-            
-            if not highlight_regions:
-                logger.info("Aucun surlignement détecté")
-                return []
-            
-            # Conversion en image PIL pour extraction
-            pil_image = Image.open(io.BytesIO(image_data))
-            if pil_image.mode != 'RGB':
-                pil_image = pil_image.convert('RGB')
-            
-            highlight_images = []
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            logger.info(f"Extraction des surlignements avec masquage précis:")
-            
-            for i, ((x, y, w, h), mask) in enumerate(zip(highlight_regions, precise_masks)):
-                logger.info(f"  Extraction du surlignement {i+1}/{len(highlight_regions)}: Y={y}, taille {w}x{h}")
-                
-                # Extraction de l'image avec masquage précis
-                masked_image = self._apply_precise_mask(pil_image, (x, y, w, h), mask)
-                
-                # Conversion en bytes
-                img_bytes = io.BytesIO()
-                masked_image.save(img_bytes, format='PNG')
-                highlight_images.append(img_bytes.getvalue())
-                
-                # Debug : sauvegarde de l'image extraite
-                if self.debug_enabled:
-                    debug_dir = "debug_ocr_highlights"
-                    os.makedirs(debug_dir, exist_ok=True)
-                    debug_file = os.path.join(debug_dir, f"precise_highlight_{timestamp}_ordre{i+1:02d}_Y{y}.png")
-                    masked_image.save(debug_file)
-                    logger.info(f"Debug: Image masquée sauvegardée -> {debug_file}")
-            
-            logger.info(f"Résultat: {len(highlight_images)} image(s) de surlignement avec masquage précis extraite(s)")
-            return highlight_images
-            
-        except Exception as e:
-            logger.error(f"Erreur lors de l'extraction des images de surlignements : {e}")
-            return []
+        with open(params_file, 'r', encoding='utf-8') as f:
+            params = json.load(f).get("parameters", {})
+        
+        self.apply_parameters(params)
+        logger.info(f"Paramètres de détection chargés depuis {params_file}: {sorted(params)}")
+        return params
+    
+    @staticmethod
+    def to_rgb_array(image: Union[bytes, Frame, np.ndarray]) -> np.ndarray:
+        """
+        Convertit une image (Frame brute, ndarray RGB ou PNG legacy) en ndarray RGB
+        
+        Les Frames (pixels ndarray ou bytes bruts) et ndarrays sont utilisés
+        sans copie ; seuls les bytes PNG sont décodés.
+        """
+        if isinstance(image, Frame):
+            if isinstance(image.pixels, np.ndarray):
+                return image.pixels.reshape(image.shape)
+            return np.frombuffer(image.pixels, dtype=np.uint8).reshape(image.shape)
+        if isinstance(image, np.ndarray):
+            return image
+        
+        pil_image = Image.open(io.BytesIO(image))
+        if pil_image.mode != 'RGB':
+            pil_image = pil_image.convert('RGB')
+        return np.asarray(pil_image)
 
-    def detect_highlights_with_masks(self, image_data: bytes, region: Tuple[int, int, int, int] = None) -> Tuple[List[Tuple[int, int, int, int]], List[np.ndarray]]:
+    @classmethod
+    def region_pixels(cls, image: Union[bytes, Frame, np.ndarray], region: Tuple[int, int, int, int] = None) -> Tuple[np.ndarray, Tuple[int, int]]:
         """
-        Détecte les surlignements jaunes et leurs masques précis
+        Extrait les pixels d'une région exprimée en coordonnées écran
+        
+        Une Frame capturée sur une sous-zone de l'écran porte son origine :
+        la région est traduite dans le repère de la Frame.
         
         Returns:
-            Tuple (liste_rectangles, liste_masques_précis)
+            Tuple (pixels RGB de la région, origine écran (x, y) de ces pixels)
+        """
+        image_rgb = cls.to_rgb_array(image)
+        origin_x, origin_y = image.origin if isinstance(image, Frame) else (0, 0)
+        
+        if not region:
+            return image_rgb, (origin_x, origin_y)
+        
+        x, y, w, h = region
+        local_x, local_y = max(0, x - origin_x), max(0, y - origin_y)
+        right, bottom = x - origin_x + w, y - origin_y + h
+        
+        return image_rgb[local_y:bottom, local_x:right], (local_x + origin_x, local_y + origin_y)
+
+    def detect(self, image_data: Union[bytes, Frame], region: Tuple[int, int, int, int] = None) -> List[HighlightDetection]:
+        """
+        Détection complète en une seule passe : un seul décodage, un seul masque
+        
+        Args:
+            image_data: Frame brute (ou image en bytes pour les appelants legacy)
+            region: Région à analyser (x, y, width, height)
+            
+        Returns:
+            Liste des HighlightDetection triés du haut vers le bas
         """
         try:
-            # Conversion en image OpenCV
-            pil_image = Image.open(io.BytesIO(image_data))
-            if pil_image.mode != 'RGB':
-                pil_image = pil_image.convert('RGB')
+            # Pixels RGB de la région (décodage uniquement pour les bytes legacy)
+            image_rgb, (offset_x, offset_y) = self.region_pixels(image_data, region)
             
-            image_cv = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+            # Debug seulement pour les pages échantillonnées : les autres gardent le chemin rapide
+            page_number = image_data.page_number if isinstance(image_data, Frame) else None
+            debug = self.debug_enabled and self.debug_sink.samples_page(page_number)
+            if debug:
+                self.debug_sink.submit(self.debug_dir, "01_original", image_rgb, page_number)
             
-            # Application de la région si spécifiée
-            if region:
-                x, y, w, h = region
-                image_cv = image_cv[y:y+h, x:x+w]
-                offset_x, offset_y = x, y
+            # Zones à traiter en pleine résolution : toute la région, ou seulement
+            # les bandes candidates trouvées sur une version réduite (pyramide)
+            factor = max(1, int(self.pyramid_factor))
+            if factor > 1 and not debug:
+                rois = self._candidate_rois(image_rgb, factor)
             else:
-                offset_x, offset_y = 0, 0
-            
-            # Debug : sauvegarde de l'image originale
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            if self.debug_enabled:
-                debug_original = os.path.join(self.debug_dir, f"step_{timestamp}_01_original.png")
-                cv2.imwrite(debug_original, image_cv)
-                logger.info(f"Image originale sauvegardée : {debug_original}")
-            
-            # Conversion en HSV
-            hsv = cv2.cvtColor(image_cv, cv2.COLOR_BGR2HSV)
-            
-            # Création du masque combiné pour toutes les plages de jaune
-            combined_mask = np.zeros(hsv.shape[:2], dtype=np.uint8)
-            
-            for i, (lower, upper) in enumerate(self.yellow_ranges):
-                lower_np = np.array(lower)
-                upper_np = np.array(upper)
-                mask = cv2.inRange(hsv, lower_np, upper_np)
-                combined_mask = cv2.bitwise_or(combined_mask, mask)
-                
-                if self.debug_enabled:
-                    debug_mask = os.path.join(self.debug_dir, f"step_{timestamp}_03_mask_range_{i+1}.png")
-                    cv2.imwrite(debug_mask, mask)
+                rois = [(0, 0, image_rgb.shape[1], image_rgb.shape[0])]
             
-            if self.debug_enabled:
-                debug_combined = os.path.join(self.debug_dir, f"step_{timestamp}_04_mask_combined.png")
-                cv2.imwrite(debug_combined, combined_mask)
+            # Filtrage et extraction des régions avec leurs masques et crops
+            bands: List[_Band] = []
+            detections = []
+            debug_image = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2BGR) if debug else None
+            rejected = 0
             
-            # Nettoyage morphologique
-            kernel = np.ones((self.morphology_kernel_size, self.morphology_kernel_size), np.uint8)
-            cleaned_mask = cv2.morphologyEx(combined_mask, cv2.MORPH_CLOSE, kernel, iterations=self.morphology_iterations)
-            cleaned_mask = cv2.morphologyEx(cleaned_mask, cv2.MORPH_OPEN, kernel, iterations=1)
-            
-            if self.debug_enabled:
-                debug_cleaned = os.path.join(self.debug_dir, f"step_{timestamp}_05_mask_cleaned.png")
-                cv2.imwrite(debug_cleaned, cleaned_mask)
-            
-            # Détection des contours
-            contours, _ = cv2.findContours(cleaned_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            # Filtrage et extraction des régions avec leurs masques
-            highlight_regions = []
-            precise_masks = []
-            debug_image = image_cv.copy()
-            
-            for i, contour in enumerate(contours):
-                # Rectangle englobant
-                x, y, w, h = cv2.boundingRect(contour)
-                
-                # Application des filtres de qualité
-                area = w * h
-                aspect_ratio = w / h if h > 0 else 0
-                
-                # Calcul du ratio de pixels jaunes dans la région
-                roi_mask = cleaned_mask[y:y+h, x:x+w]
-                yellow_pixels = cv2.countNonZero(roi_mask)
-                total_pixels = w * h
-                yellow_ratio = yellow_pixels / total_pixels if total_pixels > 0 else 0
+            for roi_x, roi_y, roi_w, roi_h, label, cleaned_mask, labels in self._color_masks(
+                image_rgb, rois, debug, page_number
+            ):
+                # Régions candidates et filtres de qualité, vectorisés sur toutes les régions
+                boxes = self._component_regions(cleaned_mask)
+                accepted, yellow_pixels = self._region_filter(
+                    cleaned_mask, boxes, self.min_area, self.min_width, self.min_height
+                )
                 
-                logger.info(f"Contour {i+1}: area={area}, size={w}x{h}, ratio={aspect_ratio:.1f}, yellow_ratio={yellow_ratio:.3f}")
+                rejected += int(np.count_nonzero(~accepted))
+                if logger.isEnabledFor(logging.DEBUG) or debug:
+                    self._log_rejected_regions(boxes[~accepted], yellow_pixels[~accepted], roi_x, roi_y, debug_image)
                 
-                # Vérification des critères
-                if (area >= self.min_area and 
-                    w >= self.min_width and 
-                    h >= self.min_height and 
-                    aspect_ratio <= self.max_aspect_ratio and
-                    yellow_ratio >= self.min_yellow_ratio):
+                for (mask_x, mask_y, w, h), yellow in zip(boxes[accepted].tolist(), yellow_pixels[accepted].tolist()):
+                    # Repère de la région (le masque couvre seulement la zone)
+                    x, y = mask_x + roi_x, mask_y + roi_y
                     
                     # Expansion de la région pour une meilleure capture du texte
                     x_expanded = max(0, x - self.expand_x)
                     y_expanded = max(0, y - self.expand_y)
-                    w_expanded = min(image_cv.shape[1] - x_expanded, w + 2 * self.expand_x)
-                    h_expanded = min(image_cv.shape[0] - y_expanded, h + 2 * self.expand_y)
+                    w_expanded = min(image_rgb.shape[1] - x_expanded, w + 2 * self.expand_x)
+                    h_expanded = min(image_rgb.shape[0] - y_expanded, h + 2 * self.expand_y)
                     
                     # Extraction du masque précis pour cette région
-                    precise_mask = cleaned_mask[y_expanded:y_expanded+h_expanded, x_expanded:x_expanded+w_expanded]
+                    mask_y_expanded, mask_x_expanded = y_expanded - roi_y, x_expanded - roi_x
+                    precise_mask = cleaned_mask[mask_y_expanded:mask_y_expanded+h_expanded,
+                                                mask_x_expanded:mask_x_expanded+w_expanded]
                     
-                    # Ajout de l'offset de la région
-                    final_region = (
-                        x_expanded + offset_x,
-                        y_expanded + offset_y,
-                        w_expanded,
-                        h_expanded
-                    )
+                    # Pixels de la couleur dans le contour (avant morphologie)
+                    color_pixels = np.count_nonzero(labels[mask_y:mask_y+h, mask_x:mask_x+w] == label)
                     
-                    highlight_regions.append(final_region)
-                    precise_masks.append(precise_mask)
+                    # Bords colorés du lissage ClearType : couleurs éparses que
+                    # seule la morphologie relie, à écarter
+                    if color_pixels < self.min_color_ratio * w * h:
+                        logger.debug(f"Région rejetée ({x}, {y}, {w}x{h}): couleur dominante < {self.min_color_ratio:.2f}")
+                        rejected += 1
+                        continue
                     
+                    bands.append(_Band(
+                        box=(x, y, w, h),
+                        expanded=(x_expanded, y_expanded, w_expanded, h_expanded),
+                        mask=precise_mask,
+                        yellow_pixels=yellow,
+                        color=self.highlight_colors[label - 1]
+                    ))
+            
+            # Regroupement des lignes d'un même passage (une bande jaune par ligne)
+            bands.sort(key=lambda band: (band.box[1], band.box[0]))
+            if self.merge_passages:
+                passages = self._group_passages(bands)
+            else:
+                passages = [[band] for band in bands]
+            
+            for passage in passages:
+                (x_expanded, y_expanded, w_expanded, h_expanded), precise_mask = self._passage_mask(passage)
+                yellow_ratio = (sum(band.yellow_pixels for band in passage)
+                                / sum(band.box[2] * band.box[3] for band in passage))
+                
+                # Ajout de l'offset de la région
+                final_region = (
+                    x_expanded + offset_x,
+                    y_expanded + offset_y,
+                    w_expanded,
+                    h_expanded
+                )
+                
+                # Crop masqué à partir des pixels déjà en mémoire (sans encodage)
+                crop = self._apply_precise_mask(
+                    image_rgb, (x_expanded, y_expanded, w_expanded, h_expanded), precise_mask
+                )
+                
+                detections.append(HighlightDetection(
+                    bbox=final_region,
+                    mask=precise_mask,
+                    crop=crop,
+                    yellow_ratio=yellow_ratio,
+                    line_count=len(passage),
+                    color=passage[0].color
+                ))
+                
+                if debug:
                     # Debug : dessiner le rectangle sur l'image
                     cv2.rectangle(debug_image, (x_expanded, y_expanded), 
                                 (x_expanded + w_expanded, y_expanded + h_expanded), (0, 255, 0), 2)
-                    cv2.putText(debug_image, f"{len(highlight_regions)}", 
+                    cv2.putText(debug_image, f"{len(detections)}", 
                               (x_expanded, y_expanded - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                    
-                    logger.info(f"Surlignement valide {len(highlight_regions)}: {final_region}")
-                else:
-                    # Debug : dessiner en rouge les régions rejetées
-                    cv2.rectangle(debug_image, (x, y), (x + w, y + h), (0, 0, 255), 1)
-                    
-                    # Raison du rejet
-                    reject_reason = []
-                    if area < self.min_area: reject_reason.append(f"area<{self.min_area}")
-                    if w < self.min_width: reject_reason.append(f"w<{self.min_width}")
-                    if h < self.min_height: reject_reason.append(f"h<{self.min_height}")
-                    if aspect_ratio > self.max_aspect_ratio: reject_reason.append(f"ratio>{self.max_aspect_ratio}")
-                    if yellow_ratio < self.min_yellow_ratio: reject_reason.append(f"yellow<{self.min_yellow_ratio:.2f}")
-                    
-                    logger.info(f"Région rejetée: {' '.join(reject_reason)}")
+                
+                logger.debug(f"Surlignement valide {len(detections)}: {final_region}, {passage[0].color}, "
+                             f"{len(passage)} ligne(s), yellow_ratio={yellow_ratio:.3f}")
             
-            # Sauvegarde de l'image avec détections
-            if self.debug_enabled:
-                debug_detected = os.path.join(self.debug_dir, f"step_{timestamp}_06_detected_highlights.png")
-                cv2.imwrite(debug_detected, debug_image)
-                logger.info(f"Détections sauvegardées : {debug_detected}")
+            # Sauvegarde de l'image avec détections (vertes) et rejets (rouges)
+            if debug:
+                self.debug_sink.submit(self.debug_dir, "06_detected_highlights", debug_image,
+                                       page_number, rejected=rejected > 0, bgr=True)
             
-            # Tri des régions du haut vers le bas
-            sorted_indices = sorted(range(len(highlight_regions)), key=lambda i: highlight_regions[i][1])
-            highlight_regions = [highlight_regions[i] for i in sorted_indices]
-            precise_masks = [precise_masks[i] for i in sorted_indices]
+            # Tri des régions du haut vers le bas, puis de gauche à droite
+            detections.sort(key=lambda detection: (detection.bbox[1], detection.bbox[0]))
             
-            logger.info(f"Résultat: {len(highlight_regions)} surlignement(s) détecté(s) avec masques précis")
-            return highlight_regions, precise_masks
+            logger.info(f"Résultat: {len(detections)} surlignement(s) détecté(s) avec masques précis")
+            return detections
             
         except Exception as e:
             logger.error(f"Erreur lors de la détection des surlignements : {e}")
-            return [], []
+            return []
+
+    def _group_passages(self, bands: List[_Band]) -> List[List[_Band]]:
+        """
+        Regroupe les bandes d'un même passage surligné
+        
+        Kindle dessine une bande par ligne : une bande qui commence moins de
+        passage_max_gap_ratio hauteurs de ligne sous la dernière ligne d'un
+        passage, qui la chevauche horizontalement et qui a la même couleur
+        continue ce passage. Chaque bande est comparée à tous les passages
+        (surlignements côte à côte, colonnes, couleurs alternées) ; à
+        plusieurs candidats, le plus proche verticalement puis le plus
+        chevauchant l'emporte.
+        
+        Args:
+            bands: Bandes triées du haut vers le bas puis de gauche à droite
+        """
+        passages: List[List[_Band]] = []
+        
+        for band in bands:
+            x, y, w, h = band.box
+            best, best_key = None, None
+            for passage in passages:
+                last = passage[-1]
+                last_x, last_y, last_w, last_h = last.box
+                gap = y - (last_y + last_h)
+                overlap = min(x + w, last_x + last_w) - max(x, last_x)
+                if gap <= self.passage_max_gap_ratio * min(h, last_h) and overlap > 0 and band.color == last.color:
+                    key = (abs(gap), -overlap)
+                    if best_key is None or key < best_key:
+                        best, best_key = passage, key
+            
+            if best is not None:
+                best.append(band)
+            else:
+                passages.append([band])
+        
+        return passages
+    
+    @staticmethod
+    def _passage_mask(passage: List[_Band]) -> Tuple[Tuple[int, int, int, int], np.ndarray]:
+        """Zone englobante (x, y, w, h) d'un passage et masque combiné de ses lignes."""
+        if len(passage) == 1:
+            return passage[0].expanded, passage[0].mask
+        
+        left = min(band.expanded[0] for band in passage)
+        top = min(band.expanded[1] for band in passage)
+        right = max(band.expanded[0] + band.expanded[2] for band in passage)
+        bottom = max(band.expanded[1] + band.expanded[3] for band in passage)
+        
+        combined = np.zeros((bottom - top, right - left), dtype=np.uint8)
+        for band in passage:
+            x, y, w, h = band.expanded
+            target = combined[y - top:y - top + h, x - left:x - left + w]
+            np.maximum(target, band.mask, out=target)
+        
+        return (left, top, right - left, bottom - top), combined
+    
+    def _component_regions(self, cleaned_mask: np.ndarray) -> np.ndarray:
+        """
+        Statistiques de toutes les régions du masque en une passe
+        
+        Les contours extérieurs (findContours) servent d'étiquetage ; les
+        boîtes sont regroupées dans un seul tableau pour filtrer sans boucle.
+        
+        Returns:
+            Tableau (n, 4) des boîtes x, y, w, h
+        """
+        contours, _ = cv2.findContours(cleaned_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        return np.array([cv2.boundingRect(contour) for contour in contours], dtype=np.int64).reshape(-1, 4)
+    
+    @staticmethod
+    def _yellow_pixels(cleaned_mask: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+        """Nombre de pixels jaunes dans chaque boîte."""
+        return np.array(
+            [cv2.countNonZero(cleaned_mask[y:y+h, x:x+w]) for x, y, w, h in boxes.tolist()],
+            dtype=np.int64
+        )
+    
+    def _region_filter(
+        self,
+        cleaned_mask: np.ndarray,
+        boxes: np.ndarray,
+        min_area: float,
+        min_width: float,
+        min_height: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Filtres de qualité (surface, taille, ratio, proportion de jaune) sur toutes les régions
+        
+        Le comptage des pixels jaunes n'est fait que pour les régions qui
+        passent les filtres géométriques.
+        
+        Returns:
+            Tuple (régions acceptées, pixels jaunes par région ; -1 si non compté)
+        """
+        w, h = boxes[:, 2], boxes[:, 3]
+        area = w * h
+        accepted = ((area >= min_area) &
+                    (w >= min_width) &
+                    (h >= min_height) &
+                    (w / np.maximum(h, 1) <= self.max_aspect_ratio))
+        
+        yellow_pixels = np.full(len(boxes), -1, dtype=np.int64)
+        yellow_pixels[accepted] = self._yellow_pixels(cleaned_mask, boxes[accepted])
+        accepted &= yellow_pixels / np.maximum(area, 1) >= self.min_yellow_ratio
+        
+        return accepted, yellow_pixels
+    
+    def _log_rejected_regions(
+        self,
+        boxes: np.ndarray,
+        yellow_pixels: np.ndarray,
+        roi_x: int,
+        roi_y: int,
+        debug_image: np.ndarray = None
+    ) -> None:
+        """Détaille les régions rejetées (log DEBUG et image de debug)."""
+        for (x, y, w, h), yellow in zip(boxes.tolist(), yellow_pixels.tolist()):
+            x, y = x + roi_x, y + roi_y
+            area = w * h
+            aspect_ratio = w / h
+            yellow_ratio = yellow / area
+            
+            if debug_image is not None:
+                # Debug : dessiner en rouge les régions rejetées
+                cv2.rectangle(debug_image, (x, y), (x + w, y + h), (0, 0, 255), 1)
+            
+            # Raison du rejet
+            reject_reason = []
+            if area < self.min_area: reject_reason.append(f"area<{self.min_area}")
+            if w < self.min_width: reject_reason.append(f"w<{self.min_width}")
+            if h < self.min_height: reject_reason.append(f"h<{self.min_height}")
+            if aspect_ratio > self.max_aspect_ratio: reject_reason.append(f"ratio>{self.max_aspect_ratio}")
+            if 0 <= yellow_ratio < self.min_yellow_ratio: reject_reason.append(f"yellow<{self.min_yellow_ratio:.2f}")
+            
+            logger.debug(f"Région rejetée ({x}, {y}, {w}x{h}): {' '.join(reject_reason)}")
+    
+    def _candidate_rois(self, image_rgb: np.ndarray, factor: int) -> List[Tuple[int, int, int, int]]:
+        """
+        Zones candidates (x, y, w, h) trouvées sur la région réduite d'un facteur
+        
+        Chaque composante jaune de la version réduite est ramenée en pleine
+        résolution et élargie de la portée de la morphologie et de l'expansion,
+        pour que masque, contours et crops y soient identiques à ceux d'une
+        détection sur toute la région. Les zones qui se chevauchent sont fusionnées.
+        """
+        height, width = image_rgb.shape[:2]
+        small_mask = cv2.compare(self._classify_colors(image_rgb[::factor, ::factor]), 0, cv2.CMP_GT)
+        
+        # Un pixel jaune peut être manqué entre deux échantillons : composantes élargies d'un pas
+        small_mask = cv2.dilate(small_mask, np.ones((3, 3), np.uint8))
+        
+        # Portée de la fermeture (dilatations + érosions) puis de l'ouverture
+        reach = (self.morphology_kernel_size // 2) * (2 * self.morphology_iterations + 2)
+        pad_x = reach + self.expand_x + factor
+        pad_y = reach + self.expand_y + factor
+        
+        boxes = []
+        for x, y, w, h in self._component_regions(small_mask).tolist():
+            left = max(0, x * factor - pad_x)
+            top = max(0, y * factor - pad_y)
+            right = min(width, (x + w) * factor + pad_x)
+            bottom = min(height, (y + h) * factor + pad_y)
+            boxes.append([left, top, right, bottom])
+        
+        # Fusion des zones qui se chevauchent (jusqu'à stabilité)
+        merged = True
+        while merged:
+            merged = False
+            boxes.sort(key=lambda box: (box[1], box[0]))
+            result = []
+            for box in boxes:
+                for other in result:
+                    if (box[0] <= other[2] and other[0] <= box[2] and
+                            box[1] <= other[3] and other[1] <= box[3]):
+                        other[0], other[1] = min(other[0], box[0]), min(other[1], box[1])
+                        other[2], other[3] = max(other[2], box[2]), max(other[3], box[3])
+                        merged = True
+                        break
+                else:
+                    result.append(box)
+            boxes = result
+        
+        logger.debug(f"Pyramide (1/{factor}): {len(boxes)} zone(s) candidate(s)")
+        return [(int(left), int(top), int(right - left), int(bottom - top)) for left, top, right, bottom in boxes]
+    
+    def _color_masks(
+        self,
+        image_rgb: np.ndarray,
+        rois: List[Tuple[int, int, int, int]],
+        debug: bool = False,
+        page_number: Optional[int] = None
+    ):
+        """
+        Masque nettoyé de chaque couleur présente dans chaque zone
+        
+        Chaque couleur a son propre masque et ses propres contours : deux
+        lignes de couleurs différentes, jointives ou espacées de quelques
+        pixels, ne fusionnent pas en une seule région.
+        
+        Yields:
+            Tuples (x, y, w, h de la zone, étiquette de couleur, masque nettoyé
+            de cette couleur, étiquettes brutes de la zone)
+        """
+        for roi_x, roi_y, roi_w, roi_h in rois:
+            roi = image_rgb[roi_y:roi_y+roi_h, roi_x:roi_x+roi_w]
+            if debug:
+                _, labels = self._build_mask(roi, debug, page_number)
+            else:
+                labels = self._classify_colors(roi)
+            
+            present = np.bincount(labels.ravel(), minlength=len(self.highlight_colors) + 1)
+            for label in np.flatnonzero(present[1:]) + 1:
+                label = int(label)
+                yield roi_x, roi_y, roi_w, roi_h, label, self._clean_mask(cv2.compare(labels, label, cv2.CMP_EQ)), labels
+    
+    def _clean_mask(self, mask: np.ndarray) -> np.ndarray:
+        """Nettoyage morphologique d'un masque (fermeture puis ouverture)."""
+        kernel = np.ones((self.morphology_kernel_size, self.morphology_kernel_size), np.uint8)
+        cleaned_mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel, iterations=self.morphology_iterations)
+        return cv2.morphologyEx(cleaned_mask, cv2.MORPH_OPEN, kernel, iterations=1)
+    
+    def _build_mask(
+        self,
+        image_rgb: np.ndarray,
+        debug: bool = False,
+        page_number: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Construit le masque binaire nettoyé des pixels surlignés (toutes couleurs)
+        
+        Args:
+            image_rgb: Pixels RGB à classifier
+            debug: Si True, envoie les étapes intermédiaires au puits de debug
+            page_number: Page d'origine (noms des images de debug)
+            
+        Returns:
+            Tuple (masque uint8 (255 = surligné) après nettoyage morphologique,
+            étiquettes de couleur brutes de _classify_colors)
+        """
+        # Classification par table : une lecture par pixel, sans HSV ni passe par plage
+        labels = self._classify_colors(image_rgb)
+        combined_mask = cv2.compare(labels, 0, cv2.CMP_GT)
+        
+        if debug:
+            self.debug_sink.submit(self.debug_dir, "04_mask_combined", combined_mask, page_number)
+        
+        # Nettoyage morphologique
+        cleaned_mask = self._clean_mask(combined_mask)
+        
+        if debug:
+            self.debug_sink.submit(self.debug_dir, "05_mask_cleaned", cleaned_mask, page_number)
+        
+        return cleaned_mask, labels
+    
+    @property
+    def highlight_colors(self) -> List[str]:
+        """Couleurs reconnues, dans l'ordre des étiquettes (1 = jaune)."""
+        return ["yellow", *self.color_ranges]
+    
+    def _classify_colors(self, image_rgb: np.ndarray) -> np.ndarray:
+        """
+        Étiquette chaque pixel avec sa couleur de surlignement en une passe
+        
+        Chaque pixel est réinterprété en entier 0xRRGGBB (via un tampon BGRA)
+        qui indexe directement la table compilée.
+        
+        Returns:
+            Étiquettes uint8 : 0 = pas de surlignement, k = highlight_colors[k - 1]
+        """
+        key = tuple(
+            tuple((tuple(lower), tuple(upper)) for lower, upper in ranges)
+            for ranges in [self.yellow_ranges, *self.color_ranges.values()]
+        )
+        if key != self._color_lut_key:
+            # Table recompilée seulement si les plages ont changé
+            self._color_lut = _compile_color_lut(key)
+            self._color_lut_key = key
+        
+        bgra = cv2.cvtColor(np.ascontiguousarray(image_rgb), cv2.COLOR_RGB2BGRA)
+        codes = bgra.view(np.uint32)[..., 0]
+        np.bitwise_and(codes, 0xFFFFFF, out=codes)  # Retire l'alpha
+        return np.take(self._color_lut, codes)
+
+    def count_highlights_fast(self, image_data: Union[bytes, Frame], region: Tuple[int, int, int, int] = None) -> int:
+        """
+        Comptage rapide des surlignements, sans masques précis ni crops
+        
+        Travaille sur une version sous-échantillonnée de la région
+        (quick_scan_downscale) avec les mêmes filtres de contours, ramenés à
+        l'échelle et légèrement assouplis : un faux positif ne coûte qu'une
+        détection complète en phase 2, un faux négatif perdrait un surlignement.
+        
+        Returns:
+            Nombre de zones jaunes candidates
+        """
+        try:
+            image_rgb, _ = self.region_pixels(image_data, region)
+            
+            # Sous-échantillonnage par pas : conserve les couleurs exactes des pixels
+            factor = max(1, int(self.quick_scan_downscale))
+            small = np.ascontiguousarray(image_rgb[::factor, ::factor])
+            
+            cleaned_mask, _ = self._build_mask(small)
+            boxes = self._component_regions(cleaned_mask)
+            
+            slack = 0.8
+            accepted, _ = self._region_filter(
+                cleaned_mask,
+                boxes,
+                self.min_area / (factor * factor) * slack,
+                self.min_width / factor * slack,
+                self.min_height / factor * slack
+            )
+            count = int(np.count_nonzero(accepted))
+            
+            logger.debug(f"Comptage rapide (1/{factor}): {count} surlignement(s) candidat(s)")
+            return count
+            
+        except Exception as e:
+            logger.error(f"Erreur lors du comptage rapide des surlignements : {e}")
+            return 0
 
-    def _apply_precise_mask(self, pil_image: Image.Image, region: Tuple[int, int, int, int], mask: np.ndarray) -> Image.Image:
+    def extract_highlight_text_regions(self, image_data: Union[bytes, Frame], region: Tuple[int, int, int, int] = None) -> List[np.ndarray]:
+        """
+        Extrait les images des zones de surlignement avec masquage précis
+        
+        Args:
+            image_data: Frame brute ou données de l'image en bytes
+            region: Région à analyser (x, y, width, height)
+            
+        Returns:
+            Liste des pixels RGB des surlignements avec masquage précis
+        """
+        detections = self.detect(image_data, region)
+        
+        if not detections:
+            logger.info("Aucun surlignement détecté")
+            return []
+        
+        # Debug : sauvegarde des images extraites
+        if self.debug_enabled:
+            page_number = image_data.page_number if isinstance(image_data, Frame) else None
+            for i, detection in enumerate(detections):
+                self.debug_sink.submit("debug_ocr_highlights", f"precise_ordre{i+1:02d}_Y{detection.bbox[1]}",
+                                       detection.crop, page_number)
+        
+        return [detection.crop for detection in detections]
+
+    def detect_highlights_with_masks(self, image_data: Union[bytes, Frame], region: Tuple[int, int, int, int] = None) -> Tuple[List[Tuple[int, int, int, int]], List[np.ndarray]]:
+        """
+        Détecte les surlignements jaunes et leurs masques précis
+        
+        Returns:
+            Tuple (liste_rectangles, liste_masques_précis)
+        """
+        detections = self.detect(image_data, region)
+        return [d.bbox for d in detections], [d.mask for d in detections]
+
+    def _apply_precise_mask(self, image_rgb: np.ndarray, region: Tuple[int, int, int, int], mask: np.ndarray) -> np.ndarray:
         """
         Applique le masque précis à l'image pour ne garder que les pixels surlignés
         
         Args:
-            pil_image: Image PIL originale
-            region: Rectangle de la région (x, y, width, height)
+            image_rgb: Pixels RGB de la zone analysée
+            region: Rectangle de la région dans image_rgb (x, y, width, height)
             mask: Masque binaire des pixels jaunes
             
         Returns:
-            Image PIL avec seulement les pixels surlignés sur fond blanc
+            Pixels RGB avec seulement les pixels surlignés sur fond blanc
         """
         x, y, w, h = region
         
-        # Extraction de la région
-        cropped = pil_image.crop((x, y, x + w, y + h))
-        
-        # Conversion en numpy pour manipulation
-        img_array = np.array(cropped)
+        # Copie de la région (les pixels de la capture restent intacts)
+        crop = image_rgb[y:y+h, x:x+w].copy()
         
         # Redimensionner le masque si nécessaire
-        if mask.shape != img_array.shape[:2]:
-            mask = cv2.resize(mask, (img_array.shape[1], img_array.shape[0]))
-        
-        # Créer une image de fond blanc
-        white_background = np.ones_like(img_array) * 255
+        if mask.shape != crop.shape[:2]:
+            mask = cv2.resize(mask, (crop.shape[1], crop.shape[0]))
         
         # Appliquer le masque : garder les pixels surlignés, reste en blanc
-        mask_3d = np.stack([mask, mask, mask], axis=2) > 0
-        result = np.where(mask_3d, img_array, white_background)
-        
-        return Image.fromarray(result.astype(np.uint8))
+        crop[mask == 0] = 255
+        return crop
 
-    def detect_highlights(self, image_data: bytes, region: Tuple[int, int, int, int] = None) -> List[Tuple[int, int, int, int]]:
+    def detect_highlights(self, image_data: Union[bytes, Frame], region: Tuple[int, int, int, int] = None) -> List[Tuple[int, int, int, int]]:
         """
         Méthode de compatibilité - retourne seulement les rectangles
         """
-        highlight_regions, _ = self.detect_highlights_with_masks(image_data, region)
-        return highlight_regions
+        return [detection.bbox for detection in self.detect(image_data, region)]
 
     def print_current_settings(self):
         """Affiche les paramètres actuels pour le debug"""
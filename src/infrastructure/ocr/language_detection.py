@@ -0,0 +1,146 @@
+"""
+Sélection automatique de la langue OCR - un seul modèle Tesseract par livre
+"""
+import logging
+import re
+from collections import deque
+from typing import Dict, FrozenSet, List
+
+logger = logging.getLogger(__name__)
+
+# Mots outils propres à chaque langue (les mots communs aux deux, « a », « on »,
+# sont exclus). Élisions françaises séparées de leur mot : « l’ », « d’ », « qu’ »
+STOPWORDS: Dict[str, FrozenSet[str]] = {
+    "fra": frozenset("""
+        le la les l de des du d un une et est sont en que qu qui dans pour pas par
+        sur au aux ce cette ces il elle ils elles nous vous je j ne n se s avec
+        plus son sa ses leur leurs mais ou où été être avait était comme tout
+        """.split()),
+    "eng": frozenset("""
+        the of and to in is that it for was with as his he be at by had not are
+        but from or have an they which you were her she this there been their
+        would what when who will
+        """.split()),
+}
+
+_WORD = re.compile(r"[^\W\d_]+")
+
+
+def count_stopwords(text: str, languages: List[str]) -> Dict[str, int]:
+    """Nombre de mots outils de chaque langue dans un texte."""
+    counts = {lang: 0 for lang in languages}
+    for word in _WORD.findall(text.lower()):
+        for lang in languages:
+            if word in STOPWORDS.get(lang, ()):
+                counts[lang] += 1
+    return counts
+
+
+class LanguageSelector:
+    """
+    Langue Tesseract d'une extraction.
+    
+    L'OCR démarre avec toutes les langues (« fra+eng »). Les mots outils des
+    premiers surlignements désignent la langue dominante : si elle réunit au
+    moins dominance des mots outils, la suite de l'extraction n'utilise que
+    son modèle. Si la confiance moyenne des derniers surlignements tombe
+    ensuite de plus de confidence_drop points sous celle de l'échantillon,
+    l'OCR revient aux deux langues jusqu'à la fin de l'extraction.
+    """
+    
+    def __init__(
+        self,
+        languages: str = "fra+eng",
+        min_highlights: int = 3,
+        max_highlights: int = 10,
+        min_stopwords: int = 15,
+        dominance: float = 0.85,
+        window: int = 5,
+        confidence_drop: float = 8.0
+    ):
+        """
+        Args:
+            languages: Langues Tesseract de départ (et de repli)
+            min_highlights: Surlignements observés avant de décider
+            max_highlights: Au-delà, sans langue dominante, les deux langues sont gardées
+            min_stopwords: Mots outils nécessaires pour décider
+            dominance: Part minimale des mots outils de la langue retenue
+            window: Surlignements pris en compte pour surveiller la confiance
+            confidence_drop: Baisse de confiance moyenne (points) qui déclenche le repli
+        """
+        self.languages = languages
+        self.min_highlights = min_highlights
+        self.max_highlights = max_highlights
+        self.min_stopwords = min_stopwords
+        self.dominance = dominance
+        self.window = window
+        self.confidence_drop = confidence_drop
+        self.reset()
+    
+    def reset(self) -> None:
+        """Nouvelle extraction : retour aux langues de départ."""
+        self.lang = self.languages
+        self.settled = '+' not in self.languages  # Plus de décision à prendre
+        self.fell_back = False
+        self._counts = {code: 0 for code in self.languages.split('+')}
+        self._sampled = 0
+        self._baseline = 0.0
+        self._recent: deque = deque(maxlen=self.window)
+    
+    def observe(self, text: str, confidence: float) -> str:
+        """
+        Prend en compte un surlignement lu
+        
+        Returns:
+            Langue Tesseract à utiliser pour les surlignements suivants
+        """
+        if not text.strip():
+            return self.lang
+        
+        if self.lang == self.languages:
+            if not self.settled:
+                self._sample(text, confidence)
+        else:
+            self._watch(confidence)
+        return self.lang
+    
+    def _sample(self, text: str, confidence: float) -> None:
+        """Échantillon en langues multiples : comptage des mots outils."""
+        for code, count in count_stopwords(text, list(self._counts)).items():
+            self._counts[code] += count
+        self._sampled += 1
+        self._baseline += (confidence - self._baseline) / self._sampled
+        
+        total = sum(self._counts.values())
+        if self._sampled >= self.min_highlights and total >= self.min_stopwords:
+            code, count = max(self._counts.items(), key=lambda item: item[1])
+            if count >= self.dominance * total:
+                self.lang = code
+                self.settled = True
+                logger.info(f"Langue OCR: {code} ({count}/{total} mots outils sur {self._sampled} surlignement(s))")
+                return
+        
+        if self._sampled >= self.max_highlights:
+            self.settled = True
+            logger.info(f"Langue OCR: pas de langue dominante ({self._counts}), {self.languages} conservé")
+    
+    def _watch(self, confidence: float) -> None:
+        """Langue unique : repli si la confiance baisse nettement."""
+        self._recent.append(confidence)
+        if len(self._recent) < self.window:
+            return
+        
+        average = sum(self._recent) / len(self._recent)
+        if average < self._baseline - self.confidence_drop:
+            logger.warning(f"Langue OCR: confiance {average:.1f}% (échantillon {self._baseline:.1f}%), retour à {self.languages}")
+            self.lang = self.languages
+            self.fell_back = True
+    
+    def stats(self) -> Dict[str, object]:
+        """État de la sélection (pour les métadonnées de la tâche)."""
+        return {
+            "lang": self.lang,
+            "stopwords": dict(self._counts),
+            "sampled_highlights": self._sampled,
+            "fell_back": self.fell_back,
+        }
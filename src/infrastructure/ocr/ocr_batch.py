@@ -0,0 +1,118 @@
+"""
+OCR par lot - plusieurs surlignements empilés dans une seule image Tesseract
+"""
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Span = Tuple[int, int, int]  # (haut, bas, largeur) d'un crop dans l'image empilée
+
+
+def stitch_crops(crops: Sequence[np.ndarray], gap: int = 32) -> Tuple[np.ndarray, List[Span]]:
+    """
+    Empile des crops RGB verticalement, séparés par des bandes blanches
+    
+    Les crops sont alignés à gauche ; l'image fait la largeur du plus large.
+    
+    Args:
+        crops: Pixels RGB des surlignements (fond blanc)
+        gap: Hauteur de la bande blanche entre deux crops, et en haut et en bas
+    
+    Returns:
+        Tuple (image empilée, position de chaque crop)
+    """
+    width = max(crop.shape[1] for crop in crops)
+    height = sum(crop.shape[0] for crop in crops) + gap * (len(crops) + 1)
+    stitched = np.full((height, width, 3), 255, dtype=np.uint8)
+    
+    spans = []
+    top = gap
+    for crop in crops:
+        crop_height, crop_width = crop.shape[:2]
+        stitched[top:top + crop_height, :crop_width] = crop[:, :, :3]
+        spans.append((top, top + crop_height, crop_width))
+        top += crop_height + gap
+    
+    return stitched, spans
+
+
+def split_words(
+    data: Dict[str, List],
+    spans: Sequence[Span],
+    tolerance: int = 8
+) -> List[Optional[Tuple[str, float]]]:
+    """
+    Répartit les mots d'un image_to_data sur les crops empilés
+    
+    Un mot appartient au crop qui contient sa boîte (à tolerance pixels près).
+    Un mot à cheval sur deux crops, dans une bande blanche ou au-delà de la
+    largeur de son crop rend la répartition ambiguë : les crops voisins sont
+    alors marqués None, comme ceux qui n'ont reçu aucun mot.
+    
+    Args:
+        data: Résultat au format pytesseract.Output.DICT
+        spans: Positions des crops (voir stitch_crops)
+        tolerance: Débordement toléré d'une boîte hors de son crop, en pixels
+    
+    Returns:
+        (texte, confiance moyenne) par crop, ou None si ambigu
+    """
+    words: List[List[Tuple[str, float]]] = [[] for _ in spans]
+    ambiguous = set()
+    tops = [top for top, _, _ in spans]
+    
+    for i in range(len(data['text'])):
+        text = data['text'][i].strip()
+        conf = float(data['conf'][i])
+        if not text or conf <= 0:
+            continue
+        
+        word_top = data['top'][i]
+        word_bottom = word_top + data['height'][i]
+        word_right = data['left'][i] + data['width'][i]
+        
+        # Dernier crop qui commence au-dessus du centre du mot
+        center = (word_top + word_bottom) / 2
+        index = max(0, int(np.searchsorted(tops, center, side='right')) - 1)
+        top, bottom, width = spans[index]
+        
+        if word_top < top - tolerance or word_bottom > bottom + tolerance or word_right > width + tolerance:
+            ambiguous.update(j for j in (index - 1, index, index + 1) if 0 <= j < len(spans))
+            continue
+        
+        words[index].append((text, conf))
+    
+    results: List[Optional[Tuple[str, float]]] = []
+    for index, crop_words in enumerate(words):
+        if index in ambiguous or not crop_words:
+            results.append(None)
+            continue
+        confidences = [conf for _, conf in crop_words]
+        results.append((' '.join(text for text, _ in crop_words), sum(confidences) / len(confidences)))
+    
+    if ambiguous:
+        logger.debug(f"Lot OCR: répartition ambiguë pour les crops {sorted(ambiguous)}")
+    return results
+
+
+def plan_batches(heights: Sequence[int], gap: int, max_height: int) -> List[List[int]]:
+    """
+    Regroupe des crops (indices, dans l'ordre) en lots d'au plus max_height pixels
+    
+    Un crop plus haut que max_height forme un lot à lui seul.
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_height = gap
+    for index, height in enumerate(heights):
+        if current and current_height + height + gap > max_height:
+            batches.append(current)
+            current, current_height = [], gap
+        current.append(index)
+        current_height += height + gap
+    if current:
+        batches.append(current)
+    return batches
@@ -0,0 +1,199 @@
+"""
+Cache des résultats OCR - indexé par le contenu des crops
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+OCROutput = Tuple[str, float, str]  # (texte, confiance, étape)
+
+# Octets comptés par entrée en plus du texte (clé, colonnes, index)
+_ENTRY_OVERHEAD = 96
+
+
+class OCRResultCache:
+    """
+    Résultats OCR indexés par une empreinte des pixels du crop et de la configuration.
+    
+    Deux niveaux : un LRU en mémoire (memory_entries entrées) devant une base
+    SQLite locale. Quand la base dépasse max_disk_bytes, les entrées les moins
+    récemment utilisées sont supprimées jusqu'à 90 % de la limite.
+    
+    Une même instance peut être utilisée depuis plusieurs threads ; elle n'est
+    pas transmise aux processus du pool OCR (les recherches se font dans le
+    processus principal, avant la répartition).
+    """
+    
+    def __init__(
+        self,
+        path: Optional[str] = "ocr_cache.sqlite",
+        memory_entries: int = 1024,
+        max_disk_bytes: int = 64 * 1024 * 1024
+    ):
+        """
+        Args:
+            path: Fichier SQLite (None = cache en mémoire seulement)
+            memory_entries: Nombre d'entrées du LRU en mémoire
+            max_disk_bytes: Taille maximale (approximative) des entrées sur disque
+        """
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        
+        self._memory: "OrderedDict[str, OCROutput]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+        
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evicted = 0
+        
+        if path:
+            self._open(path)
+    
+    def _open(self, path: str) -> None:
+        """Ouvre (ou crée) la base ; en cas d'échec le cache reste en mémoire."""
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+            # WAL : une lecture réussie (mise à jour de last_used) ne coûte pas une synchronisation disque
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS ocr_results ("
+                "key TEXT PRIMARY KEY, text TEXT NOT NULL, confidence REAL NOT NULL, "
+                "method TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS ocr_results_last_used ON ocr_results (last_used)")
+            db.commit()
+            self._disk_bytes = db.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_results").fetchone()[0]
+            self._db = db
+            logger.info(f"Cache OCR: {path} ({self._disk_bytes / 1024:.0f} Ko)")
+        except sqlite3.Error as e:
+            logger.warning(f"Cache OCR sur disque indisponible ({path}): {e}")
+    
+    @staticmethod
+    def make_key(pixels: np.ndarray, signature: str) -> str:
+        """
+        Empreinte d'un crop pour une configuration OCR
+        
+        Args:
+            pixels: Pixels du crop
+            signature: Configuration OCR (langue, étapes, seuils...) sous forme de texte
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(signature.encode('utf-8'))
+        digest.update(repr((pixels.shape, pixels.dtype.str)).encode('ascii'))
+        digest.update(np.ascontiguousarray(pixels).data)
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[OCROutput]:
+        """Résultat en cache pour cette clé (None si absent)."""
+        with self._lock:
+            output = self._memory.get(key)
+            if output is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return output
+            
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT text, confidence, method FROM ocr_results WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None:
+                        self._db.execute("UPDATE ocr_results SET last_used = ? WHERE key = ?", (time.time(), key))
+                        self._db.commit()
+                        output = (row[0], row[1], row[2])
+                        self._remember(key, output)
+                        self.disk_hits += 1
+                        return output
+                except sqlite3.Error as e:
+                    logger.debug(f"Lecture du cache OCR échouée: {e}")
+            
+            self.misses += 1
+            return None
+    
+    def put(self, key: str, output: OCROutput) -> None:
+        """Enregistre un résultat dans les deux niveaux."""
+        with self._lock:
+            self._remember(key, output)
+            if self._db is None:
+                return
+            
+            text, confidence, method = output
+            size = len(key) + len(text.encode('utf-8')) + len(method) + _ENTRY_OVERHEAD
+            try:
+                previous = self._db.execute("SELECT size FROM ocr_results WHERE key = ?", (key,)).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO ocr_results (key, text, confidence, method, size, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, text, confidence, method, size, time.time())
+                )
+                self._disk_bytes += size - (previous[0] if previous else 0)
+                if self._disk_bytes > self.max_disk_bytes:
+                    self._evict()
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.debug(f"Écriture du cache OCR échouée: {e}")
+    
+    def _remember(self, key: str, output: OCROutput) -> None:
+        """Ajoute au LRU en mémoire (appelant sous verrou)."""
+        self._memory[key] = output
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+    
+    def _evict(self) -> None:
+        """Supprime les entrées les plus anciennes jusqu'à 90 % de la limite (appelant sous verrou)."""
+        target = self.max_disk_bytes * 0.9
+        rows = self._db.execute("SELECT key, size FROM ocr_results ORDER BY last_used")
+        
+        stale = []
+        for key, size in rows:
+            if self._disk_bytes <= target:
+                break
+            stale.append((key,))
+            self._disk_bytes -= size
+        rows.close()
+        
+        self._db.executemany("DELETE FROM ocr_results WHERE key = ?", stale)
+        self.evicted += len(stale)
+        logger.debug(f"Cache OCR: {len(stale)} entrée(s) supprimée(s)")
+    
+    def reset_stats(self) -> None:
+        """Remet les compteurs à zéro (début d'une extraction)."""
+        self.memory_hits = self.disk_hits = self.misses = self.evicted = 0
+    
+    def stats(self) -> Dict[str, float]:
+        """Compteurs depuis le dernier reset_stats (pour les métadonnées de la tâche)."""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evicted": self.evicted,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "disk_bytes": self._disk_bytes,
+        }
+    
+    def close(self) -> None:
+        """Ferme la base (le LRU en mémoire reste utilisable)."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,98 @@
+"""
+Profils OCR - modèles, dictionnaires et jeu de caractères de Tesseract
+"""
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from src.infrastructure.ocr.tesseract_backends import parse_tesseract_config
+
+logger = logging.getLogger(__name__)
+
+# Caractères absents d'un texte Kindle, que le modèle ne doit pas proposer.
+# Jeu restreint par exclusion : une liste blanche devrait contenir l'espace
+# (sans elle le LSTM colle les mots), impossible à transmettre par la
+# configuration (découpée par shlex, sans guillemets sous Windows)
+KINDLE_CHAR_BLACKLIST = "|{}<>_~^`¦©®¬±µ¶§¤¢£¥"
+
+
+@dataclass(frozen=True)
+class OCRProfile:
+    """Réglages Tesseract appliqués à toutes les étapes de la cascade OCR"""
+    name: str
+    oem: int = 3                      # 1 = LSTM seul, 3 = selon les modèles
+    tessdata: Optional[str] = None    # Dossier de modèles, voisin du tessdata par défaut (None = celui-ci)
+    dictionaries: bool = True         # Dictionnaires de mots (load_system_dawg / load_freq_dawg)
+    blacklist: Optional[str] = None   # Caractères interdits (None = aucun)
+    
+    def apply(self, config: str, tessdata_dir: Optional[str] = None) -> str:
+        """
+        Configuration d'une étape avec les réglages du profil
+        
+        Seule la segmentation (--psm) de l'étape est conservée ; l'application
+        est idempotente.
+        
+        Args:
+            config: Options Tesseract de l'étape
+            tessdata_dir: Dossier de modèles résolu (voir resolve_tessdata_dir)
+        """
+        psm, _, _, variables = parse_tesseract_config(config)
+        for name in ('load_system_dawg', 'load_freq_dawg', 'tessedit_char_blacklist'):
+            variables.pop(name, None)
+        
+        if not self.dictionaries:
+            variables['load_system_dawg'] = '0'
+            variables['load_freq_dawg'] = '0'
+        if self.blacklist:
+            variables['tessedit_char_blacklist'] = self.blacklist
+        
+        parts = [f"--oem {self.oem}", f"--psm {psm}"]
+        if tessdata_dir:
+            parts.append(f'--tessdata-dir "{tessdata_dir}"')
+        parts.extend(f"-c {key}={value}" for key, value in variables.items())
+        return ' '.join(parts)
+    
+    def resolve_tessdata_dir(self, default_dir: Optional[str], lang: str) -> Optional[str]:
+        """
+        Dossier de modèles du profil, s'il contient toutes les langues demandées
+        
+        Args:
+            default_dir: Dossier tessdata du moteur (défaut : TESSDATA_PREFIX)
+            lang: Langues Tesseract ("fra+eng")
+        
+        Returns:
+            Dossier à passer à Tesseract, ou None pour les modèles par défaut
+        """
+        if not self.tessdata:
+            return None
+        
+        base = default_dir or os.environ.get('TESSDATA_PREFIX')
+        candidate = self.tessdata if os.path.isabs(self.tessdata) or not base else \
+            os.path.join(os.path.dirname(os.path.normpath(base)), self.tessdata)
+        
+        missing = [code for code in lang.split('+')
+                   if not os.path.exists(os.path.join(candidate, f"{code}.traineddata"))]
+        if missing:
+            logger.warning(f"Profil OCR {self.name}: modèles {'+'.join(missing)} absents de {candidate}, modèles par défaut utilisés")
+            return None
+        return candidate
+
+
+# Profils choisis par extraction (TesseractOCREngine.use_profile / ExtractionParams.ocr_profile)
+OCR_PROFILES: Dict[str, OCRProfile] = {
+    # Rendus Kindle nets : modèles tessdata_fast, sans dictionnaires, caractères restreints
+    "fast": OCRProfile("fast", oem=1, tessdata="tessdata_fast", dictionaries=False, blacklist=KINDLE_CHAR_BLACKLIST),
+    # Réglages historiques : modèles installés avec Tesseract
+    "balanced": OCRProfile("balanced"),
+    # Polices difficiles, scans : modèles tessdata_best
+    "accurate": OCRProfile("accurate", oem=1, tessdata="tessdata_best"),
+}
+
+
+def get_ocr_profile(name: str) -> OCRProfile:
+    """Profil OCR par nom (ValueError si inconnu)."""
+    try:
+        return OCR_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Profil OCR inconnu: {name} (profils: {', '.join(OCR_PROFILES)})") from None
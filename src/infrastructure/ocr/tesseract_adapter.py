@@ -3,19 +3,31 @@ Adaptateur Tesseract - Implémentation concrète de OCREngine avec détection de
 Version corrigée pour créer des fiches individuelles par surlignement
 """
 import asyncio
-from typing import Tuple, List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple, List, Optional, Sequence, Union
+import numpy as np
 import pytesseract
-from PIL import Image, ImageEnhance
+from PIL import Image
 import io
 import logging
 import os
-from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 from src.application.ports.ocr_engine import OCREngine
+from src.application.ports.kindle_controller import Frame
+from src.infrastructure.ocr.tesseract_backends import create_tesseract_backend
+from src.infrastructure.ocr.ocr_batch import plan_batches, split_words, stitch_crops
+from src.infrastructure.ocr.ocr_cache import OCROutput, OCRResultCache
+from src.infrastructure.ocr.crop_preprocessing import CropVariants
+from src.infrastructure.ocr.ocr_profiles import get_ocr_profile
+from src.infrastructure.ocr.language_detection import LanguageSelector
+from src.infrastructure.debug.debug_sink import DebugImageSink, shared_debug_sink
 
 logger = logging.getLogger(__name__)
 
+# Confiance minimale (%) d'un surlignement retenu
+MIN_RESULT_CONFIDENCE = 20
+
 @dataclass
 class HighlightResult:
     """Résultat d'extraction d'un surlignement individuel"""
@@ -24,6 +36,36 @@ class HighlightResult:
     position: Tuple[int, int]  # (x, y) - position du surlignement
     size: Tuple[int, int]      # (width, height) - taille du surlignement
     highlight_number: int      # Numéro du surlignement (1, 2, 3...)
+    ocr_method: str = ""       # Étape de la cascade OCR ayant produit le texte
+    color: str = "yellow"      # Couleur du surlignement (jaune, bleu, rose, orange)
+
+
+@dataclass(frozen=True)
+class OCRStage:
+    """Étape de la cascade OCR d'un surlignement"""
+    name: str
+    config: str                   # Options Tesseract (--oem / --psm / -c)
+    preprocess: str = "original"  # Variante du crop (voir CropVariants : gray, enlarged, enhanced, otsu...)
+    single_line: bool = False     # Étape réservée aux surlignements d'une seule ligne
+
+
+# Ordre par coût et fréquence de succès : sur un rendu Kindle propre,
+# PSM 6 sur le crop en niveaux de gris suffit presque toujours
+DEFAULT_OCR_CASCADE: Tuple[OCRStage, ...] = (
+    OCRStage("PSM6", r'--oem 3 --psm 6', "gray"),
+    OCRStage("PSM7", r'--oem 3 --psm 7', "gray", single_line=True),
+    OCRStage("Enlarged", r'--oem 3 --psm 6', "enlarged"),
+    OCRStage("Enhanced", r'--oem 3 --psm 6', "enhanced"),
+)
+
+
+@dataclass(frozen=True)
+class OCRSettings:
+    """Configuration OCR figée au début d'une extraction (profil, langue, cascade, clé de cache)"""
+    profile: str
+    lang: str
+    cascade: Tuple[OCRStage, ...]
+    signature: str
 
 # Import dynamique pour éviter les imports circulaires
 def get_highlight_detector():
@@ -32,29 +74,248 @@ def get_highlight_detector():
     return KindleHighlightDetector
 
 
+# Moteur propre à chaque processus du pool OCR (créé par _init_ocr_worker)
+_worker_engine: Optional["TesseractOCREngine"] = None
+
+
+def _init_ocr_worker(omp_thread_limit: int, engine_options: dict) -> None:
+    """
+    Initialise un processus du pool OCR.
+    
+    Args:
+        omp_thread_limit: OMP_THREAD_LIMIT du processus
+        engine_options: Arguments du TesseractOCREngine local (sans pool)
+    """
+    global _worker_engine
+    
+    # Hérité par les sous-processus tesseract : un seul cœur chacun, le
+    # parallélisme vient du nombre de workers. Déjà fixé par le processus
+    # principal (fork) ; nécessaire avec spawn, avant le chargement de tesserocr
+    os.environ['OMP_THREAD_LIMIT'] = str(omp_thread_limit)
+    
+    _worker_engine = TesseractOCREngine(**engine_options)
+
+
+def _ocr_highlight_in_worker(
+    profile: str,
+    lang: str,
+    highlight: np.ndarray,
+    highlight_num: int,
+    line_count: int = 1,
+    page_number: Optional[int] = None
+) -> Tuple[str, float, str]:
+    """OCR d'un surlignement dans un processus du pool, avec le profil et la langue du processus principal."""
+    _worker_engine.use_profile(profile)
+    _worker_engine.use_language(lang)
+    return _worker_engine._ocr_single_highlight_improved(highlight, highlight_num, line_count, page_number)
+
+
+def _ocr_batch_in_worker(profile: str, lang: str, items: List[tuple]) -> List[Optional[Tuple[str, float, str]]]:
+    """OCR par lot de plusieurs surlignements dans un processus du pool."""
+    _worker_engine.use_profile(profile)
+    _worker_engine.use_language(lang)
+    return _worker_engine._ocr_batch(items)
+
+
 class TesseractOCREngine(OCREngine):
     """Implémentation Tesseract du moteur OCR avec détection de surlignements."""
     
-    def __init__(self, tesseract_cmd: str = None, debug_mode: bool = False):
+    def __init__(
+        self,
+        tesseract_cmd: str = None,
+        debug_mode: bool = False,
+        workers: int = 0,
+        omp_thread_limit: int = 1,
+        backend: str = "auto",
+        tessdata_dir: Optional[str] = None,
+        ocr_cascade: Optional[Sequence[OCRStage]] = None,
+        early_exit: bool = True,
+        early_exit_confidence: float = 85.0,
+        early_exit_min_length: int = 3,
+        detection_params_file: Optional[str] = "best_detection_params.json",
+        debug_sink: Optional[DebugImageSink] = None,
+        batch_ocr: bool = False,
+        batch_gap: int = 32,
+        batch_max_height: int = 4000,
+        ocr_cache: Optional[OCRResultCache] = None,
+        ocr_profile: str = "balanced",
+        lang: str = "fra+eng",
+        auto_language: bool = False
+    ):
         """
         Initialise l'adaptateur Tesseract.
         
         Args:
             tesseract_cmd: Chemin vers l'exécutable Tesseract
             debug_mode: Si True, sauvegarde les captures pour debug
+            workers: Nombre de processus OCR (0 = OCR dans le thread pool par défaut)
+            omp_thread_limit: OMP_THREAD_LIMIT de chaque processus OCR
+            backend: "persistent" (tesserocr), "subprocess" (pytesseract) ou "auto"
+            tessdata_dir: Dossier des modèles (défaut : tessdata à côté de tesseract_cmd)
+            ocr_cascade: Étapes OCR essayées dans l'ordre (défaut DEFAULT_OCR_CASCADE)
+            early_exit: Si False, toutes les étapes sont essayées et la meilleure retenue
+            early_exit_confidence: Confiance (%) à partir de laquelle la cascade s'arrête
+            early_exit_min_length: Longueur minimale du texte pour s'arrêter
+            detection_params_file: Paramètres de détection calibrés (ignoré s'il n'existe pas)
+            debug_sink: Puits des images de debug (défaut : puits partagé)
+            batch_ocr: Si True, les surlignements d'une page sont lus en un seul
+                appel Tesseract (voir extract_highlights_batch)
+            batch_gap: Bande blanche entre deux surlignements empilés, en pixels
+            batch_max_height: Hauteur maximale d'une image empilée, en pixels
+            ocr_cache: Cache des résultats par crop (None = pas de cache) ; consulté
+                dans ce processus, avant la répartition sur le pool
+            ocr_profile: Profil OCR initial ("fast", "balanced", "accurate"), voir use_profile
+            lang: Langues Tesseract
+            auto_language: Si True, la langue dominante est détectée sur les premiers
+                surlignements et seul son modèle est utilisé ensuite (voir LanguageSelector)
         """
         if tesseract_cmd:
             pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
-        self._executor = None
+            if tessdata_dir is None:
+                candidate = os.path.join(os.path.dirname(tesseract_cmd), 'tessdata')
+                if os.path.isdir(candidate):
+                    tessdata_dir = candidate
+        
+        if workers > 0:
+            # Fixé avant le chargement de tesserocr (OpenMP lit la variable à ce
+            # moment) : les processus du pool, créés par fork, en héritent
+            os.environ['OMP_THREAD_LIMIT'] = str(omp_thread_limit)
+        
+        # API persistante si disponible : pas de processus ni de rechargement
+        # des modèles à chaque appel
+        self.ocr_backend = create_tesseract_backend(backend, tessdata_dir)
+        logger.info(f"Backend Tesseract: {self.ocr_backend.name}")
         self.debug_mode = debug_mode
-        self.debug_counter = 0
+        self.debug_sink = debug_sink or shared_debug_sink()
         self.extraction_counter = 0
         
+        self.tessdata_dir = tessdata_dir
+        self._base_cascade = tuple(ocr_cascade or DEFAULT_OCR_CASCADE)
+        self.early_exit = early_exit
+        self.early_exit_confidence = early_exit_confidence
+        self.early_exit_min_length = early_exit_min_length
+        
+        self.batch_ocr = batch_ocr
+        self.batch_gap = batch_gap
+        self.batch_max_height = batch_max_height
+        
+        self.ocr_cache = ocr_cache
+        self.ocr_lang = lang
+        self.language_selector = LanguageSelector(lang) if auto_language else None
+        self.ocr_profile = None
+        self.default_profile = ocr_profile
+        self.use_profile(ocr_profile)
+        
+        self._executor = None
+        self.workers = workers  # OCR simultanés possibles (taille du pool)
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        if workers > 0:
+            # Même configuration dans chaque processus ; ils démarrent à la première soumission
+            engine_options = dict(
+                tesseract_cmd=tesseract_cmd,
+                debug_mode=debug_mode,
+                backend=backend,
+                tessdata_dir=tessdata_dir,
+                ocr_cascade=self._base_cascade,
+                ocr_profile=ocr_profile,
+                lang=lang,
+                early_exit=early_exit,
+                early_exit_confidence=early_exit_confidence,
+                early_exit_min_length=early_exit_min_length,
+                batch_gap=batch_gap,
+                batch_max_height=batch_max_height,
+                debug_sink=self.debug_sink  # Recréé avec les mêmes réglages dans chaque processus
+            )
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_ocr_worker,
+                initargs=(omp_thread_limit, engine_options)
+            )
+        
         # Détecteur de surlignements (import dynamique)
         detector_class = get_highlight_detector()
-        self.highlight_detector = detector_class(debug_mode=debug_mode)
+        self.highlight_detector = detector_class(
+            debug_mode=debug_mode,
+            params_file=detection_params_file,
+            debug_sink=self.debug_sink
+        )
+    
+    def use_profile(self, name: str) -> None:
+        """
+        Choisit le profil OCR (modèles, dictionnaires, caractères) des prochaines extractions
+        
+        Le profil réécrit la configuration de chaque étape de la cascade ; les
+        processus du pool reçoivent le nom du profil avec chaque OCR.
+        
+        Args:
+            name: "fast", "balanced" ou "accurate" (voir OCR_PROFILES)
+        """
+        if self.ocr_profile is not None and self.ocr_profile.name == name:
+            return
+        
+        self.ocr_profile = get_ocr_profile(name)
+        tessdata_dir = self._apply_settings()
+        logger.info(f"Profil OCR: {name} (modèles: {tessdata_dir or 'par défaut'})")
+    
+    def reset_profile(self) -> None:
+        """Revient au profil OCR donné à la construction du moteur."""
+        self.use_profile(self.default_profile)
+    
+    def use_language(self, lang: str) -> None:
+        """Choisit les langues Tesseract ("fra+eng", "fra"...) des prochains OCR."""
+        if lang == self.ocr_lang:
+            return
+        self.ocr_lang = lang
+        self._apply_settings()
+        logger.info(f"Langue OCR: {lang}")
     
-    async def extract_text(self, image: bytes, region: Tuple[int, int, int, int]) -> Tuple[str, float]:
+    def _apply_settings(self) -> Optional[str]:
+        """
+        Recalcule la cascade et la clé de cache pour le profil et la langue courants
+        
+        Les extractions en cours gardent l'OCRSettings lu à leur début : un
+        changement de langue ou de profil ne s'applique qu'aux suivantes.
+        
+        Returns:
+            Dossier de modèles du profil (None = modèles par défaut)
+        """
+        profile = self.ocr_profile
+        tessdata_dir = profile.resolve_tessdata_dir(self.tessdata_dir, self.ocr_lang)
+        self.ocr_cascade = tuple(
+            replace(stage, config=profile.apply(stage.config, tessdata_dir))
+            for stage in self._base_cascade
+        )
+        
+        # Tout ce qui change le résultat d'un crop fait partie de la clé du cache
+        self._cache_signature = repr((
+            self.ocr_lang,
+            self.ocr_backend.name,
+            self.ocr_cascade,
+            self.early_exit,
+            self.early_exit_confidence,
+            self.early_exit_min_length,
+        ))
+        self.settings = OCRSettings(self.ocr_profile.name, self.ocr_lang, self.ocr_cascade, self._cache_signature)
+        return tessdata_dir
+    
+    def reset_language(self) -> None:
+        """Nouvelle extraction (nouveau livre) : la langue est à nouveau détectée."""
+        if self.language_selector is not None:
+            self.language_selector.reset()
+            self.use_language(self.language_selector.lang)
+    
+    def language_stats(self) -> Optional[dict]:
+        """État de la détection de langue (None si elle est désactivée)."""
+        return self.language_selector.stats() if self.language_selector is not None else None
+    
+    def _observe_language(self, results: Sequence[HighlightResult]) -> None:
+        """Transmet les surlignements lus à la détection de langue et applique sa décision."""
+        if self.language_selector is None:
+            return
+        for result in results:
+            self.use_language(self.language_selector.observe(result.text, result.confidence))
+    
+    async def extract_text(self, image: Union[bytes, Frame], region: Tuple[int, int, int, int]) -> Tuple[str, float]:
         """
         MÉTHODE DE COMPATIBILITÉ - Retourne le premier surlignement trouvé
         Pour maintenir la compatibilité avec l'ancienne interface
@@ -65,12 +326,12 @@ class TesseractOCREngine(OCREngine):
             return first_highlight.text, first_highlight.confidence
         return "", 0.0
     
-    async def extract_highlights(self, image: bytes, region: Tuple[int, int, int, int]) -> List[HighlightResult]:
+    async def extract_highlights(self, image: Union[bytes, Frame], region: Tuple[int, int, int, int]) -> List[HighlightResult]:
         """
         NOUVELLE MÉTHODE - Extrait tous les surlignements individuellement
         
         Args:
-            image: Image en bytes
+            image: Frame brute (ou image en bytes pour les appelants legacy)
             region: Tuple (x, y, width, height)
             
         Returns:
@@ -80,60 +341,209 @@ class TesseractOCREngine(OCREngine):
         logger.info(f"=== EXTRACTION #{self.extraction_counter} - Region: {region} ===")
         
         loop = asyncio.get_event_loop()
+        # Configuration lue avant tout await : une autre page peut la changer pendant l'OCR
+        settings = self.settings
+        
+        if self.batch_ocr:
+            # Tous les surlignements de la page en un seul appel Tesseract
+            return (await self.extract_highlights_batch([(image, region)]))[0]
+        
+        if self._process_pool is None:
+            # Exécuter dans un thread pool pour ne pas bloquer
+            results = await loop.run_in_executor(
+                self._executor,
+                self._extract_highlights_individual_sync,
+                image,
+                region,
+                settings
+            )
+            self._observe_language(results)
+            return results
         
-        # Exécuter dans un thread pool pour ne pas bloquer
-        result = await loop.run_in_executor(
+        # Détection locale, puis OCR de chaque surlignement réparti sur les processus
+        page_number = image.page_number if isinstance(image, Frame) else None
+        detections = await loop.run_in_executor(
             self._executor,
-            self._extract_highlights_individual_sync,
+            self.highlight_detector.detect,
             image,
             region
         )
         
-        return result
+        items = [
+            (detection.crop, i + 1, detection.line_count, page_number)
+            for i, detection in enumerate(detections)
+        ]
+        outputs, missing, keys = self._cache_lookup(items, settings)
+        
+        ocr_outputs = await asyncio.gather(*[
+            loop.run_in_executor(self._process_pool, _ocr_highlight_in_worker, settings.profile, settings.lang, *items[i])
+            for i in missing
+        ], return_exceptions=True)
+        
+        for i, output in zip(missing, ocr_outputs):
+            if isinstance(output, Exception):
+                logger.error(f"✗ Erreur OCR sur surlignement {i + 1}: {output}")
+                continue
+            outputs[i] = output
+        self._cache_store(keys, outputs, missing)
+        
+        results = []
+        for i, (detection, output) in enumerate(zip(detections, outputs)):
+            if output is None:
+                continue
+            
+            result = self._build_result(detection, i + 1, *output)
+            if result:
+                results.append(result)
+        
+        logger.info(f"=== RÉSULTAT FINAL: {len(results)} surlignement(s) avec texte extrait ===")
+        self._observe_language(results)
+        return results
     
-    def _extract_highlights_individual_sync(self, image_bytes: bytes, region: Tuple[int, int, int, int]) -> List[HighlightResult]:
+    async def extract_highlights_batch(
+        self,
+        pages: Sequence[Tuple[Union[bytes, Frame], Tuple[int, int, int, int]]]
+    ) -> List[List[HighlightResult]]:
+        """
+        Extrait les surlignements de plusieurs pages avec un OCR par lot
+        
+        Les crops de toutes les pages sont empilés dans une seule image (ou
+        quelques-unes, voir batch_max_height) lue par un seul image_to_data ;
+        les mots sont ensuite rendus à leur crop d'après leur position verticale.
+        Un crop dont la répartition est ambiguë, ou dont le résultat n'aurait
+        pas arrêté la cascade à sa première étape, repasse par l'OCR individuel.
+        
+        Args:
+            pages: Couples (frame, région) à analyser
+            
+        Returns:
+            Une liste de HighlightResult par page, dans l'ordre de pages
+        """
+        loop = asyncio.get_event_loop()
+        settings = self.settings
+        
+        detections_per_page = []
+        for image, region in pages:
+            detections_per_page.append(await loop.run_in_executor(
+                self._executor,
+                self.highlight_detector.detect,
+                image,
+                region
+            ))
+        
+        # Un élément par crop : (pixels, numéro, lignes, page) - arguments de l'OCR individuel
+        items = []
+        for (image, _), detections in zip(pages, detections_per_page):
+            page_number = image.page_number if isinstance(image, Frame) else None
+            items.extend(
+                (detection.crop, i + 1, detection.line_count, page_number)
+                for i, detection in enumerate(detections)
+            )
+        
+        # Seuls les crops absents du cache sont lus
+        outputs, missing, keys = self._cache_lookup(items, settings)
+        pending = [items[i] for i in missing]
+        
+        if not pending:
+            computed = []
+        elif self._process_pool is None:
+            computed = await loop.run_in_executor(self._executor, self._ocr_items_sync, pending, settings)
+        else:
+            computed = await loop.run_in_executor(self._process_pool, _ocr_batch_in_worker, settings.profile, settings.lang, pending)
+            fallback = [i for i, output in enumerate(computed) if output is None]
+            fallback_outputs = await asyncio.gather(*[
+                loop.run_in_executor(self._process_pool, _ocr_highlight_in_worker, settings.profile, settings.lang, *pending[i])
+                for i in fallback
+            ], return_exceptions=True)
+            for i, output in zip(fallback, fallback_outputs):
+                if isinstance(output, Exception):
+                    logger.error(f"✗ Erreur OCR sur surlignement {pending[i][1]}: {output}")
+                    output = ("", 0.0, "None")
+                computed[i] = output
+        
+        for i, output in zip(missing, computed):
+            outputs[i] = output
+        self._cache_store(keys, outputs, missing)
+        
+        results_per_page = []
+        remaining = iter(outputs)
+        for detections in detections_per_page:
+            results = []
+            for i, detection in enumerate(detections):
+                result = self._build_result(detection, i + 1, *next(remaining))
+                if result:
+                    results.append(result)
+            results_per_page.append(results)
+            self._observe_language(results)
+        
+        logger.info(f"=== RÉSULTAT FINAL (lot): {sum(map(len, results_per_page))} surlignement(s) sur {len(pages)} page(s) ===")
+        return results_per_page
+    
+    async def has_highlights(self, image: Union[bytes, Frame], region: Tuple[int, int, int, int]) -> bool:
+        """
+        Détection seule, sans Tesseract : la région contient-elle des surlignements ?
+        
+        Utilisée par la phase 1 pour trier les pages à moindre coût.
+        
+        Args:
+            image: Frame brute (ou image en bytes pour les appelants legacy)
+            region: Tuple (x, y, width, height)
+            
+        Returns:
+            True si au moins une zone jaune candidate est trouvée
+        """
+        loop = asyncio.get_event_loop()
+        
+        count = await loop.run_in_executor(
+            self._executor,
+            self.highlight_detector.count_highlights_fast,
+            image,
+            region
+        )
+        
+        return count > 0
+    
+    def _extract_highlights_individual_sync(
+        self,
+        image: Union[bytes, Frame],
+        region: Tuple[int, int, int, int],
+        settings: Optional[OCRSettings] = None
+    ) -> List[HighlightResult]:
         """Extraction synchrone des surlignements INDIVIDUELS dans un thread séparé."""
         try:
             logger.info(f"Recherche de surlignements dans la région {region}")
             
-            # 1. Détecter les zones de surlignement avec leurs positions
-            highlight_regions = self.highlight_detector.detect_highlights(image_bytes, region)
-            highlight_images = self.highlight_detector.extract_highlight_text_regions(image_bytes, region)
+            # 1. Détecter les zones de surlignement (positions + crops en une seule passe)
+            detections = self.highlight_detector.detect(image, region)
             
-            if not highlight_images or not highlight_regions:
+            if not detections:
                 logger.info("Aucun surlignement détecté dans cette région")
                 return []
             
-            logger.info(f"=== TRAITEMENT INDIVIDUEL DE {len(highlight_images)} SURLIGNEMENT(S) ===")
+            logger.info(f"=== TRAITEMENT INDIVIDUEL DE {len(detections)} SURLIGNEMENT(S) ===")
             
             # 2. Traitement individuel de chaque surlignement
             individual_results = []
+            page_number = image.page_number if isinstance(image, Frame) else None
             
-            for i, (highlight_bytes, region_info) in enumerate(zip(highlight_images, highlight_regions)):
+            for i, detection in enumerate(detections):
                 highlight_num = i + 1
-                x, y, w, h = region_info
+                highlight_pixels = detection.crop
+                x, y, w, h = detection.bbox
                 
-                logger.info(f"--- SURLIGNEMENT {highlight_num}/{len(highlight_images)} ---")
-                logger.info(f"Position: ({x}, {y}), Taille: {w}x{h}")
+                logger.info(f"--- SURLIGNEMENT {highlight_num}/{len(detections)} ---")
+                logger.info(f"Position: ({x}, {y}), Taille: {w}x{h}, {detection.line_count} ligne(s)")
                 
                 try:
                     # OCR sur le surlignement individuel
-                    text, confidence = self._ocr_single_highlight_improved(highlight_bytes, highlight_num)
+                    text, confidence, method = self._ocr_highlight_cached(
+                        highlight_pixels, highlight_num, detection.line_count, page_number, settings
+                    )
                     
-                    if text.strip() and confidence > 20:  # Seuil de qualité
-                        result = HighlightResult(
-                            text=text.strip(),
-                            confidence=confidence,
-                            position=(x, y),
-                            size=(w, h),
-                            highlight_number=highlight_num
-                        )
+                    result = self._build_result(detection, highlight_num, text, confidence, method)
+                    if result:
                         individual_results.append(result)
                         
-                        logger.info(f"✓ Surlignement {highlight_num} extrait: '{text[:50]}{'...' if len(text) > 50 else ''}' (confiance: {confidence:.1f}%)")
-                    else:
-                        logger.info(f"✗ Surlignement {highlight_num}: texte vide ou confiance trop faible ({confidence:.1f}%)")
-                        
                 except Exception as e:
                     logger.error(f"✗ Erreur OCR sur surlignement {highlight_num}: {e}")
                     continue
@@ -145,56 +555,237 @@ class TesseractOCREngine(OCREngine):
             logger.error(f"Erreur lors de l'extraction des surlignements: {e}", exc_info=True)
             return []
     
-    def _ocr_single_highlight_improved(self, highlight_bytes: bytes, highlight_num: int) -> Tuple[str, float]:
+    def _build_result(
+        self,
+        detection,
+        highlight_num: int,
+        text: str,
+        confidence: float,
+        ocr_method: str = ""
+    ) -> Optional[HighlightResult]:
+        """Construit le HighlightResult d'un surlignement OCRisé (None si rejeté)."""
+        x, y, w, h = detection.bbox
+        
+        if text.strip() and confidence > MIN_RESULT_CONFIDENCE:  # Seuil de qualité
+            logger.info(f"✓ Surlignement {highlight_num} extrait: '{text[:50]}{'...' if len(text) > 50 else ''}' (confiance: {confidence:.1f}%, {ocr_method})")
+            return HighlightResult(
+                text=text.strip(),
+                confidence=confidence,
+                position=(x, y),
+                size=(w, h),
+                highlight_number=highlight_num,
+                ocr_method=ocr_method,
+                color=getattr(detection, 'color', "yellow")
+            )
+        
+        logger.info(f"✗ Surlignement {highlight_num}: texte vide ou confiance trop faible ({confidence:.1f}%)")
+        return None
+    
+    def _cache_key(self, crop: np.ndarray, line_count: int, settings: Optional[OCRSettings] = None) -> str:
+        """Clé du cache : pixels du crop, configuration OCR et nombre de lignes."""
+        signature = (settings or self.settings).signature
+        return OCRResultCache.make_key(crop, f"{signature}|{line_count}")
+    
+    def _cache_lookup(
+        self,
+        items: Sequence[tuple],
+        settings: Optional[OCRSettings] = None
+    ) -> Tuple[List[Optional[OCROutput]], List[int], List[Optional[str]]]:
+        """
+        Cherche les surlignements dans le cache
+        
+        Les clés sont calculées une seule fois, avant l'OCR : le résultat est
+        rangé sous la clé de la configuration qui l'a produit, même si elle
+        change pendant l'OCR (autre page du pipeline).
+        
+        Returns:
+            Tuple (résultat ou None par surlignement, indices à OCRiser,
+            clé par surlignement à passer à _cache_store)
+        """
+        outputs: List[Optional[OCROutput]] = [None] * len(items)
+        keys: List[Optional[str]] = [None] * len(items)
+        if self.ocr_cache is None:
+            return outputs, list(range(len(items))), keys
+        
+        missing = []
+        for i, (crop, _, line_count, _) in enumerate(items):
+            if isinstance(crop, np.ndarray):
+                keys[i] = self._cache_key(crop, line_count, settings)
+                outputs[i] = self.ocr_cache.get(keys[i])
+            if outputs[i] is None:
+                missing.append(i)
+        return outputs, missing, keys
+    
+    def _cache_store(self, keys: Sequence[Optional[str]], outputs: Sequence[Optional[OCROutput]], indices: Sequence[int]) -> None:
+        """
+        Enregistre les résultats OCRisés sous les clés de _cache_lookup
+        
+        Les textes vides ne sont pas gardés : ils peuvent venir d'un Tesseract
+        indisponible ou en échec, qu'un nouvel essai corrigera.
+        """
+        if self.ocr_cache is None:
+            return
+        for i in indices:
+            output = outputs[i]
+            if output is not None and output[0].strip() and keys[i] is not None:
+                self.ocr_cache.put(keys[i], output)
+    
+    def _ocr_highlight_cached(
+        self,
+        highlight: Union[np.ndarray, bytes],
+        highlight_num: int,
+        line_count: int = 1,
+        page_number: Optional[int] = None,
+        settings: Optional[OCRSettings] = None
+    ) -> OCROutput:
+        """_ocr_single_highlight_improved derrière le cache des résultats."""
+        items = [(highlight, highlight_num, line_count, page_number)]
+        outputs, missing, keys = self._cache_lookup(items, settings)
+        if missing:
+            outputs[0] = self._ocr_single_highlight_improved(*items[0], settings)
+            self._cache_store(keys, outputs, missing)
+        return outputs[0]
+    
+    def cache_stats(self, reset: bool = False) -> Optional[dict]:
+        """
+        Compteurs du cache OCR (None sans cache)
+        
+        Args:
+            reset: Remettre les compteurs à zéro après lecture (début d'une extraction)
+        """
+        if self.ocr_cache is None:
+            return None
+        stats = self.ocr_cache.stats()
+        if reset:
+            self.ocr_cache.reset_stats()
+        return stats
+    
+    def _ocr_items_sync(self, items: Sequence[tuple], settings: Optional[OCRSettings] = None) -> List[Tuple[str, float, str]]:
+        """OCR par lot, puis OCR individuel des crops non résolus (hors pool)."""
+        outputs = self._ocr_batch(items, settings)
+        for i, output in enumerate(outputs):
+            if output is None:
+                outputs[i] = self._ocr_single_highlight_improved(*items[i], settings)
+        return outputs
+    
+    def _batch_stage(self, settings: Optional[OCRSettings] = None) -> Optional[OCRStage]:
+        """Étape de la cascade jouée par le lot : la première sur crop non retouché (RGB ou gris), multi-lignes."""
+        for stage in (settings or self.settings).cascade:
+            if stage.preprocess in ("original", "gray") and not stage.single_line:
+                return stage
+        return None
+    
+    def _ocr_batch(self, items: Sequence[tuple], settings: Optional[OCRSettings] = None) -> List[Optional[Tuple[str, float, str]]]:
         """
-        Fait l'OCR sur un seul surlignement avec plusieurs tentatives d'amélioration.
+        OCR par lot de plusieurs surlignements
+        
+        Le lot tient lieu de première étape de la cascade : un crop n'est
+        résolu que si son texte atteint le critère de sortie anticipée
+        (early_exit_confidence, early_exit_min_length).
         
         Args:
-            highlight_bytes: Image du surlignement en bytes
+            items: Tuples (pixels RGB, numéro, lignes, page) des surlignements
+            settings: Configuration de l'extraction (défaut : configuration courante)
+            
+        Returns:
+            (texte, confiance, étape) par surlignement, None s'il faut l'OCR individuel
+        """
+        settings = settings or self.settings
+        outputs: List[Optional[Tuple[str, float, str]]] = [None] * len(items)
+        stage = self._batch_stage(settings)
+        if stage is None or len(items) < 2:
+            return outputs
+        
+        heights = [crop.shape[0] for crop, _, _, _ in items]
+        for batch in plan_batches(heights, self.batch_gap, self.batch_max_height):
+            if len(batch) < 2:
+                continue
+            
+            stitched, spans = stitch_crops([items[i][0] for i in batch], self.batch_gap)
+            stitched = CropVariants(stitched).get(stage.preprocess)
+            try:
+                data = self.ocr_backend.image_to_data(stitched, lang=settings.lang, config=stage.config)
+            except Exception as e:
+                logger.debug(f"Lot OCR de {len(batch)} surlignement(s) échoué: {e}")
+                continue
+            
+            split = split_words(data, spans, tolerance=self.batch_gap // 4)
+            for i, text_conf in zip(batch, split):
+                if text_conf is None:
+                    continue
+                text, conf = text_conf
+                if conf < self.early_exit_confidence or len(text.strip()) < self.early_exit_min_length:
+                    continue
+                
+                outputs[i] = (text, conf, f"{stage.name}-batch")
+                crop, highlight_num, _, page_number = items[i]
+                if self.debug_mode and self.debug_sink.samples_page(page_number):
+                    self._save_debug_highlight(crop, highlight_num, "original", page_number)
+        
+        resolved = sum(output is not None for output in outputs)
+        logger.info(f"Lot OCR: {resolved}/{len(items)} surlignement(s) résolu(s) sans OCR individuel")
+        return outputs
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Arrête le pool de processus OCR (les OCR en attente sont annulés)."""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait, cancel_futures=True)
+            self._process_pool = None
+            logger.info("Pool OCR arrêté")
+    
+    def _ocr_single_highlight_improved(
+        self,
+        highlight: Union[np.ndarray, bytes],
+        highlight_num: int,
+        line_count: int = 1,
+        page_number: Optional[int] = None,
+        settings: Optional[OCRSettings] = None
+    ) -> Tuple[str, float, str]:
+        """
+        Fait l'OCR sur un seul surlignement en cascade de tentatives.
+        
+        Les étapes de la cascade sont essayées dans l'ordre ; dès qu'un
+        résultat atteint early_exit_confidence (et early_exit_min_length
+        caractères), les étapes suivantes sont sautées. Un passage de plusieurs
+        lignes n'est lu qu'en mode bloc (étapes single_line ignorées).
+        
+        Args:
+            highlight: Pixels RGB du surlignement (ou image en bytes, legacy)
             highlight_num: Numéro du surlignement (pour debug)
+            line_count: Nombre de lignes regroupées dans le surlignement
+            page_number: Page d'origine (échantillonnage et noms des images de debug)
+            settings: Configuration de l'extraction (défaut : configuration courante)
             
         Returns:
-            Tuple (meilleur texte, meilleure confiance)
+            Tuple (meilleur texte, meilleure confiance, étape retenue)
         """
+        settings = settings or self.settings
         try:
-            # Charger l'image du surlignement
-            original_image = Image.open(io.BytesIO(highlight_bytes))
-            
-            # Debug: sauvegarder l'image originale
-            if self.debug_mode:
-                self._save_debug_highlight(original_image, highlight_num, "original")
-            
-            # Essayer plusieurs configurations d'OCR
-            attempts = []
-            
-            # Tentative 1: Image originale avec PSM 7 (ligne unique)
-            text1, conf1 = self._try_ocr_config(original_image, r'--oem 3 --psm 7', "psm7")
-            attempts.append((text1, conf1, "PSM7"))
-            
-            # Tentative 2: Image originale avec PSM 6 (bloc de texte)
-            text2, conf2 = self._try_ocr_config(original_image, r'--oem 3 --psm 6', "psm6")
-            attempts.append((text2, conf2, "PSM6"))
-            
-            # Tentative 3: Image agrandie x2 avec PSM 6 (bloc de texte)
-            if original_image.width * original_image.height < 10000:  # Agrandir seulement les petites images
-                enlarged_image = original_image.resize((original_image.width * 2, original_image.height * 2), Image.LANCZOS)
-                if self.debug_mode:
-                    self._save_debug_highlight(enlarged_image, highlight_num, "enlarged")
-                text3, conf3 = self._try_ocr_config(enlarged_image, r'--oem 3 --psm 6', "enlarged")
-                attempts.append((text3, conf3, "Enlarged"))
-            
-            # Tentative 4: Image avec contraste amélioré
-            enhancer = ImageEnhance.Contrast(original_image)
-            enhanced_image = enhancer.enhance(1.5)  # Augmenter le contraste
-            if self.debug_mode:
-                self._save_debug_highlight(enhanced_image, highlight_num, "enhanced")
-            text4, conf4 = self._try_ocr_config(enhanced_image, r'--oem 3 --psm 6', "enhanced")
-            attempts.append((text4, conf4, "Enhanced"))
-            
-            # Sélectionner le meilleur résultat
+            # Pixels du surlignement (les bytes legacy sont décodés une fois)
+            if isinstance(highlight, bytes):
+                highlight = np.asarray(Image.open(io.BytesIO(highlight)).convert('RGB'))
+            
+            # Variantes (gris, agrandi, binarisé...) calculées une fois, partagées par les étapes
+            variants = CropVariants(highlight)
+            
+            # Debug : images de chaque étape, envoyées une fois le verdict connu
+            debug = self.debug_mode and self.debug_sink.samples_page(page_number)
+            debug_images = [("original", highlight)] if debug else []
+            
             best_text, best_conf, best_method = "", 0.0, "None"
             
-            for text, conf, method in attempts:
+            for stage in settings.cascade:
+                if stage.single_line and line_count > 1:
+                    continue
+                
+                image = variants.get(stage.preprocess)
+                if image is None:
+                    continue
+                if debug and stage.preprocess != "original" and all(name != stage.preprocess for name, _ in debug_images):
+                    debug_images.append((stage.preprocess, image))
+                
+                text, conf = self._try_ocr_config(image, stage.config, stage.name, settings.lang)
+                
                 # Privilégier les résultats avec du texte et une confiance décente
                 if text and len(text.strip()) > 2:  # Au moins 3 caractères
                     # Favoriser les résultats plus longs avec une confiance raisonnable
@@ -202,24 +793,29 @@ class TesseractOCREngine(OCREngine):
                     current_score = best_conf + (len(best_text) * 0.1)
                     
                     if score > current_score and conf > 30:  # Confiance minimum de 30%
-                        best_text, best_conf, best_method = text, conf, method
+                        best_text, best_conf, best_method = text, conf, stage.name
+                
+                # Sortie anticipée : inutile d'essayer les variantes plus coûteuses
+                if (self.early_exit
+                        and best_conf >= self.early_exit_confidence
+                        and len(best_text.strip()) >= self.early_exit_min_length):
+                    break
+            
+            rejected = not best_text.strip() or best_conf <= MIN_RESULT_CONFIDENCE
+            for suffix, image in debug_images:
+                self._save_debug_highlight(image, highlight_num, suffix, page_number, rejected)
             
             logger.debug(f"    Surlignement {highlight_num}: Meilleur résultat avec {best_method}")
-            return best_text, best_conf
+            return best_text, best_conf, best_method
             
         except Exception as e:
             logger.error(f"OCR amélioré échoué pour le surlignement {highlight_num}: {e}", exc_info=True)
-            return "", 0.0
+            return "", 0.0, "None"
     
-    def _try_ocr_config(self, image: Image.Image, config: str, method_name: str) -> Tuple[str, float]:
-        """Essaie une configuration OCR spécifique."""
+    def _try_ocr_config(self, image: np.ndarray, config: str, method_name: str, lang: Optional[str] = None) -> Tuple[str, float]:
+        """Essaie une configuration OCR spécifique (lang : défaut langue courante)."""
         try:
-            data = pytesseract.image_to_data(
-                image, 
-                output_type=pytesseract.Output.DICT,
-                lang='fra+eng',
-                config=config
-            )
+            data = self.ocr_backend.image_to_data(image, lang=lang or self.ocr_lang, config=config)
             
             # Extraire texte et confiance
             texts = []
@@ -244,25 +840,19 @@ class TesseractOCREngine(OCREngine):
             logger.debug(f"      {method_name}: Échec - {e}")
             return "", 0.0
     
-    def _save_debug_highlight(self, image: Image.Image, highlight_num: int, suffix: str = ""):
-        """Sauvegarde l'image d'un surlignement pour debug."""
-        try:
-            debug_dir = "debug_ocr_highlights"
-            os.makedirs(debug_dir, exist_ok=True)
-            
-            self.debug_counter += 1
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            if suffix:
-                filename = f"{debug_dir}/highlight_{timestamp}_{highlight_num}_{suffix}.png"
-            else:
-                filename = f"{debug_dir}/highlight_{timestamp}_{highlight_num}.png"
-            
-            image.save(filename)
-            logger.debug(f"Debug: Surlignement sauvegardé dans {filename}")
-            
-        except Exception as e:
-            logger.error(f"Échec de la sauvegarde du surlignement: {e}")
+    def _save_debug_highlight(
+        self,
+        image: Union[np.ndarray, Image.Image],
+        highlight_num: int,
+        suffix: str = "",
+        page_number: Optional[int] = None,
+        rejected: bool = False
+    ):
+        """Envoie l'image d'un surlignement au puits de debug (écriture en arrière-plan)."""
+        stage = f"highlight{highlight_num:02d}_{suffix}" if suffix else f"highlight{highlight_num:02d}"
+        path = self.debug_sink.submit("debug_ocr_highlights", stage, image, page_number, rejected)
+        if path:
+            logger.debug(f"Debug: Surlignement mis en file pour {path}")
     
     async def is_available(self) -> bool:
         """Vérifie si Tesseract est disponible."""
@@ -270,7 +860,7 @@ class TesseractOCREngine(OCREngine):
             loop = asyncio.get_event_loop()
             version = await loop.run_in_executor(
                 self._executor,
-                pytesseract.get_tesseract_version
+                self.ocr_backend.version
             )
             logger.info(f"Tesseract available: {version}")
             return True
@@ -290,7 +880,7 @@ class TesseractOCREngineClassic(OCREngine):
         self.debug_mode = debug_mode
         self.extraction_counter = 0
     
-    async def extract_text(self, image: bytes, region: Tuple[int, int, int, int]) -> Tuple[str, float]:
+    async def extract_text(self, image: Union[bytes, Frame], region: Tuple[int, int, int, int]) -> Tuple[str, float]:
         """Version classique qui extrait tout le texte."""
         self.extraction_counter += 1
         logger.info(f"=== EXTRACTION CLASSIQUE #{self.extraction_counter} - Region: {region} ===")
@@ -303,12 +893,11 @@ class TesseractOCREngineClassic(OCREngine):
             region
         )
     
-    def _extract_classic_sync(self, image_bytes: bytes, region: Tuple[int, int, int, int]) -> Tuple[str, float]:
+    def _extract_classic_sync(self, image: Union[bytes, Frame], region: Tuple[int, int, int, int]) -> Tuple[str, float]:
         """Extraction classique de tout le texte."""
         try:
-            image = Image.open(io.BytesIO(image_bytes))
-            x, y, w, h = region
-            cropped = image.crop((x, y, x + w, y + h))
+            region_rgb, _ = get_highlight_detector().region_pixels(image, region)
+            cropped = Image.fromarray(region_rgb)
             
             custom_config = r'--oem 3 --psm 6'
             data = pytesseract.image_to_data(
@@ -0,0 +1,198 @@
+"""
+Backends Tesseract - exécution de l'OCR par sous-processus ou par API persistante
+"""
+import logging
+import os
+import shlex
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pytesseract
+
+logger = logging.getLogger(__name__)
+
+# tesserocr (optionnel, extra "persistent-ocr") garde l'API Tesseract chargée en mémoire.
+# Importé à la création du premier backend : OpenMP lit OMP_THREAD_LIMIT au
+# chargement de la bibliothèque, la variable doit être fixée avant
+_UNLOADED = object()
+tesserocr: Any = _UNLOADED
+
+
+def _load_tesserocr():
+    """Module tesserocr, importé au premier appel (None s'il n'est pas installé)."""
+    global tesserocr
+    if tesserocr is _UNLOADED:
+        try:
+            import tesserocr as module
+        except ImportError:
+            module = None
+        tesserocr = module
+    return tesserocr
+
+
+def parse_tesseract_config(config: str) -> Tuple[int, int, Optional[str], Dict[str, str]]:
+    """
+    Décompose une chaîne de configuration au format ligne de commande Tesseract.
+    
+    Returns:
+        Tuple (psm, oem, tessdata_dir, variables -c)
+    """
+    psm, oem, tessdata_dir = 3, 3, None
+    variables: Dict[str, str] = {}
+    
+    tokens = shlex.split(config, posix=os.name != 'nt')
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        value = tokens[i + 1] if i + 1 < len(tokens) else ''
+        if token == '--psm':
+            psm, i = int(value), i + 1
+        elif token == '--oem':
+            oem, i = int(value), i + 1
+        elif token == '--tessdata-dir':
+            tessdata_dir, i = value.strip('"'), i + 1
+        elif token == '-c' and '=' in value:
+            key, _, val = value.partition('=')
+            variables[key] = val
+            i += 1
+        i += 1
+    
+    return psm, oem, tessdata_dir, variables
+
+
+class SubprocessTesseractBackend:
+    """Backend historique : un processus tesseract par appel (pytesseract)."""
+    
+    name = "subprocess"
+    
+    def image_to_data(self, image: Any, lang: str, config: str) -> Dict[str, List]:
+        """OCR d'une image, résultat au format pytesseract.Output.DICT."""
+        return pytesseract.image_to_data(
+            image,
+            output_type=pytesseract.Output.DICT,
+            lang=lang,
+            config=config
+        )
+    
+    def version(self) -> str:
+        return str(pytesseract.get_tesseract_version())
+
+
+class PersistentTesseractBackend:
+    """
+    Backend persistant : API Tesseract en mémoire via tesserocr.
+    
+    Chaque thread garde ses instances TessBaseAPI (une par langue / modèle /
+    variables d'initialisation) : les modèles ne sont chargés qu'une fois et
+    les images sont transmises depuis la mémoire, sans fichier temporaire.
+    """
+    
+    name = "persistent"
+    
+    def __init__(self, tessdata_dir: Optional[str] = None):
+        """
+        Args:
+            tessdata_dir: Dossier des fichiers .traineddata (défaut tesserocr si None)
+        """
+        if _load_tesserocr() is None:
+            raise ImportError("tesserocr n'est pas installé")
+        
+        self.tessdata_dir = tessdata_dir
+        self._local = threading.local()
+    
+    def _api(self, lang: str, oem: int, tessdata_dir: Optional[str], variables: Dict[str, str]):
+        """Retourne l'API du thread courant pour cette configuration (créée au besoin)."""
+        apis = getattr(self._local, 'apis', None)
+        if apis is None:
+            apis = self._local.apis = {}
+        
+        path = tessdata_dir or self.tessdata_dir
+        key = (lang, oem, path, tuple(sorted(variables.items())))
+        api = apis.get(key)
+        
+        if api is None:
+            kwargs = {'lang': lang, 'oem': oem, 'variables': dict(variables)}
+            if path:
+                kwargs['path'] = os.path.join(path, '')
+            api = tesserocr.PyTessBaseAPI(**kwargs)
+            apis[key] = api
+            logger.info(f"API Tesseract persistante chargée ({lang}, oem {oem}) dans {threading.current_thread().name}")
+        
+        return api
+    
+    def image_to_data(self, image: Any, lang: str, config: str) -> Dict[str, List]:
+        """OCR d'une image, résultat au format pytesseract.Output.DICT."""
+        psm, oem, tessdata_dir, variables = parse_tesseract_config(config)
+        api = self._api(lang, oem, tessdata_dir, variables)
+        api.SetPageSegMode(psm)
+        
+        if isinstance(image, np.ndarray):
+            # Buffer brut transmis directement, sans encodage
+            pixels = np.ascontiguousarray(image)
+            height, width = pixels.shape[:2]
+            channels = 1 if pixels.ndim == 2 else pixels.shape[2]
+            api.SetImageBytes(pixels.tobytes(), width, height, channels, width * channels)
+        else:
+            api.SetImage(image)
+        
+        api.Recognize()
+        
+        data: Dict[str, List] = {key: [] for key in (
+            'block_num', 'line_num', 'left', 'top', 'width', 'height', 'conf', 'text'
+        )}
+        
+        iterator = api.GetIterator()
+        if iterator is None:
+            return data
+        
+        block_num = line_num = 0
+        level = tesserocr.RIL.WORD
+        for word in tesserocr.iterate_level(iterator, level):
+            try:
+                text = word.GetUTF8Text(level)
+            except RuntimeError:
+                # Mot vide (tesserocr lève au lieu de renvoyer '')
+                continue
+            box = word.BoundingBox(level)
+            if box is None:
+                continue
+            
+            if word.IsAtBeginningOf(tesserocr.RIL.BLOCK):
+                block_num += 1
+            if word.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                line_num += 1
+            
+            left, top, right, bottom = box
+            data['block_num'].append(block_num)
+            data['line_num'].append(line_num)
+            data['left'].append(left)
+            data['top'].append(top)
+            data['width'].append(right - left)
+            data['height'].append(bottom - top)
+            data['conf'].append(word.Confidence(level))
+            data['text'].append(text)
+        
+        return data
+    
+    def version(self) -> str:
+        return tesserocr.tesseract_version().splitlines()[0]
+
+
+def create_tesseract_backend(name: str = "auto", tessdata_dir: Optional[str] = None):
+    """
+    Crée le backend Tesseract demandé.
+    
+    Args:
+        name: "persistent", "subprocess" ou "auto" (persistant si tesserocr est installé)
+        tessdata_dir: Dossier des modèles pour le backend persistant
+    """
+    if name == "auto" and _load_tesserocr() is None:
+        logger.warning("tesserocr non installé : un processus tesseract par OCR "
+                       "(poetry install --extras persistent-ocr pour l'API persistante)")
+        return SubprocessTesseractBackend()
+    if name == "subprocess":
+        return SubprocessTesseractBackend()
+    if name in ("persistent", "auto"):
+        return PersistentTesseractBackend(tessdata_dir)
+    raise ValueError(f"Backend Tesseract inconnu: {name}")
@@ -155,6 +155,7 @@ class JsonHighlightRepository:
                 "height": highlight.position[3]
             } if highlight.position else None,
             "session_id": getattr(highlight, 'session_id', None),
+            "color": getattr(highlight, 'color', "yellow"),
             "metrics": {
                 "word_count": len(highlight.text.split()),
                 "character_count": len(highlight.text),
@@ -178,6 +179,7 @@ class JsonHighlightRepository:
             pages[page_num]["highlight_count"] += 1
             pages[page_num]["highlights"].append({
                 "highlight_number": getattr(highlight, 'highlight_number', 1),
+                "color": getattr(highlight, 'color', "yellow"),
                 "text": highlight.text,
                 "confidence": highlight.confidence,
                 "word_count": len(highlight.text.split()),
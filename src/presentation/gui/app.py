@@ -2,19 +2,21 @@
 Application principale - Point d'entrée GUI avec détection de surlignements
 """
 import asyncio
+import os
 import threading
 from pathlib import Path
 import logging
-from concurrent.futures import ThreadPoolExecutor
 
 from src.presentation.gui.views.main_window import MainWindow
 from src.presentation.gui.viewmodels.main_viewmodel import MainViewModel
 from src.application.use_cases.extract_highlights_use_case import ExtractHighlightsUseCase
 from src.application.use_cases.auto_page_detector import AutoPageDetector
 from src.infrastructure.ocr.tesseract_adapter import TesseractOCREngine
+from src.infrastructure.ocr.ocr_cache import OCRResultCache
 from src.infrastructure.kindle.pyautogui_adapter import PyAutoGuiKindleController
 from src.infrastructure.events.in_memory_event_bus import InMemoryEventBus
 from src.infrastructure.persistence.json_repository import JsonHighlightRepository
+from src.infrastructure.debug.debug_sink import DebugImageSink
 
 
 class AllamBikApp:
@@ -28,7 +30,10 @@ class AllamBikApp:
         self.logger = self._setup_logging()
         self.event_loop = None
         self.window = None
-        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.ocr_engine = None
+        
+        # Processus OCR : un cœur reste libre pour l'interface et la navigation
+        self.ocr_workers = max(1, (os.cpu_count() or 2) - 1)
         
     def _setup_logging(self):
         """Configure le système de logs."""
@@ -49,17 +54,29 @@ class AllamBikApp:
         else:
             self.logger.warning("⚠ Tesseract non trouvé - l'OCR ne fonctionnera pas")
         
+        # Images de debug communes au détecteur, à l'OCR et au contrôleur : écrites
+        # en arrière-plan, une page sur 10 seulement quand le debug est activé
+        debug_sink = DebugImageSink(every_n_pages=10)
+        
         # NOUVEAU : OCR avec détection de surlignements
         ocr_engine = TesseractOCREngine(
             tesseract_cmd=tesseract_path,
-            debug_mode=False  # Désactiver le debug en production pour de meilleures performances
+            debug_mode=False,  # Désactiver le debug en production pour de meilleures performances
+            workers=self.ocr_workers,
+            omp_thread_limit=1,
+            batch_ocr=True,  # Un appel Tesseract par page au lieu d'un par surlignement
+            auto_language=True,  # Un seul modèle (fra ou eng) une fois la langue du livre connue
+            ocr_cache=OCRResultCache("ocr_cache.sqlite"),  # Relecture d'un livre déjà extrait quasi gratuite
+            debug_sink=debug_sink
         )
+        self.ocr_engine = ocr_engine
         
-        self.logger.info("✓ Moteur OCR configuré avec détection de surlignements Kindle")
+        self.logger.info(f"✓ Moteur OCR configuré avec détection de surlignements Kindle ({self.ocr_workers} processus OCR)")
         
         # Kindle Controller
         kindle_controller = PyAutoGuiKindleController(
-            debug_mode=False  # Désactiver le debug en production
+            debug_mode=False,  # Désactiver le debug en production
+            debug_sink=debug_sink
         )
         
         self.logger.info("✓ Contrôleur Kindle configuré")
@@ -188,7 +205,8 @@ class AllamBikApp:
             # Nettoyer
             if self.event_loop and self.event_loop.is_running():
                 self.event_loop.call_soon_threadsafe(self.event_loop.stop)
-            self.executor.shutdown(wait=True)
+            if self.ocr_engine:
+                self.ocr_engine.shutdown(wait=True)
 
 
 def main():
@@ -164,7 +164,7 @@ class MainViewModel:
             x, y, w, h = self.custom_scan_zone
             self.add_log(f"Utilisation de la zone personnalisÃ©e: {w}x{h} Ã  ({x},{y})")
         else:
-            self.add_log("Utilisation de la zone de scan par dÃ©faut")
+            self.add_log("Zone de lecture automatique (colonne de texte cherchee dans la zone par dÃ©faut)")
         
         # ParamÃ¨tres d'extraction
         params = ExtractionParams(
@@ -172,6 +172,7 @@ class MainViewModel:
             start_page=1,
             end_page=total_pages,
             scan_regions=scan_regions,
+            auto_scan_zone=not self.custom_scan_zone,  # Zone dessinee par l'utilisateur: utilisee telle quelle
             min_text_length=10,
             min_confidence=60.0,  # RÃ©duit pour dÃ©tecter plus de texte
             navigation_delay=0.3,
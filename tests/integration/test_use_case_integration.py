@@ -14,7 +14,7 @@ from src.application.use_cases.extract_highlights_use_case import (
     HighlightFoundEvent
 )
 from src.application.ports.ocr_engine import OCREngine
-from src.application.ports.kindle_controller import KindleController
+from src.application.ports.kindle_controller import KindleController, Frame
 from src.infrastructure.events.in_memory_event_bus import InMemoryEventBus
 from src.domain.entities.extraction_task import TaskStatus
 
@@ -41,6 +41,10 @@ class MockKindleController(KindleController):
         self.current_page = page
         await asyncio.sleep(0.01)  # Simuler un délai
     
+    async def capture_frame(self, region=None, downscale=1) -> Frame:
+        # Retourner une frame fictive, différente pour chaque page
+        return Frame(pixels=bytes([self.current_page % 256] * 3), shape=(1, 1, 3), page_number=self.current_page)
+    
     async def capture_screen(self) -> bytes:
         # Retourner des données d'image fictives
         return b"fake_image_data"
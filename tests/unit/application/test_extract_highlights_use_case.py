@@ -0,0 +1,325 @@
+"""
+Tests unitaires pour le use case d'extraction
+"""
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.application.ports.kindle_controller import KindleController, Frame
+from src.application.ports.ocr_engine import OCREngine
+from src.application.use_cases.extract_highlights_use_case import (
+    ExtractHighlightsUseCase,
+    ExtractionParams,
+    TaskFailedEvent
+)
+from src.infrastructure.events.in_memory_event_bus import InMemoryEventBus
+
+
+class TestExtractionParams:
+    """Tests pour ExtractionParams."""
+    
+    def test_capture_region_single_zone(self):
+        """Test que la zone de capture est la zone elle-même."""
+        params = ExtractionParams(total_pages=10, scan_regions=[(1202, 2, 705, 999)])
+        
+        assert params.capture_region == (1202, 2, 705, 999)
+    
+    def test_capture_region_is_union_of_zones(self):
+        """Test que la zone de capture englobe toutes les zones."""
+        params = ExtractionParams(
+            total_pages=10,
+            scan_regions=[(100, 200, 300, 400), (350, 50, 100, 100)]
+        )
+        
+        assert params.capture_region == (100, 50, 350, 550)
+
+
+class RecordingKindle(KindleController):
+    """Contrôleur factice qui enregistre les navigations."""
+    
+    def __init__(self):
+        self.current_page = 0
+        self.navigations = []
+    
+    async def navigate_to_page(self, page: int) -> None:
+        self.navigations.append(page)
+        self.current_page = page
+    
+    async def capture_frame(self, region=None, downscale=1) -> Frame:
+        return Frame(pixels=bytes([self.current_page % 256] * 3), shape=(1, 1, 3), page_number=self.current_page)
+    
+    async def capture_screen(self) -> bytes:
+        return b"fake_image_data"
+    
+    async def get_current_page(self) -> int:
+        return self.current_page
+    
+    async def is_kindle_running(self) -> bool:
+        return True
+
+
+class StuckKindle(RecordingKindle):
+    """Contrôleur factice dont l'affichage ne change plus après last_page (fin de livre)."""
+    
+    def __init__(self, last_page: int):
+        super().__init__()
+        self.last_page = last_page
+    
+    async def capture_frame(self, region=None, downscale=1) -> Frame:
+        shown = min(self.current_page, self.last_page)
+        pixels = np.full((64, 66, 3), 255, dtype=np.uint8)
+        pixels[8:16, 4:4 + 8 * shown] = 0  # Ligne de 'texte' propre à la page affichée
+        return Frame(pixels=pixels, shape=pixels.shape, page_number=self.current_page)
+
+
+class PageEchoOCR(OCREngine):
+    """OCR factice qui renvoie la page de la frame analysée."""
+    
+    def __init__(self):
+        self.pages_read = []
+    
+    async def extract_text(self, image, region):
+        self.pages_read.append(image.page_number)
+        return f"Texte de la page {image.page_number}", 95.0
+    
+    async def is_available(self) -> bool:
+        return True
+
+
+class DetectingOCR(PageEchoOCR):
+    """OCR factice avec détection seule: seules les pages paires sont surlignées."""
+    
+    def __init__(self):
+        super().__init__()
+        self.detection_calls = 0
+    
+    async def has_highlights(self, image, region) -> bool:
+        self.detection_calls += 1
+        return image.page_number % 2 == 0
+
+
+class ScreenKindle(RecordingKindle):
+    """Contrôleur factice qui capture les zones demandées d'un écran avec une colonne de texte."""
+    
+    def __init__(self):
+        super().__init__()
+        self.screen = np.full((400, 600, 3), 255, dtype=np.uint8)
+        for y in range(60, 360, 20):
+            self.screen[y:y+8, 100:480:3] = 0
+        self.captured_regions = []
+    
+    async def capture_frame(self, region=None, downscale=1) -> Frame:
+        self.captured_regions.append(region)
+        x, y, w, h = region
+        pixels = np.ascontiguousarray(self.screen[y:y+h, x:x+w])
+        return Frame(pixels=pixels, shape=pixels.shape, page_number=self.current_page, origin=(x, y))
+
+
+class RegionRecordingOCR(DetectingOCR):
+    """OCR factice qui enregistre les zones analysées par la détection."""
+    
+    def __init__(self):
+        super().__init__()
+        self.regions = []
+    
+    async def has_highlights(self, image, region) -> bool:
+        self.regions.append(region)
+        return await super().has_highlights(image, region)
+
+
+class SlowOCR(PageEchoOCR):
+    """OCR factice lent, plus lent sur les premières pages, qui mesure l'avance du scan."""
+    
+    def __init__(self, kindle):
+        super().__init__()
+        self.kindle = kindle
+        self.max_lead = 0
+    
+    async def extract_text(self, image, region):
+        self.max_lead = max(self.max_lead, len(self.kindle.navigations) - len(self.pages_read))
+        await asyncio.sleep(0.02 / image.page_number)
+        return await super().extract_text(image, region)
+
+
+class FailingOCR(DetectingOCR):
+    """OCR factice avec détection seule qui échoue à l'extraction d'une page."""
+    
+    def __init__(self, failing_page: int):
+        super().__init__()
+        self.failing_page = failing_page
+    
+    async def extract_text(self, image, region):
+        if image.page_number == self.failing_page:
+            raise RuntimeError(f"OCR impossible page {image.page_number}")
+        return await super().extract_text(image, region)
+
+
+class PooledOCR(PageEchoOCR):
+    """OCR factice avec un pool de processus, qui mesure les pages OCRisées en parallèle."""
+    
+    def __init__(self, workers: int):
+        super().__init__()
+        self.workers = workers
+        self.running = 0
+        self.max_running = 0
+    
+    async def extract_text(self, image, region):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return await super().extract_text(image, region)
+    
+    async def has_highlights(self, image, region) -> bool:
+        return True
+
+
+class ProfiledOCR(PageEchoOCR):
+    """OCR factice avec profils, qui note le profil de chaque page lue."""
+    
+    def __init__(self, default_profile: str = "balanced"):
+        super().__init__()
+        self.default_profile = default_profile
+        self.profile = default_profile
+        self.profiles_read = []
+    
+    def use_profile(self, name: str) -> None:
+        self.profile = name
+    
+    def reset_profile(self) -> None:
+        self.profile = self.default_profile
+    
+    async def extract_text(self, image, region):
+        self.profiles_read.append(self.profile)
+        return await super().extract_text(image, region)
+
+
+@pytest.mark.asyncio
+class TestExtractHighlightsUseCase:
+    """Tests pour ExtractHighlightsUseCase."""
+    
+    async def test_book_traversed_once_with_frame_cache(self):
+        """Test que la phase 2 lit les frames de la phase 1 sans renaviguer."""
+        kindle = RecordingKindle()
+        ocr = PageEchoOCR()
+        use_case = ExtractHighlightsUseCase(ocr, kindle, InMemoryEventBus())
+        
+        task = await use_case.execute(ExtractionParams(total_pages=4, settle_poll_interval=0))
+        
+        assert kindle.navigations == [1, 2, 3, 4]
+        assert [h.page_number for h in task.highlights_extracted] == [1, 2, 3, 4]
+        assert [h.text for h in task.highlights_extracted] == [f"Texte de la page {p}" for p in range(1, 5)]
+    
+    async def test_renavigates_without_frame_cache(self):
+        """Test du comportement historique quand le cache est désactivé."""
+        kindle = RecordingKindle()
+        use_case = ExtractHighlightsUseCase(PageEchoOCR(), kindle, InMemoryEventBus())
+        
+        await use_case.execute(ExtractionParams(
+            total_pages=2, pipelined=False, cache_frames=False, settle_poll_interval=0
+        ))
+        
+        assert kindle.navigations == [1, 2, 1, 2]
+    
+    async def test_scan_phase_uses_detection_only(self):
+        """Test que la phase 1 n'appelle jamais l'OCR quand la détection seule existe."""
+        ocr = DetectingOCR()
+        use_case = ExtractHighlightsUseCase(ocr, RecordingKindle(), InMemoryEventBus())
+        
+        task = await use_case.execute(ExtractionParams(total_pages=6, settle_poll_interval=0))
+        
+        assert ocr.detection_calls == 6
+        assert ocr.pages_read == [2, 4, 6]
+        assert task.pages_with_content == 3
+    
+    async def test_pipeline_applies_backpressure_and_restores_order(self):
+        """Test que le scan attend l'OCR quand la file est pleine et que l'ordre est rétabli."""
+        kindle = RecordingKindle()
+        ocr = SlowOCR(kindle)
+        use_case = ExtractHighlightsUseCase(ocr, kindle, InMemoryEventBus())
+        params = ExtractionParams(
+            total_pages=12, ocr_workers=2, pipeline_queue_size=2, settle_poll_interval=0
+        )
+        
+        task = await use_case.execute(params)
+        
+        assert ocr.pages_read != sorted(ocr.pages_read)  # Terminées dans le désordre
+        assert [h.page_number for h in task.highlights_extracted] == list(range(1, 13))
+        assert ocr.max_lead <= params.pipeline_queue_size + params.ocr_workers + 1
+    
+    async def test_repeated_end_frames_skipped_by_fingerprint(self):
+        """Test que la page répétée en fin de livre n'est ni réanalysée ni réextraite."""
+        ocr = DetectingOCR()
+        use_case = ExtractHighlightsUseCase(ocr, StuckKindle(last_page=4), InMemoryEventBus())
+        
+        task = await use_case.execute(ExtractionParams(total_pages=6, settle_timeout=0.01, settle_poll_interval=0))
+        
+        assert ocr.detection_calls == 4
+        assert ocr.pages_read == [2, 4]
+        assert task.metadata["fingerprint_cache"]["hits"] == 2
+        assert task.metadata["fingerprint_cache"]["hit_rate"] == 2 / 6
+    
+    async def test_auto_scan_zone_shrinks_capture_and_revalidates(self):
+        """Test que seule la colonne de texte est capturée une fois confirmée, la zone large toutes les N pages."""
+        kindle = ScreenKindle()
+        ocr = RegionRecordingOCR()
+        use_case = ExtractHighlightsUseCase(ocr, kindle, InMemoryEventBus())
+        search = (0, 0, 600, 400)
+        
+        task = await use_case.execute(ExtractionParams(
+            total_pages=7, scan_regions=[search], auto_scan_zone=True,
+            scan_zone_revalidate_pages=3, adaptive_settle=False, navigation_delay=0,
+            fingerprint_cache=False
+        ))
+        
+        zone = task.metadata["reading_zone"]
+        assert zone[0] > 80 and zone[1] > 40 and zone[0] + zone[2] < 500 and zone[1] + zone[3] < 380
+        # Hauteur confirmée sur 3 pages, puis vérification toutes les 3 pages
+        assert kindle.captured_regions == [search, search, search, zone, zone, zone, search]
+        # Pages 1 et 2 analysées sur toute la hauteur, sans les marges latérales
+        assert ocr.regions == [(zone[0], 0, zone[2], 400)] * 2 + [zone] * 5
+        assert ocr.pages_read == [2, 4, 6]
+    
+    async def test_pipeline_ocr_failure_stops_scan_and_fails_task(self):
+        """Test qu'un échec de l'OCR du pipeline arrête le scan et fait échouer la tâche."""
+        kindle = RecordingKindle()
+        events = InMemoryEventBus()
+        failures = []
+        
+        async def on_failure(event):
+            failures.append(event)
+        
+        events.subscribe(TaskFailedEvent, on_failure)
+        use_case = ExtractHighlightsUseCase(FailingOCR(failing_page=2), kindle, events)
+        
+        with pytest.raises(RuntimeError, match="page 2"):
+            await asyncio.wait_for(use_case.execute(ExtractionParams(
+                total_pages=10, ocr_workers=1, pipeline_queue_size=1, settle_poll_interval=0
+            )), timeout=5)
+        
+        assert len(kindle.navigations) < 10
+        assert len(failures) == 1
+    
+    async def test_pipeline_workers_follow_ocr_pool_size(self):
+        """Test que le pipeline OCRise autant de pages en parallèle que le pool a de processus."""
+        ocr = PooledOCR(workers=4)
+        use_case = ExtractHighlightsUseCase(ocr, RecordingKindle(), InMemoryEventBus())
+        
+        await use_case.execute(ExtractionParams(total_pages=12, pipeline_queue_size=8, settle_poll_interval=0))
+        
+        assert ocr.max_running == 4
+    
+    async def test_run_without_profile_restores_engine_profile(self):
+        """Test qu'une extraction sans profil n'hérite pas du profil de la précédente."""
+        ocr = ProfiledOCR()
+        use_case = ExtractHighlightsUseCase(ocr, RecordingKindle(), InMemoryEventBus())
+        
+        first = await use_case.execute(ExtractionParams(total_pages=2, ocr_profile="accurate", settle_poll_interval=0))
+        first_profiles, ocr.profiles_read = ocr.profiles_read, []
+        second = await use_case.execute(ExtractionParams(total_pages=2, settle_poll_interval=0))
+        
+        assert set(first_profiles) == {"accurate"}
+        assert set(ocr.profiles_read) == {"balanced"}
+        assert first.metadata["ocr_profile"] == "accurate"
+        assert "ocr_profile" not in second.metadata
@@ -0,0 +1,43 @@
+"""
+Tests unitaires pour le cache de frames
+"""
+import os
+
+from src.application.ports.kindle_controller import Frame
+from src.application.use_cases.frame_cache import FrameCache
+
+
+def make_frame(page: int, size: int = 30) -> Frame:
+    return Frame(pixels=bytes([page]) * size, shape=(1, size // 3, 3), page_number=page)
+
+
+class TestFrameCache:
+    """Tests pour FrameCache."""
+    
+    def test_put_and_pop_in_memory(self):
+        """Test du stockage en mémoire sous le budget."""
+        cache = FrameCache(max_memory_bytes=1000)
+        cache.put(3, make_frame(3))
+        
+        assert 3 in cache
+        assert cache.pop(3).pixels == make_frame(3).pixels
+        assert 3 not in cache
+        assert cache.pop(3) is None
+    
+    def test_spills_to_disk_over_budget(self):
+        """Test du déversement sur disque quand le budget est dépassé."""
+        cache = FrameCache(max_memory_bytes=45)
+        for page in (1, 2, 3):
+            cache.put(page, make_frame(page))
+        
+        assert len(cache) == 3
+        spill_dir = cache._spill_dir
+        assert spill_dir and os.listdir(spill_dir)
+        
+        restored = cache.pop(3)
+        assert restored.page_number == 3
+        assert restored.pixels == make_frame(3).pixels
+        
+        cache.close()
+        assert not os.path.exists(spill_dir)
+        assert len(cache) == 0
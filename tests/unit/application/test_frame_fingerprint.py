@@ -0,0 +1,54 @@
+"""
+Tests unitaires pour l'empreinte des frames
+"""
+import numpy as np
+
+from src.application.ports.kindle_controller import Frame
+from src.application.use_cases.frame_fingerprint import FrameFingerprintCache, frame_fingerprint
+
+
+def make_frame(seed: int, size=(120, 90)) -> Frame:
+    """Frame texturée (lignes de 'texte' aléatoires) propre à une graine."""
+    pixels = np.full((size[0], size[1], 3), 255, dtype=np.uint8)
+    rng = np.random.default_rng(seed)
+    for row in range(4, size[0] - 8, 8):
+        pixels[row:row+4, 5:5 + int(rng.integers(20, size[1] - 5))] = 0
+    return Frame(pixels=pixels, shape=pixels.shape)
+
+
+class TestFrameFingerprint:
+    """Tests pour frame_fingerprint."""
+    
+    def test_same_content_same_fingerprint(self):
+        """Test que l'empreinte ne dépend que du contenu (ndarray ou bytes)."""
+        frame = make_frame(1)
+        as_bytes = Frame(pixels=frame.pixels.tobytes(), shape=frame.shape)
+        
+        assert frame_fingerprint(frame) == frame_fingerprint(as_bytes)
+        assert frame_fingerprint(frame) != frame_fingerprint(make_frame(2))
+    
+    def test_frame_smaller_than_grid(self):
+        """Test qu'une frame trop petite n'a pas d'empreinte."""
+        assert frame_fingerprint(Frame(pixels=bytes(3), shape=(1, 1, 3))) is None
+
+
+class TestFrameFingerprintCache:
+    """Tests pour FrameFingerprintCache."""
+    
+    def test_near_identical_empty_page_reused(self):
+        """Test qu'une page vide presque identique est reconnue."""
+        cache = FrameFingerprintCache(max_distance=4)
+        fingerprint = frame_fingerprint(make_frame(1))
+        cache.add(fingerprint, 3, has_highlights=False)
+        
+        assert cache.lookup(fingerprint ^ 0b101) == (3, False)
+    
+    def test_highlighted_page_needs_exact_match(self):
+        """Test qu'une page surlignée n'est reconnue que sur une empreinte identique."""
+        cache = FrameFingerprintCache(max_distance=4)
+        fingerprint = frame_fingerprint(make_frame(1))
+        cache.add(fingerprint, 3, has_highlights=True)
+        
+        assert cache.lookup(fingerprint ^ 0b1) is None
+        assert cache.lookup(fingerprint) == (3, True)
+        assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
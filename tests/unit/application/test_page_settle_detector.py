@@ -0,0 +1,49 @@
+"""
+Tests unitaires pour la détection de stabilisation de page
+"""
+import pytest
+
+from src.application.ports.kindle_controller import Frame
+from src.application.use_cases.page_settle_detector import PageSettleDetector
+
+
+class ScriptedKindle:
+    """Contrôleur factice rejouant une séquence de captures."""
+    
+    def __init__(self, screens):
+        self.screens = list(screens)
+        self.captures = 0
+    
+    async def capture_frame(self, region=None, downscale=1) -> Frame:
+        screen = self.screens[min(self.captures, len(self.screens) - 1)]
+        self.captures += 1
+        return Frame(pixels=screen, shape=(1, len(screen) // 3, 3))
+
+
+@pytest.mark.asyncio
+class TestPageSettleDetector:
+    """Tests pour PageSettleDetector."""
+    
+    async def test_settles_on_two_identical_frames(self):
+        """Test que la page est validée dès deux captures identiques."""
+        kindle = ScriptedKindle([b"aaa", b"bbb", b"bbb", b"ccc"])
+        detector = PageSettleDetector(kindle, timeout=1.0, poll_interval=0)
+        
+        assert await detector.wait_until_settled() is True
+        assert kindle.captures == 3
+    
+    async def test_waits_for_page_turn_before_settling(self):
+        """Test que l'ancienne page stable n'est pas validée après une navigation."""
+        kindle = ScriptedKindle([b"old", b"old", b"old", b"old", b"mid", b"new", b"new"])
+        detector = PageSettleDetector(kindle, timeout=1.0, poll_interval=0)
+        await detector.wait_until_settled()
+        
+        assert await detector.wait_until_settled() is True
+        assert kindle.captures == 7
+    
+    async def test_timeout_when_page_never_stabilises(self):
+        """Test que le délai maximal rend la main sur une page instable."""
+        kindle = ScriptedKindle([bytes([i] * 3) for i in range(256)])
+        detector = PageSettleDetector(kindle, timeout=0.05, poll_interval=0.01)
+        
+        assert await detector.wait_until_settled() is False
@@ -0,0 +1,105 @@
+"""
+Tests unitaires pour la détection de la zone de lecture
+"""
+import numpy as np
+
+from src.application.ports.kindle_controller import Frame
+from src.application.use_cases.reading_zone import ReadingZoneTracker, find_reading_zone
+
+
+def make_screen(text_lines: int = 15, size=(400, 600)) -> np.ndarray:
+    """Écran Kindle factice: barre d'outils et filet, colonne de texte, pied de page."""
+    screen = np.full((size[0], size[1], 3), 255, dtype=np.uint8)
+    for x in range(10, size[1] - 30, 60):
+        screen[8:24, x:x+16] = 90                          # Icônes de la barre d'outils
+    screen[32] = 200                                       # Filet sous la barre
+    for i in range(text_lines):
+        y = 60 + 20 * i
+        screen[y:y+8, 100:480 + (i % 3) * 10:3] = 0        # Ligne de 'texte'
+    screen[60:68, 100:400] = (255, 236, 140)               # Surlignement
+    screen[385:391, 270:330] = 0                           # Pied de page (emplacement)
+    return screen
+
+
+class TestFindReadingZone:
+    """Tests pour find_reading_zone."""
+    
+    def test_text_column_without_toolbar_and_footer(self):
+        """Test que la zone couvre la colonne de texte seulement, en coordonnées écran."""
+        screen = make_screen()
+        
+        zone = find_reading_zone(Frame(pixels=screen, shape=screen.shape, origin=(1000, 50)), padding=4)
+        
+        x, y, w, h = zone
+        assert 1000 + 90 <= x <= 1000 + 100 and 50 + 50 <= y <= 50 + 60
+        assert x + w >= 1000 + 498 and x + w <= 1000 + 510
+        assert y + h >= 50 + 348 and y + h < 50 + 385
+    
+    def test_mostly_empty_page_inconclusive(self):
+        """Test qu'une page presque vide (page de titre) ne propose pas de zone."""
+        screen = make_screen(text_lines=2)
+        
+        assert find_reading_zone(Frame(pixels=screen.tobytes(), shape=screen.shape)) is None
+
+
+class TestReadingZoneTracker:
+    """Tests pour ReadingZoneTracker."""
+    
+    def test_revalidation_period_and_growth(self):
+        """Test la confirmation sur plusieurs pages, la vérification toutes les N pages et l'agrandissement."""
+        tracker = ReadingZoneTracker((0, 0, 600, 400), revalidate_every=2, padding=0)
+        short, full = make_screen(text_lines=9), make_screen()
+        
+        assert tracker.due and tracker.next_capture_region() == (0, 0, 600, 400)
+        for _ in range(3):
+            tracker.validate(Frame(pixels=full, shape=full.shape))
+        zone = tracker.zone
+        assert not tracker.due and zone[3] < 330
+        assert [tracker.next_capture_region() for _ in range(2)] == [zone, zone]
+        
+        assert tracker.due
+        tracker.next_capture_region()
+        assert tracker.validate(Frame(pixels=short, shape=short.shape)) == zone  # Jamais réduite
+        assert tracker.regions([(0, 0, 600, 400)]) == [zone]
+    
+    def test_short_first_page_keeps_full_height(self):
+        """Test qu'une première page courte (fin de chapitre) ne fixe pas la hauteur de la zone."""
+        tracker = ReadingZoneTracker((0, 0, 600, 400), revalidate_every=20, padding=0)
+        short, full = make_screen(text_lines=9), make_screen()
+        
+        first = tracker.validate(Frame(pixels=short, shape=short.shape))
+        assert (first[1], first[3]) == (0, 400) and first[0] > 80  # Marges latérales seules retirées
+        assert tracker.due
+        
+        for _ in range(3):
+            tracker.validate(Frame(pixels=full, shape=full.shape))
+        
+        x, y, w, h = tracker.zone
+        assert not tracker.due
+        assert y + h >= 348  # Dernière ligne d'une page pleine
+    
+    def test_content_at_zone_edge_widens_zone(self):
+        """Test qu'une page dont le texte dépasse la zone confirmée relance la vérification."""
+        tracker = ReadingZoneTracker((0, 0, 600, 400), revalidate_every=20, padding=16)
+        short, full = make_screen(text_lines=9), make_screen()
+        for _ in range(3):
+            tracker.validate(Frame(pixels=short, shape=short.shape))
+        x, y, w, h = tracker.next_capture_region()
+        
+        inside = np.ascontiguousarray(short[y:y+h, x:x+w])
+        assert not tracker.touches_edge(Frame(pixels=inside, shape=inside.shape, origin=(x, y)))
+        cut = np.ascontiguousarray(full[y:y+h, x:x+w])
+        assert tracker.touches_edge(Frame(pixels=cut, shape=cut.shape, origin=(x, y)))
+        
+        assert tracker.due
+        widened = tracker.validate(Frame(pixels=full, shape=full.shape))
+        assert widened[1] + widened[3] > y + h
+    
+    def test_inconclusive_page_retried_next_page(self):
+        """Test qu'une page non concluante laisse la zone de recherche pour la page suivante."""
+        tracker = ReadingZoneTracker((0, 0, 600, 400), revalidate_every=5)
+        blank = make_screen(text_lines=2)
+        
+        assert tracker.validate(Frame(pixels=blank, shape=blank.shape)) is None
+        assert tracker.due
+        assert tracker.regions([(0, 0, 600, 400)]) == [(0, 0, 600, 400)]
@@ -93,4 +93,21 @@ class TestHighlight:
             # position omitted
         )
         
-        assert highlight.position is None
\ No newline at end of file
+        assert highlight.position is None
+    
+    def test_color_round_trip(self):
+        """Test que la couleur survit à la sérialisation et vaut jaune par défaut."""
+        highlight = Highlight.create(
+            book_id=uuid.uuid4(),
+            page_number=2,
+            text="Passage bleu",
+            confidence=90.0,
+            color="blue"
+        )
+        
+        data = highlight.to_dict()
+        assert data["color"] == "blue"
+        assert Highlight.from_dict(data).color == "blue"
+        
+        del data["color"]  # Fichiers antérieurs à la classification multi-couleur
+        assert Highlight.from_dict(data).color == "yellow"
@@ -0,0 +1,62 @@
+"""
+Tests unitaires pour le puits d'images de debug
+"""
+import pickle
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.infrastructure.debug.debug_sink import DebugImageSink
+
+
+@pytest.fixture
+def image():
+    return np.full((20, 30, 3), 200, dtype=np.uint8)
+
+
+class TestDebugImageSink:
+    """Tests pour DebugImageSink."""
+    
+    def test_images_written_in_background_with_unique_names(self, tmp_path, image):
+        """Test que des images de la même seconde, page et étape ne s'écrasent pas."""
+        sink = DebugImageSink(root_dir=str(tmp_path))
+        
+        paths = [sink.submit("debug_highlights", "01_original", image, page_number=3) for _ in range(5)]
+        sink.close()
+        
+        assert len(set(paths)) == 5
+        assert all("_p0003_01_original" in path for path in paths)
+        assert sorted(p.name for p in (tmp_path / "debug_highlights").iterdir()) == \
+            sorted(path.split("/")[-1] for path in paths)
+        assert sink.stats()["written"] == 5
+    
+    def test_page_and_rejection_sampling(self, tmp_path, image):
+        """Test l'échantillonnage une page sur N et le mode rejets seulement."""
+        sink = DebugImageSink(root_dir=str(tmp_path), every_n_pages=5, only_rejected=True)
+        
+        assert sink.submit("d", "s", image, page_number=4, rejected=True) is None
+        assert sink.submit("d", "s", image, page_number=5) is None
+        assert sink.submit("d", "s", image, page_number=5, rejected=True) is not None
+        sink.close()
+        
+        assert sink.stats() == {"written": 1, "dropped": 0, "skipped": 2}
+    
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path, image):
+        """Test qu'une file pleine abandonne l'image sans bloquer l'appelant."""
+        sink = DebugImageSink(root_dir=str(tmp_path), max_queue=2)
+        
+        with patch.object(sink, '_ensure_writer'):  # Écriture suspendue
+            results = [sink.submit("d", "s", image) for _ in range(4)]
+        
+        assert [r is not None for r in results] == [True, True, False, False]
+        assert sink.dropped == 2
+    
+    def test_pickled_copy_keeps_settings(self, tmp_path):
+        """Test qu'un processus du pool reçoit un puits neuf avec les mêmes réglages."""
+        sink = DebugImageSink(root_dir=str(tmp_path), max_queue=8, every_n_pages=3, only_rejected=True)
+        
+        copy = pickle.loads(pickle.dumps(sink))
+        
+        assert (copy.root_dir, copy.max_queue, copy.every_n_pages, copy.only_rejected) == \
+            (str(tmp_path), 8, 3, True)
@@ -0,0 +1,47 @@
+"""
+Tests unitaires des variantes de prétraitement des crops
+"""
+import numpy as np
+import pytest
+from PIL import Image, ImageEnhance
+
+from src.infrastructure.ocr.crop_preprocessing import CropVariants
+
+
+def text_like_crop() -> np.ndarray:
+    """Crop jaune pâle avec des traits sombres (pixels RGB)."""
+    rng = np.random.default_rng(0)
+    crop = np.empty((30, 80, 3), dtype=np.uint8)
+    crop[:] = (250, 235, 150)
+    crop[8:22, rng.choice(80, 25, replace=False)] = (30, 30, 30)
+    return crop
+
+
+class TestCropVariants:
+    """Tests des variantes partagées par les étapes de la cascade"""
+    
+    def test_variants_are_computed_once(self):
+        variants = CropVariants(text_like_crop())
+        
+        assert variants.get("gray") is variants.get("gray")
+        assert variants.get("enlarged_otsu") is variants.get("enlarged_otsu")
+        assert variants.get("original") is variants.original
+    
+    def test_enhanced_matches_pil_contrast(self):
+        crop = text_like_crop()
+        expected = np.asarray(ImageEnhance.Contrast(Image.fromarray(crop).convert('L')).enhance(1.5))
+        
+        enhanced = CropVariants(crop).get("enhanced")
+        
+        assert np.abs(enhanced.astype(int) - expected).max() <= 1
+    
+    def test_binarized_and_enlarged_shapes(self):
+        variants = CropVariants(text_like_crop())
+        
+        assert set(np.unique(variants.get("otsu"))) == {0, 255}
+        assert variants.get("enlarged").shape == (60, 160)
+        assert CropVariants(np.zeros((200, 100, 3), np.uint8)).get("enlarged") is None
+    
+    def test_unknown_variant_is_rejected(self):
+        with pytest.raises(ValueError):
+            CropVariants(text_like_crop()).get("sharpened")
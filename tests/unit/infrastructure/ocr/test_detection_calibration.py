@@ -0,0 +1,126 @@
+"""
+Tests unitaires pour la calibration du détecteur de surlignements
+"""
+import json
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.infrastructure.ocr.detection_calibration import (
+    CalibrationFrame,
+    grid_search_space,
+    load_calibration_frames,
+    match_boxes,
+    random_search_space,
+    run_calibration,
+    save_best_parameters
+)
+from src.infrastructure.ocr.kindle_highlight_detector import KindleHighlightDetector
+
+
+KINDLE_YELLOW = (255, 236, 140)
+
+
+def make_page(bands, size=(600, 400)):
+    """Page blanche avec des bandes jaunes et des traits noirs façon texte."""
+    page = np.full((size[1], size[0], 3), 255, dtype=np.uint8)
+    for x, y, w, h in bands:
+        page[y:y+h, x:x+w] = KINDLE_YELLOW
+        page[y+h//3:y+2*h//3, x+5:x+w-5:6] = 0
+    return page
+
+
+@pytest.fixture
+def frames():
+    """Deux frames dont les boîtes attendues sont celles des réglages par défaut."""
+    detector = KindleHighlightDetector(debug_mode=False)
+    pages = [make_page([(40, 60, 400, 30)]), make_page([(50, 100, 300, 30), (60, 300, 120, 20)])]
+    return [
+        CalibrationFrame(f"page_{i}.png", page, [d.bbox for d in detector.detect(page)])
+        for i, page in enumerate(pages)
+    ]
+
+
+class TestDetectionCalibration:
+    """Tests pour la recherche de paramètres de détection."""
+    
+    def test_match_boxes_pairs_each_box_once(self):
+        """Test qu'une boîte attendue ne valide qu'une détection."""
+        expected = [(0, 0, 100, 20)]
+        detected = [(2, 0, 100, 20), (0, 1, 100, 20), (300, 300, 50, 20)]
+        
+        assert match_boxes(detected, expected) == 1
+        assert match_boxes([], expected) == 0
+    
+    def test_search_spaces(self):
+        """Test que la grille est complète et le tirage aléatoire sans doublon."""
+        space = {"min_area": [100, 200, 300], "expand_x": [4, 8]}
+        
+        grid = grid_search_space(space)
+        sample = random_search_space(space, 4, seed=1)
+        
+        assert len(grid) == 6
+        assert len(sample) == 4
+        assert all(params in grid for params in sample)
+        assert len({tuple(p.values()) for p in sample}) == 4
+    
+    def test_best_parameters_ranked_first(self, frames):
+        """Test que le jeu qui retrouve la vérité terrain est classé premier."""
+        candidates = grid_search_space({"min_area": [250, 5000], "expand_x": [8]})
+        
+        results = run_calibration(frames, candidates)
+        
+        best, worst = results
+        assert best.params["min_area"] == 250
+        assert (best.precision, best.recall) == (1.0, 1.0)
+        assert worst.recall < 1.0
+        assert best.frames_per_second > 0
+    
+    def test_process_pool_matches_in_process(self, frames):
+        """Test que l'évaluation dans le pool donne les mêmes scores."""
+        candidates = grid_search_space({"min_area": [250, 5000]})
+        
+        local = run_calibration(frames, candidates)
+        pooled = run_calibration(frames, candidates, workers=2)
+        
+        assert [(r.params, r.true_positives, r.false_positives) for r in pooled] == \
+            [(r.params, r.true_positives, r.false_positives) for r in local]
+    
+    def test_saved_parameters_loaded_by_detector(self, frames, tmp_path):
+        """Test que le fichier écrit est rechargé par le détecteur."""
+        candidates = grid_search_space({
+            "yellow_ranges": [[((20, 40, 100), (30, 255, 255))]],
+            "expand_x": [12],
+        })
+        best = run_calibration(frames, candidates)[0]
+        path = tmp_path / "best_detection_params.json"
+        
+        save_best_parameters(best, str(path))
+        detector = KindleHighlightDetector(debug_mode=False, params_file=str(path))
+        
+        assert detector.expand_x == 12
+        assert detector.yellow_ranges == [((20, 40, 100), (30, 255, 255))]
+        assert json.loads(path.read_text())["metrics"]["recall"] == best.recall
+    
+    def test_load_frames_with_ground_truth(self, tmp_path):
+        """Test le chargement des frames et des boîtes (régions par défaut et par frame)."""
+        Image.fromarray(make_page([(40, 60, 400, 30)])).save(tmp_path / "a.png")
+        Image.fromarray(make_page([])).save(tmp_path / "b.png")
+        truth = tmp_path / "truth.json"
+        truth.write_text(json.dumps({
+            "region": [0, 0, 600, 400],
+            "frames": {
+                "a.png": [[32, 56, 416, 38]],
+                "b.png": {"boxes": [], "region": [10, 10, 100, 100]},
+                "missing.png": [],
+            },
+        }))
+        
+        frames = load_calibration_frames(str(tmp_path), str(truth))
+        
+        assert [f.name for f in frames] == ["a.png", "b.png"]
+        assert frames[0].pixels.shape == (400, 600, 3)
+        assert frames[0].expected == [(32, 56, 416, 38)]
+        assert frames[0].region == (0, 0, 600, 400)
+        assert frames[1].region == (10, 10, 100, 100)
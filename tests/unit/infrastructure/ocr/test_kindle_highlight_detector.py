@@ -0,0 +1,264 @@
+"""
+Tests unitaires pour le détecteur de surlignements Kindle
+"""
+import io
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.application.ports.kindle_controller import Frame
+from src.infrastructure.debug.debug_sink import DebugImageSink
+from src.infrastructure.ocr.kindle_highlight_detector import (
+    KindleHighlightDetector,
+    HighlightDetection
+)
+
+
+KINDLE_YELLOW = (255, 236, 140)  # RGB d'un surlignement jaune Kindle
+KINDLE_BLUE = (150, 210, 255)    # RGB d'un surlignement bleu Kindle
+
+
+def make_page(bands, size=(600, 400), color=KINDLE_YELLOW):
+    """Construit une page blanche avec des bandes colorées et du 'texte' noir."""
+    page = np.full((size[1], size[0], 3), 255, dtype=np.uint8)
+    for x, y, w, h in bands:
+        page[y:y+h, x:x+w] = color
+        page[y+h//3:y+2*h//3, x+5:x+w-5:6] = 0  # Traits verticaux façon glyphes
+    return page
+
+
+def to_png(page: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(page).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def detector():
+    return KindleHighlightDetector(debug_mode=False)
+
+
+class TestKindleHighlightDetector:
+    """Tests pour KindleHighlightDetector."""
+    
+    def test_detect_returns_sorted_records(self, detector):
+        """Test que detect() retourne un enregistrement complet par bande, de haut en bas."""
+        image = to_png(make_page([(50, 250, 300, 30), (40, 60, 400, 30)]))
+        
+        detections = detector.detect(image)
+        
+        assert len(detections) == 2
+        assert all(isinstance(d, HighlightDetection) for d in detections)
+        assert detections[0].bbox[1] < detections[1].bbox[1]
+        for detection in detections:
+            x, y, w, h = detection.bbox
+            assert detection.mask.shape == (h, w)
+            assert detection.yellow_ratio >= detector.min_yellow_ratio
+            assert detection.crop.shape == (h, w, 3)
+            assert (detection.crop[detection.mask == 0] == 255).all()  # Hors masque : blanc
+    
+    def test_detect_applies_region_offset(self, detector):
+        """Test que les coordonnées restent absolues quand une région est fournie."""
+        image = to_png(make_page([(100, 200, 300, 30)]))
+        
+        full = detector.detect(image)
+        cropped = detector.detect(image, (50, 150, 500, 200))
+        
+        assert [d.bbox for d in cropped] == [d.bbox for d in full]
+    
+    def test_legacy_api_decodes_once_per_call(self, detector):
+        """Test que les méthodes historiques reposent sur une seule passe."""
+        image = to_png(make_page([(40, 60, 400, 30)]))
+        
+        with patch(
+            'src.infrastructure.ocr.kindle_highlight_detector.Image.open',
+            wraps=Image.open
+        ) as image_open:
+            regions = detector.detect_highlights(image)
+        
+        assert image_open.call_count == 1
+        assert regions == [d.bbox for d in detector.detect(image)]
+        crops = detector.extract_highlight_text_regions(image)
+        assert len(crops) == 1
+        assert np.array_equal(crops[0], detector.detect(image)[0].crop)
+    
+    def test_frame_matches_png_input(self, detector):
+        """Test qu'une Frame brute donne le même résultat que le PNG legacy."""
+        page = make_page([(40, 60, 400, 30), (50, 250, 300, 30)])
+        frame = Frame(pixels=page, shape=page.shape, page_number=3)
+        
+        from_frame = detector.detect(frame, (10, 10, 580, 380))
+        from_png = detector.detect(to_png(page), (10, 10, 580, 380))
+        
+        assert [d.bbox for d in from_frame] == [d.bbox for d in from_png]
+        assert all(np.array_equal(a.crop, b.crop) for a, b in zip(from_frame, from_png))
+    
+    def test_bytes_backed_frame(self, detector):
+        """Test qu'une Frame aux pixels bruts en bytes donne les mêmes détections qu'en ndarray."""
+        page = make_page([(40, 60, 400, 30), (50, 250, 300, 30)])
+        
+        expected = detector.detect(Frame(pixels=page, shape=page.shape))
+        actual = detector.detect(Frame(pixels=page.tobytes(), shape=page.shape))
+        
+        assert len(actual) == 2
+        assert [d.bbox for d in actual] == [d.bbox for d in expected]
+    
+    def test_sub_frame_coordinates_translated_back(self, detector):
+        """Test qu'une Frame capturée sur une sous-zone donne des coordonnées écran."""
+        page = make_page([(40, 60, 400, 30), (50, 250, 300, 30)])
+        region = (20, 40, 500, 300)
+        x, y, w, h = region
+        sub_page = np.ascontiguousarray(page[y:y+h, x:x+w])
+        frame = Frame(pixels=sub_page, shape=sub_page.shape, origin=(x, y))
+        
+        from_sub_frame = detector.detect(frame, region)
+        from_full_page = detector.detect(to_png(page), region)
+        
+        assert [d.bbox for d in from_sub_frame] == [d.bbox for d in from_full_page]
+    
+    def test_fast_count_matches_presence(self, detector):
+        """Test que le comptage rapide repère les pages surlignées et ignore les autres."""
+        page = make_page([(40, 60, 400, 30), (50, 250, 300, 30)])
+        blank = make_page([])
+        
+        assert detector.count_highlights_fast(Frame(pixels=page, shape=page.shape)) == 2
+        assert detector.count_highlights_fast(Frame(pixels=blank, shape=blank.shape)) == 0
+    
+    def test_color_table_matches_hsv_ranges(self, detector):
+        """Test que la table de couleurs classe comme les plages HSV d'origine."""
+        import cv2
+        
+        pixels = np.random.default_rng(0).integers(0, 256, (200, 300, 3), dtype=np.uint8)
+        pixels[:50] = KINDLE_YELLOW
+        
+        hsv = cv2.cvtColor(pixels, cv2.COLOR_RGB2HSV)
+        expected = np.zeros(pixels.shape[:2], dtype=np.uint8)
+        for lower, upper in detector.yellow_ranges:
+            expected |= cv2.inRange(hsv, np.array(lower), np.array(upper))
+        
+        labels = detector._classify_colors(pixels)
+        assert np.array_equal((labels == 1).astype(np.uint8) * 255, expected)
+    
+    def test_highlight_colors_classified(self, detector):
+        """Test que chaque surlignement reçoit sa couleur et que les couleurs ne fusionnent pas."""
+        page = make_page([(40, 40, 500, 30)])
+        page[80:110] = make_page([(40, 0, 500, 30)], size=(600, 30), color=KINDLE_BLUE)
+        
+        detections = detector.detect(page)
+        
+        assert detector.highlight_colors[0] == "yellow"
+        assert [d.color for d in detections] == ["yellow", "blue"]
+        assert [d.line_count for d in detections] == [1, 1]
+    
+    @pytest.mark.parametrize("spacing", [0, 2, 4])
+    def test_adjacent_colors_stay_separate(self, detector, spacing):
+        """Test qu'une ligne jaune collée (0-4 px) à une ligne bleue donne deux régions."""
+        page = make_page([(40, 40, 500, 30)])
+        top = 70 + spacing
+        page[top:top+30] = make_page([(40, 0, 500, 30)], size=(600, 30), color=KINDLE_BLUE)
+        
+        detections = detector.detect(page)
+        
+        assert [(d.color, d.line_count) for d in detections] == [("yellow", 1), ("blue", 1)]
+        yellow, blue = detections
+        assert (yellow.crop[yellow.mask > 0] != KINDLE_BLUE).any(axis=-1).all()  # Aucun pixel bleu dans la carte jaune
+        assert blue.bbox[1] + blue.bbox[3] > top + 30
+    
+    def test_color_table_follows_range_changes(self, detector):
+        """Test que la table est recompilée quand les plages changent."""
+        page = make_page([(40, 60, 400, 30)])
+        assert len(detector.detect(page)) == 1
+        
+        detector.yellow_ranges = [((100, 40, 100), (110, 255, 255))]  # Bleu uniquement
+        
+        assert detector.detect(page) == []
+    
+    @pytest.mark.parametrize("factor", [2, 4])
+    def test_pyramid_matches_full_resolution(self, detector, factor):
+        """Test que la pyramide donne les mêmes détections que la pleine résolution."""
+        # Bandes en bord de page, rapprochées (fusionnées par la morphologie) et isolées
+        page = make_page([(0, 0, 300, 20), (40, 80, 400, 30), (40, 113, 380, 30),
+                          (200, 250, 120, 14), (520, 370, 80, 30)])
+        
+        detector.pyramid_factor = 1
+        expected = detector.detect(page)
+        detector.pyramid_factor = factor
+        actual = detector.detect(page)
+        
+        assert len(actual) == len(expected) > 0
+        for got, want in zip(actual, expected):
+            assert got.bbox == want.bbox
+            assert got.yellow_ratio == want.yellow_ratio
+            assert np.array_equal(got.mask, want.mask)
+            assert np.array_equal(got.crop, want.crop)
+    
+    def test_noise_specks_filtered(self, detector):
+        """Test que des centaines de petites taches jaunes sont écartées sans perdre la bande."""
+        page = make_page([(40, 60, 400, 30)])
+        for i in range(300):
+            x, y = 20 + (i * 37) % 560, 120 + (i * 13) % 270
+            page[y:y+3, x:x+3] = KINDLE_YELLOW
+        
+        detections = detector.detect(page)
+        
+        assert len(detections) == 1
+        assert detections[0].bbox[1] < 60
+    
+    def test_line_bands_merged_into_passage(self, detector):
+        """Test que les bandes de lignes consécutives forment un seul passage."""
+        # Trois lignes espacées de 10 px, puis une bande isolée plus bas
+        page = make_page([(40, 40, 500, 30), (40, 80, 500, 30), (40, 120, 260, 30),
+                          (300, 300, 200, 30)])
+        
+        detections = detector.detect(page)
+        
+        assert [d.line_count for d in detections] == [3, 1]
+        passage = detections[0]
+        assert passage.mask.shape == (passage.bbox[3], passage.bbox[2])
+        assert passage.bbox[1] < 40 and passage.bbox[1] + passage.bbox[3] > 150
+    
+    def test_side_by_side_passages_merged_per_column(self, detector):
+        """Test que deux passages côte à côte (deux colonnes) restent deux passages de deux lignes."""
+        page = make_page([(20, 40, 250, 30), (330, 40, 250, 30), (20, 80, 250, 30), (330, 80, 250, 30)])
+        
+        detections = detector.detect(page)
+        
+        assert [d.line_count for d in detections] == [2, 2]
+        assert detections[0].bbox[0] < detections[1].bbox[0]  # Même ligne : de gauche à droite
+        
+        detector.pyramid_factor = 2
+        assert [d.bbox for d in detector.detect(page)] == [d.bbox for d in detections]
+    
+    def test_interleaved_colors_merged_per_color(self, detector):
+        """Test que des couleurs alternées sur des lignes voisines forment un passage par couleur."""
+        page = make_page([(20, 40, 250, 30), (20, 80, 250, 30)])
+        page[40:110, 330:580] = make_page([(0, 0, 250, 30), (0, 40, 250, 30)], size=(250, 70), color=KINDLE_BLUE)
+        
+        detections = detector.detect(page)
+        
+        assert [(d.color, d.line_count) for d in detections] == [("yellow", 2), ("blue", 2)]
+    
+    def test_passage_merging_can_be_disabled(self, detector):
+        """Test que merge_passages=False garde une détection par ligne."""
+        page = make_page([(40, 40, 500, 30), (40, 80, 500, 30)])
+        detector.merge_passages = False
+        
+        assert [d.line_count for d in detector.detect(page)] == [1, 1]
+    
+    def test_debug_images_sampled_per_page(self, tmp_path):
+        """Test que le debug n'écrit que pour les pages échantillonnées, sans changer les détections."""
+        sink = DebugImageSink(root_dir=str(tmp_path), every_n_pages=2)
+        debug_detector = KindleHighlightDetector(debug_mode=True, debug_sink=sink)
+        page = make_page([(40, 60, 400, 30)])
+        
+        skipped = debug_detector.detect(Frame(pixels=page, shape=page.shape, page_number=1))
+        sampled = debug_detector.detect(Frame(pixels=page, shape=page.shape, page_number=2))
+        sink.close()
+        
+        expected = KindleHighlightDetector(debug_mode=False).detect(page)
+        assert [d.bbox for d in skipped] == [d.bbox for d in sampled] == [d.bbox for d in expected]
+        written = sorted(p.name.split("_p0002_")[1] for p in (tmp_path / "debug_highlights").iterdir())
+        assert written == ["01_original.png", "04_mask_combined.png",
+                           "05_mask_cleaned.png", "06_detected_highlights.png"]
@@ -0,0 +1,106 @@
+"""
+Tests unitaires de la sélection automatique de la langue OCR
+"""
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.application.ports.kindle_controller import Frame
+from src.infrastructure.ocr.language_detection import LanguageSelector, count_stopwords
+from src.infrastructure.ocr.tesseract_adapter import HighlightResult, TesseractOCREngine
+
+FRENCH = "Il est dans la maison de son père et elle ne sait pas que les enfants sont partis avec le chien"
+ENGLISH = "The house was quiet and she had not heard from him for years, but there was nothing to do"
+
+
+class TestLanguageSelector:
+    """Tests de la décision et du repli"""
+    
+    def test_count_stopwords(self):
+        assert count_stopwords("Le chat et la souris, the end", ["fra", "eng"]) == {"fra": 3, "eng": 1}
+    
+    def test_switches_to_dominant_language(self):
+        selector = LanguageSelector()
+        
+        langs = [selector.observe(FRENCH, 90.0) for _ in range(3)]
+        
+        assert langs == ["fra+eng", "fra+eng", "fra"]
+        assert selector.stats()["lang"] == "fra"
+    
+    def test_falls_back_when_confidence_drops(self):
+        selector = LanguageSelector(window=3, confidence_drop=8.0)
+        for _ in range(3):
+            selector.observe(ENGLISH, 92.0)
+        assert selector.lang == "eng"
+        
+        for _ in range(3):
+            selector.observe(ENGLISH, 70.0)
+        
+        assert selector.lang == "fra+eng"
+        assert selector.fell_back
+        # Plus de nouvelle décision jusqu'à la prochaine extraction
+        assert selector.observe(ENGLISH, 95.0) == "fra+eng"
+        selector.reset()
+        assert not selector.fell_back and selector.lang == "fra+eng"
+    
+    def test_mixed_text_keeps_both_languages(self):
+        selector = LanguageSelector(max_highlights=4)
+        
+        for text in (FRENCH, ENGLISH) * 3:
+            selector.observe(text, 90.0)
+        
+        assert selector.lang == "fra+eng"
+        assert selector.settled
+
+
+class TestEngineLanguage:
+    """Tests de la langue sur TesseractOCREngine"""
+    
+    def test_language_changes_config_and_cache_key(self):
+        engine = TesseractOCREngine(backend="subprocess", auto_language=True)
+        signature = engine._cache_signature
+        
+        engine._observe_language([
+            HighlightResult(text=FRENCH, confidence=90.0, position=(0, 0), size=(10, 10), highlight_number=i)
+            for i in range(3)
+        ])
+        
+        assert engine.ocr_lang == "fra"
+        assert engine._cache_signature != signature
+        assert engine.language_stats()["sampled_highlights"] == 3
+        
+        engine.reset_language()
+        assert engine.ocr_lang == "fra+eng"
+        assert engine._cache_signature == signature
+    
+    def test_switch_during_extraction_keeps_its_language(self):
+        engine = TesseractOCREngine(backend="subprocess")
+        langs = []
+        
+        def detect_while_language_changes(image, region):
+            engine.use_language("fra")  # Décision prise sur une autre page pendant l'extraction
+            return [SimpleNamespace(crop=np.full((30, 200, 3), 255, np.uint8), bbox=(0, 0, 200, 30), line_count=1, color="yellow")]
+        
+        def image_to_data(image, lang, config):
+            langs.append(lang)
+            return {"text": ["surligné"], "conf": ["95"]}
+        
+        engine.highlight_detector.detect = detect_while_language_changes
+        engine.ocr_backend = SimpleNamespace(name="scripted", image_to_data=image_to_data)
+        frame = Frame(np.zeros((50, 80, 3), np.uint8), (50, 80, 3), 1)
+        
+        asyncio.run(engine.extract_highlights(frame, (0, 0, 80, 50)))
+        
+        assert langs == ["fra+eng"]
+        assert engine.ocr_lang == "fra"
+    
+    def test_disabled_by_default(self):
+        engine = TesseractOCREngine(backend="subprocess")
+        
+        engine._observe_language([
+            HighlightResult(text=FRENCH, confidence=90.0, position=(0, 0), size=(10, 10), highlight_number=1)
+        ] * 5)
+        
+        assert engine.ocr_lang == "fra+eng"
+        assert engine.language_stats() is None
@@ -0,0 +1,121 @@
+"""
+Tests unitaires de l'OCR par lot (empilement et répartition des mots)
+"""
+import asyncio
+
+import numpy as np
+
+from src.application.ports.kindle_controller import Frame
+from src.infrastructure.ocr.ocr_batch import plan_batches, split_words, stitch_crops
+from src.infrastructure.ocr.tesseract_adapter import TesseractOCREngine
+
+
+def words(*boxes):
+    """Résultat image_to_data minimal : (texte, conf, left, top, width, height) par mot."""
+    data = {key: [] for key in ('text', 'conf', 'left', 'top', 'width', 'height')}
+    for box in boxes:
+        for key, value in zip(('text', 'conf', 'left', 'top', 'width', 'height'), box):
+            data[key].append(value)
+    return data
+
+
+class TestStitchAndSplit:
+    """Tests de l'empilement des crops et de la répartition des mots"""
+    
+    def test_stitch_left_aligns_crops_between_gaps(self):
+        crops = [np.zeros((10, 50, 3), np.uint8), np.zeros((20, 80, 3), np.uint8)]
+        
+        stitched, spans = stitch_crops(crops, gap=5)
+        
+        assert stitched.shape == (45, 80, 3)
+        assert spans == [(5, 15, 50), (20, 40, 80)]
+        assert (stitched[15:20] == 255).all()
+        assert (stitched[5:15, 50:] == 255).all()
+    
+    def test_words_go_back_to_their_crop(self):
+        spans = [(10, 40, 100), (60, 120, 200)]
+        data = words(
+            ("premier", 90, 0, 12, 40, 20),
+            ("", -1, 0, 0, 200, 130),          # Bloc/ligne sans texte
+            ("second", 80, 0, 62, 40, 20),
+            ("passage", 70, 50, 95, 60, 20),
+        )
+        
+        assert split_words(data, spans) == [("premier", 90.0), ("second passage", 75.0)]
+    
+    def test_word_across_gap_makes_neighbours_ambiguous(self):
+        spans = [(10, 40, 100), (60, 120, 200), (140, 170, 100)]
+        data = words(
+            ("ok", 90, 0, 12, 40, 20),
+            ("fusion", 60, 0, 30, 40, 40),     # Déborde sur la bande blanche
+            ("fin", 90, 0, 142, 40, 20),
+        )
+        
+        assert split_words(data, spans) == [None, None, ("fin", 90.0)]
+    
+    def test_plan_batches_caps_height(self):
+        assert plan_batches([30, 30, 30, 500], gap=10, max_height=100) == [[0, 1], [2], [3]]
+
+
+class ScriptedBackend:
+    """Backend qui lit le lot d'après les boîtes scriptées de chaque crop."""
+    
+    name = "scripted"
+    
+    def __init__(self, batch_data):
+        self.batch_data = batch_data
+        self.heights = []
+    
+    def image_to_data(self, image, lang, config):
+        self.heights.append(image.shape[0])
+        return self.batch_data(image)
+
+
+class FakeDetection:
+    def __init__(self, y, height):
+        self.bbox = (0, y, 100, height)
+        self.crop = np.full((height, 100, 3), 255, np.uint8)
+        self.line_count = 1
+        self.color = "yellow"
+
+
+class TestBatchedEngine:
+    """Tests du mode lot de TesseractOCREngine"""
+    
+    def make_engine(self, batch_data):
+        engine = TesseractOCREngine(backend="subprocess", batch_ocr=True, batch_gap=20)
+        engine.ocr_backend = ScriptedBackend(batch_data)
+        engine.highlight_detector.detect = lambda image, region: [FakeDetection(0, 30), FakeDetection(50, 30)]
+        engine.individual = []
+        
+        def fake_single(highlight, highlight_num, line_count=1, page_number=None, settings=None):
+            engine.individual.append((highlight_num, page_number))
+            return "relu seul", 90.0, "PSM6"
+        
+        engine._ocr_single_highlight_improved = fake_single
+        return engine
+    
+    def test_one_call_for_two_pages(self):
+        # Crops de 30 px séparés de 20 px : hauts à 20, 70, 120 et 170
+        engine = self.make_engine(lambda image: words(
+            *((f"mot{i}", 95, 0, 22 + 50 * i, 40, 20) for i in range(4))
+        ))
+        pages = [(Frame(np.zeros((200, 200, 3), np.uint8), (200, 200, 3), page), (0, 0, 200, 200)) for page in (3, 4)]
+        
+        results = asyncio.run(engine.extract_highlights_batch(pages))
+        
+        assert engine.ocr_backend.heights == [4 * 30 + 5 * 20]
+        assert engine.individual == []
+        assert [[r.text for r in page] for page in results] == [["mot0", "mot1"], ["mot2", "mot3"]]
+        assert results[1][0].highlight_number == 1
+        assert results[1][0].ocr_method == "PSM6-batch"
+    
+    def test_unresolved_and_low_confidence_crops_fall_back(self):
+        # Premier crop : aucun mot ; second : confiance sous la sortie anticipée
+        engine = self.make_engine(lambda image: words(("flou", 40, 0, 72, 40, 20)))
+        frame = Frame(np.zeros((200, 200, 3), np.uint8), (200, 200, 3), 7)
+        
+        results = asyncio.run(engine.extract_highlights(frame, (0, 0, 200, 200)))
+        
+        assert engine.individual == [(1, 7), (2, 7)]
+        assert [r.text for r in results] == ["relu seul", "relu seul"]
@@ -0,0 +1,102 @@
+"""
+Tests unitaires du cache des résultats OCR
+"""
+import asyncio
+
+import numpy as np
+
+from src.application.ports.kindle_controller import Frame
+from src.infrastructure.ocr.ocr_cache import OCRResultCache
+from src.infrastructure.ocr.tesseract_adapter import TesseractOCREngine
+
+
+def crop(value: int) -> np.ndarray:
+    return np.full((20, 60, 3), value, dtype=np.uint8)
+
+
+class TestOCRResultCache:
+    """Tests des deux niveaux du cache"""
+    
+    def test_key_depends_on_pixels_and_signature(self):
+        key = OCRResultCache.make_key(crop(1), "psm6")
+        
+        assert key == OCRResultCache.make_key(crop(1), "psm6")
+        assert key != OCRResultCache.make_key(crop(2), "psm6")
+        assert key != OCRResultCache.make_key(crop(1), "psm7")
+        assert key != OCRResultCache.make_key(crop(1).reshape(60, 20, 3), "psm6")
+    
+    def test_disk_tier_survives_a_new_instance(self, tmp_path):
+        path = str(tmp_path / "ocr.sqlite")
+        first = OCRResultCache(path, memory_entries=1)
+        first.put("a", ("texte a", 90.0, "PSM6"))
+        first.put("b", ("texte b", 80.0, "PSM7"))
+        
+        assert first.get("b") == ("texte b", 80.0, "PSM7")   # LRU mémoire
+        assert first.get("a") == ("texte a", 90.0, "PSM6")   # Sorti du LRU, relu sur disque
+        first.close()
+        
+        second = OCRResultCache(path)
+        assert second.get("a") == ("texte a", 90.0, "PSM6")
+        assert second.get("inconnue") is None
+        assert (second.memory_hits, second.disk_hits, second.misses) == (0, 1, 1)
+    
+    def test_eviction_drops_least_recently_used(self, tmp_path):
+        cache = OCRResultCache(str(tmp_path / "ocr.sqlite"), memory_entries=1, max_disk_bytes=400)
+        for key in ("k1", "k2", "k3"):
+            cache.put(key, ("x" * 50, 90.0, "PSM6"))
+            cache.get("k1")  # k1 reste récent
+        
+        cache._memory.clear()
+        assert cache.evicted >= 1
+        assert cache.stats()["disk_bytes"] <= 400
+        assert cache.get("k1") is not None
+        assert cache.get("k2") is None
+
+
+class FakeDetection:
+    def __init__(self, value):
+        self.bbox = (0, 0, 60, 20)
+        self.crop = crop(value)
+        self.line_count = 1
+        self.color = "yellow"
+
+
+class TestCachedEngine:
+    """Tests du cache devant la cascade OCR de TesseractOCREngine"""
+    
+    def test_second_extraction_skips_ocr(self, tmp_path):
+        engine = TesseractOCREngine(backend="subprocess", ocr_cache=OCRResultCache(str(tmp_path / "ocr.sqlite")))
+        engine.highlight_detector.detect = lambda image, region: [FakeDetection(1), FakeDetection(2)]
+        engine.ocr_calls = 0
+        
+        def fake_single(highlight, highlight_num, line_count=1, page_number=None, settings=None):
+            engine.ocr_calls += 1
+            return f"surlignement {highlight[0, 0, 0]}", 90.0, "PSM6"
+        
+        engine._ocr_single_highlight_improved = fake_single
+        frame = Frame(np.zeros((50, 80, 3), np.uint8), (50, 80, 3), 1)
+        
+        first = asyncio.run(engine.extract_highlights(frame, (0, 0, 80, 50)))
+        engine.cache_stats(reset=True)
+        second = asyncio.run(engine.extract_highlights(frame, (0, 0, 80, 50)))
+        
+        assert engine.ocr_calls == 2
+        assert [r.text for r in second] == [r.text for r in first] == ["surlignement 1", "surlignement 2"]
+        assert engine.cache_stats()["memory_hits"] == 2
+        assert engine.cache_stats()["misses"] == 0
+    
+    def test_result_stored_under_key_of_its_configuration(self, tmp_path):
+        engine = TesseractOCREngine(backend="subprocess", batch_ocr=True, ocr_cache=OCRResultCache(str(tmp_path / "ocr.sqlite")))
+        engine.highlight_detector.detect = lambda image, region: [FakeDetection(1), FakeDetection(2)]
+        dual_keys = [engine._cache_key(crop(value), 1) for value in (1, 2)]
+        
+        def ocr_while_language_changes(items, settings):
+            engine.use_language("fra")  # Décision prise sur une autre page pendant l'OCR
+            return [("lu en fra+eng", 90.0, "PSM6")] * len(items)
+        
+        engine._ocr_items_sync = ocr_while_language_changes
+        frame = Frame(np.zeros((50, 80, 3), np.uint8), (50, 80, 3), 1)
+        asyncio.run(engine.extract_highlights(frame, (0, 0, 80, 50)))
+        
+        assert [engine.ocr_cache.get(key) for key in dual_keys] == [("lu en fra+eng", 90.0, "PSM6")] * 2
+        assert engine.ocr_cache.get(engine._cache_key(crop(1), 1)) is None
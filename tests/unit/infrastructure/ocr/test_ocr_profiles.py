@@ -0,0 +1,71 @@
+"""
+Tests unitaires des profils OCR
+"""
+import pytest
+
+from src.infrastructure.ocr.ocr_profiles import OCR_PROFILES, get_ocr_profile
+from src.infrastructure.ocr.tesseract_adapter import DEFAULT_OCR_CASCADE, TesseractOCREngine
+from src.infrastructure.ocr.tesseract_backends import parse_tesseract_config
+
+
+class TestOCRProfile:
+    """Tests de la réécriture des configurations par profil"""
+    
+    def test_balanced_keeps_historical_configs(self):
+        for stage in DEFAULT_OCR_CASCADE:
+            assert OCR_PROFILES["balanced"].apply(stage.config) == stage.config
+    
+    def test_fast_profile_flags_and_idempotence(self):
+        fast = OCR_PROFILES["fast"]
+        
+        config = fast.apply('--oem 3 --psm 7', "/opt/tessdata_fast")
+        psm, oem, tessdata_dir, variables = parse_tesseract_config(config)
+        
+        assert (psm, oem, tessdata_dir) == (7, 1, "/opt/tessdata_fast")
+        assert variables["load_system_dawg"] == variables["load_freq_dawg"] == "0"
+        assert "|" in variables["tessedit_char_blacklist"]
+        assert fast.apply(config, "/opt/tessdata_fast") == config
+    
+    def test_models_next_to_default_tessdata(self, tmp_path):
+        (tmp_path / "tessdata").mkdir()
+        fast_dir = tmp_path / "tessdata_fast"
+        fast_dir.mkdir()
+        (fast_dir / "eng.traineddata").write_bytes(b"")
+        
+        fast = OCR_PROFILES["fast"]
+        
+        assert fast.resolve_tessdata_dir(str(tmp_path / "tessdata"), "eng") == str(fast_dir)
+        # Langue absente : modèles par défaut
+        assert fast.resolve_tessdata_dir(str(tmp_path / "tessdata"), "fra+eng") is None
+    
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError):
+            get_ocr_profile("turbo")
+
+
+class TestEngineProfiles:
+    """Tests du choix de profil sur TesseractOCREngine"""
+    
+    def test_use_profile_rewrites_cascade_and_cache_key(self):
+        engine = TesseractOCREngine(backend="subprocess")
+        balanced_signature = engine._cache_signature
+        
+        engine.use_profile("fast")
+        
+        assert engine.ocr_profile.name == "fast"
+        assert all("--oem 1" in stage.config and "load_system_dawg=0" in stage.config for stage in engine.ocr_cascade)
+        assert [stage.name for stage in engine.ocr_cascade] == [stage.name for stage in DEFAULT_OCR_CASCADE]
+        assert engine._cache_signature != balanced_signature
+        
+        engine.use_profile("balanced")
+        assert engine._cache_signature == balanced_signature
+    
+    def test_reset_profile_restores_constructor_profile(self):
+        engine = TesseractOCREngine(backend="subprocess", ocr_profile="fast")
+        fast_signature = engine._cache_signature
+        
+        engine.use_profile("accurate")
+        engine.reset_profile()
+        
+        assert engine.ocr_profile.name == "fast"
+        assert engine._cache_signature == fast_signature
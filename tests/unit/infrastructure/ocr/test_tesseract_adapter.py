@@ -0,0 +1,145 @@
+"""
+Tests unitaires de l'adaptateur Tesseract (sans binaire Tesseract)
+"""
+import asyncio
+import multiprocessing
+import os
+
+import numpy as np
+import pytest
+
+from src.application.ports.kindle_controller import Frame
+from src.infrastructure.ocr import tesseract_adapter
+from src.infrastructure.ocr.tesseract_adapter import TesseractOCREngine
+
+
+def make_crop() -> np.ndarray:
+    """Petit surlignement blanc (pixels RGB)."""
+    return np.full((30, 200, 3), 255, dtype=np.uint8)
+
+
+def scripted_engine(results, **kwargs):
+    """Moteur dont chaque étape OCR renvoie le résultat scripté pour son nom."""
+    engine = TesseractOCREngine(backend="subprocess", **kwargs)
+    engine.calls = []
+    
+    def fake_try(image, config, method_name, lang=None):
+        engine.calls.append(method_name)
+        return results[method_name]
+    
+    engine._try_ocr_config = fake_try
+    return engine
+
+
+class TestOCRCascade:
+    """Tests de la cascade OCR à sortie anticipée"""
+    
+    RESULTS = {
+        "PSM6": ("texte surligné", 91.0),
+        "PSM7": ("texte surligné", 93.0),
+        "Enlarged": ("texte surligné", 94.0),
+        "Enhanced": ("texte surligné", 95.0),
+    }
+    
+    def test_confident_first_stage_stops_cascade(self):
+        engine = scripted_engine(self.RESULTS)
+        
+        text, confidence, method = engine._ocr_single_highlight_improved(make_crop(), 1)
+        
+        assert engine.calls == ["PSM6"]
+        assert (text, confidence, method) == ("texte surligné", 91.0, "PSM6")
+    
+    def test_low_confidence_falls_through(self):
+        results = dict(self.RESULTS, PSM6=("texte flou", 60.0))
+        engine = scripted_engine(results)
+        
+        _, confidence, method = engine._ocr_single_highlight_improved(make_crop(), 1)
+        
+        assert engine.calls == ["PSM6", "PSM7"]
+        assert (confidence, method) == (93.0, "PSM7")
+    
+    def test_without_early_exit_all_stages_run(self):
+        engine = scripted_engine(self.RESULTS, early_exit=False)
+        
+        _, confidence, method = engine._ocr_single_highlight_improved(make_crop(), 1)
+        
+        assert engine.calls == ["PSM6", "PSM7", "Enlarged", "Enhanced"]
+        assert (confidence, method) == (95.0, "Enhanced")
+    
+    def test_multi_line_passage_skips_single_line_stage(self):
+        results = dict(self.RESULTS, PSM6=("texte flou", 60.0))
+        engine = scripted_engine(results)
+        
+        _, _, method = engine._ocr_single_highlight_improved(make_crop(), 1, line_count=3)
+        
+        assert "PSM7" not in engine.calls
+        assert method == "Enlarged"
+
+
+class BandBackend:
+    """Backend factice : un mot par bande non blanche, nommé d'après son niveau de gris."""
+    
+    name = "bands"
+    
+    def image_to_data(self, image, lang, config):
+        gray = np.asarray(image)
+        if gray.ndim == 3:
+            gray = gray.mean(axis=2)
+        rows = np.flatnonzero((gray < 250).any(axis=1))
+        data = {key: [] for key in ('text', 'conf', 'left', 'top', 'width', 'height')}
+        starts = [row for i, row in enumerate(rows) if i == 0 or row != rows[i - 1] + 1]
+        ends = [row for i, row in enumerate(rows) if i == len(rows) - 1 or rows[i + 1] != row + 1]
+        for top, bottom in zip(starts, ends):
+            for key, value in zip(data, (f"gris{int(gray[top:bottom + 1].min())}", 95, 0, int(top), 40, int(bottom - top + 1))):
+                data[key].append(value)
+        return data
+
+
+class GrayDetection:
+    def __init__(self, y, level):
+        self.bbox = (0, y, 100, 30)
+        self.crop = np.full((30, 100, 3), level, np.uint8)
+        self.line_count = 1
+        self.color = "yellow"
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                    reason="le backend factice est transmis aux processus par fork")
+class TestProcessPool:
+    """Tests de l'OCR réparti sur le pool de processus"""
+    
+    def run(self, monkeypatch, **kwargs):
+        monkeypatch.setattr(tesseract_adapter, "create_tesseract_backend", lambda name, tessdata_dir: BandBackend())
+        engine = TesseractOCREngine(backend="subprocess", detection_params_file=None, **kwargs)
+        engine.highlight_detector.detect = lambda image, region: [
+            GrayDetection(40 * i, level) for i, level in enumerate((40, 80, 120))
+        ]
+        frame = Frame(np.zeros((200, 200, 3), np.uint8), (200, 200, 3), 5)
+        try:
+            results = asyncio.run(engine.extract_highlights(frame, (0, 0, 200, 200)))
+            processes = list((engine._process_pool._processes or {}).values()) if engine._process_pool else []
+        finally:
+            engine.shutdown()
+        
+        assert engine._process_pool is None
+        assert not any(process.is_alive() for process in processes)
+        return [(r.text, r.confidence, r.ocr_method, r.highlight_number) for r in results], processes
+    
+    @pytest.mark.parametrize("batch_ocr", [False, True])
+    def test_pool_matches_in_process_results(self, monkeypatch, batch_ocr):
+        expected, _ = self.run(monkeypatch, batch_ocr=batch_ocr)
+        actual, processes = self.run(monkeypatch, batch_ocr=batch_ocr, workers=2)
+        
+        assert [text for text, *_ in expected] == ["gris40", "gris80", "gris120"]
+        assert actual == expected
+        assert processes  # OCR exécuté dans le pool
+    
+    def test_workers_see_omp_thread_limit(self, monkeypatch):
+        monkeypatch.setenv("OMP_THREAD_LIMIT", "8")
+        engine = TesseractOCREngine(backend="subprocess", detection_params_file=None, workers=1, omp_thread_limit=1)
+        try:
+            # Fixé dans ce processus avant le chargement du backend, puis hérité par le pool
+            assert os.environ["OMP_THREAD_LIMIT"] == "1"
+            assert engine._process_pool.submit(os.getenv, "OMP_THREAD_LIMIT").result(timeout=30) == "1"
+        finally:
+            engine.shutdown()
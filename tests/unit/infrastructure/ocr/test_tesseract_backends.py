@@ -0,0 +1,54 @@
+"""
+Tests unitaires des backends Tesseract
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.infrastructure.ocr import tesseract_backends
+from src.infrastructure.ocr.tesseract_backends import (
+    SubprocessTesseractBackend,
+    create_tesseract_backend,
+    parse_tesseract_config,
+)
+
+
+class TestParseTesseractConfig:
+    """Tests de la décomposition des options ligne de commande"""
+    
+    def test_psm_oem_and_variables(self):
+        psm, oem, tessdata_dir, variables = parse_tesseract_config(
+            '--oem 1 --psm 7 -c load_system_dawg=0'
+        )
+        assert (psm, oem, tessdata_dir) == (7, 1, None)
+        assert variables == {'load_system_dawg': '0'}
+    
+    def test_defaults(self):
+        assert parse_tesseract_config('') == (3, 3, None, {})
+
+
+class TestCreateTesseractBackend:
+    """Tests de la fabrique de backends"""
+    
+    def test_subprocess_backend(self):
+        assert isinstance(create_tesseract_backend("subprocess"), SubprocessTesseractBackend)
+    
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            create_tesseract_backend("inconnu")
+    
+    def test_auto_without_tesserocr_warns(self, monkeypatch, caplog):
+        monkeypatch.setattr(tesseract_backends, "tesserocr", None)
+        
+        assert isinstance(create_tesseract_backend("auto"), SubprocessTesseractBackend)
+        assert "tesserocr" in caplog.text
+    
+    def test_tesserocr_not_loaded_on_import(self):
+        # OpenMP lit OMP_THREAD_LIMIT au chargement de tesserocr : l'import de l'adaptateur ne doit pas le charger
+        code = "import sys, src.infrastructure.ocr.tesseract_adapter; print('tesserocr' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=Path(__file__).resolve().parents[4])
+        
+        assert result.stdout.strip() == "False"